@@ -1,31 +1,33 @@
 #!/usr/bin/env python3
+from portfolio import fonts, prewarm, startup, telemetry
+startup.enable_from_env()
+prewarm.ensure_started()
+
 import streamlit as st
-import json
 import os
-import html
-from typing import List, Optional, Tuple, Any
-from streamlit_lottie import st_lottie
+from typing import List, Optional
+
+from portfolio.hero import lottie_hero
+from portfolio.lottie_meta import read_meta
+from portfolio.search import render_search
+from portfolio.templates import compile_site
 
 # --------------------------
-#     PAGE CONFIG
+#     CONTENT (content/site.json, compiled once per process)
 # --------------------------
-st.set_page_config(page_title="Marcos Ondruska — Portfolio", page_icon="🎾", layout="wide")
+SITE = compile_site()
 
 # --------------------------
-#     LINKS / CONTACT
+#     PAGE CONFIG
 # --------------------------
-LINKEDIN_URL = "https://www.linkedin.com/in/marcos-ondruska-3b3a749/"
-GITHUB_URL   = "https://github.com/drussie"
-X_URL        = "https://x.com/drussie"
-EMAIL        = "marcosondruska@gmail.com"
-ROUND_ROBIN_APP = "https://marcoswebpage-k3rbpwxme7nzgk5rwdee3c.streamlit.app/"
+st.set_page_config(page_title=SITE.content.page_title, page_icon="🎾", layout="wide")
 
 # --------------------------
 #     GLOBAL STYLES
 # --------------------------
+st.markdown(fonts.font_head(), unsafe_allow_html=True)
 st.markdown("""
     <style>
-    @import url('https://fonts.googleapis.com/css2?family=Orbitron:wght@600;700&family=Inter:wght@400;600&display=swap');
     :root {
         --brand-gold: #FFD700;
         --brand-mint: #00FF7F;
@@ -104,6 +106,7 @@ st.markdown("""
     .cap { color: #CFE2FF; font-size: 12px; margin-top: -10px; }
     </style>
 """, unsafe_allow_html=True)
+startup.mark_first_render()
 
 # --------------------------
 #     LOTTIE LOADER (resilient)
@@ -126,20 +129,15 @@ def _normalize_abs(p: str) -> str:
     if p.startswith("Users/"): p = "/" + p
     return os.path.abspath(p) if not os.path.isabs(p) else p
 
-def _load_lottie_candidates(cands: List[str]) -> Tuple[Optional[Any], Optional[str]]:
-    for path in cands:
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f), path
-        except Exception:
-            continue
-    return None, None
+def _first_lottie(cands: List[str]) -> Optional[str]:
+    """First candidate whose header reads as a Lottie document (lottie_hero renders from the path)."""
+    return next((path for path in cands if read_meta(path) is not None), None)
 
-def load_lottie_prefer_local(name_or_abs_path: str) -> Tuple[Optional[Any], Optional[str]]:
+def find_lottie_prefer_local(name_or_abs_path: str) -> Optional[str]:
     if name_or_abs_path:
         abs_norm = _normalize_abs(name_or_abs_path)
-        data, used = _load_lottie_candidates(_fix_json_extension(abs_norm))
-        if data is not None: return data, used
+        used = _first_lottie(_fix_json_extension(abs_norm))
+        if used is not None: return used
     here = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(here)
     search_bases = [
@@ -150,140 +148,71 @@ def load_lottie_prefer_local(name_or_abs_path: str) -> Tuple[Optional[Any], Opti
     ]
     candidates: List[str] = []
     for base in search_bases: candidates.extend(_fix_json_extension(base))
-    return _load_lottie_candidates(candidates)
-
-lottie_data, lottie_used = load_lottie_prefer_local("Tennis Ball")
+    return _first_lottie(candidates)
 
-# --------------------------
-#     HELPERS
-# --------------------------
-def link_button_like(label: str, url: str):
-    st.markdown(
-        f"<a class='btn-like' href='{html.escape(url)}' rel='noopener'>{html.escape(label)}</a>",
-        unsafe_allow_html=True
-    )
+lottie_used = find_lottie_prefer_local("Tennis Ball")
 
 # --------------------------
 #     HEADER / HERO
 # --------------------------
 left, right = st.columns([3, 1])
 with left:
-    st.markdown("<h1 class='hero-title'>Marcos Ondruska</h1>", unsafe_allow_html=True)
-    st.markdown(
-        "<div class='hero-sub'>Ex-ATP #27 • Olympian (Atlanta 1996) • Former South Africa Davis Cup Captain • "
-        "GPTCA A*, USTA High Performance Certified Coach • Software Developer (ML/Trading, Spring Boot, MERN)</div>",
-        unsafe_allow_html=True
-    )
+    SITE.hero_title.render()
+    SITE.hero_sub.render()
     btn_cols = st.columns([1,1,1])  # only 3 columns now
-    with btn_cols[0]:
-        link_button_like("🔗 LinkedIn", LINKEDIN_URL)
-    with btn_cols[1]:
-        link_button_like("💻 GitHub", GITHUB_URL or "https://github.com/")
-    with btn_cols[2]:
-        link_button_like("𝕏 Profile", X_URL or "https://x.com/")
+    for col, frag in zip(btn_cols, SITE.link_buttons):
+        frag.render(col)
 
 with right:
-    if lottie_data:
-        st_lottie(lottie_data, height=200, key="hero_anim")
-        if lottie_used:
-            st.caption(f"<span class='cap'>Animation: {os.path.basename(lottie_used)}</span>", unsafe_allow_html=True)
+    if lottie_used and lottie_hero(lottie_used, max_width=320, max_height=200):
+        st.caption(f"<span class='cap'>Animation: {os.path.basename(lottie_used)}</span>", unsafe_allow_html=True)
+
+# --------------------------
+#     SEARCH (sidebar)
+# --------------------------
+with st.sidebar:
+    st.markdown("### Search")
+    render_search()
 
 # --------------------------
 #     ABOUT ME
 # --------------------------
-st.markdown("<div class='section-header about'>About Me</div>", unsafe_allow_html=True)
-st.markdown("""
-<div class="card about-card">
-  <p class="muted">I’m a developer with a unique path: from competing as a professional athlete to building software that powers real-world decisions. Today, I focus on creating intelligent, data-driven applications — from algorithmic trading systems to interactive AI tools.</p>
-  <p class="muted">My technical toolkit spans Python, Java, JavaScript, C, F#, and Prolog, with experience across both enterprise frameworks (Spring Boot) and modern full-stack stacks (Node.js, React, MongoDB). I’m fluent in PostgreSQL and MongoDB, and enjoy working at the intersection of quantitative finance, AI/ML, and software engineering.</p>
-  <p class="muted">Beyond code, I bring a global perspective — fluent in English, Afrikaans, German, and Slovak — and thrive in environments where technology, strategy, and creativity converge.</p>
-</div>
-""", unsafe_allow_html=True)
+SITE.about_header.render()
+SITE.about_card.render()
 
 # --------------------------
 #     TENNIS COACHING
 # --------------------------
-st.markdown("<div class='section-header'>Tennis Coaching</div>", unsafe_allow_html=True)
-st.markdown(f"""
-<div class="card">
-  <p class="muted">I bring over 30 years of professional tennis experience to the court — from competing at the highest level (Olympics, ATP Tour, Davis Cup) to coaching players at all levels. My focus is on player development, mindset, and performance strategies that translate into real results.</p>
-  <ul class="muted" style="margin-bottom: 8px;">
-    <li><b>Private Lessons</b> — 1-on-1 coaching tailored to your game</li>
-    <li><b>Group Clinics & Camps</b> — competitive learning environments</li>
-    <li><b>Performance Consulting</b> — match strategy, mental prep, and video analysis</li>
-    <li><b>Junior Development</b> — long-term growth plans for young athletes</li>
-  </ul>
-  <p class="muted" style="margin:0;"><b>Coaching inquiries:</b> {html.escape(EMAIL)}</p>
-</div>
-""", unsafe_allow_html=True)
+SITE.coaching_header.render()
+SITE.coaching_card.render()
 
 # --------------------------
 #     SOFTWARE & DATA PROJECTS
 # --------------------------
-st.markdown("<div class='section-header'>Software & Data Projects</div>", unsafe_allow_html=True)
-
-with st.expander("📈 Intraday Trading Engine (IB + Python)"):
-    st.markdown("""
-Automated equity strategy using Interactive Brokers (ib_insync), ATR initial stops, EMA trailing stops, Telegram alerts, and PostgreSQL logging. Includes RVOL scanner, premarket breakout logic, and daily diagnostics.
-""")
-
-with st.expander("🧭 Market Breadth Dashboard"):
-    st.markdown("""
-Real-time advances/declines, highs/lows, and up/down volume for macro trading signals, with fallbacks and caching to handle broker data gaps.
-""")
+SITE.projects_header.render()
 
-with st.expander("🎥 Tennis Video Analytics (YOLOv11x, Homography, Flask)"):
-    st.markdown("""
-Ball & player tracking, court calibration/homography, rally segmentation, bounce detection, and heatmaps with video overlay.
-""")
-
-with st.expander("🎾 Round Robin Tournament App (Streamlit)"):
-    st.markdown("""
-Generate balanced round-robin schedules for 2–20 players with multiple scoring formats, live standings, and results entry. Designed with an auto-sizing UI container for a clean embed.
-""")
-    st.markdown(f"<a class='btn-like' href='{ROUND_ROBIN_APP}'>Open App</a>", unsafe_allow_html=True)
+for project in SITE.projects:
+    with st.expander(project.heading):
+        st.markdown(project.body)
+        if project.link:
+            project.link.render()
 
 # --------------------------
 #     SKILLS — TAG CLOUD / BADGE WALL
 # --------------------------
-st.markdown("<div class='section-header'>Skills</div>", unsafe_allow_html=True)
-
-SKILLS: List[str] = [
-    # Core programming
-    "Python", "Java", "JavaScript", "C", "F#", "Prolog",
-    # Frameworks & tools
-    "Spring Boot", "Node.js", "Express", "React", "Docker", "JUnit", "GitHub",
-    # Databases
-    "PostgreSQL", "MongoDB", "SQL",
-    # Web & CS
-    "REST APIs", "OOP", "Data Structures & Algorithms", "Systems Programming", "Networking", "Linux",
-    # Specializations
-    "Algorithmic Trading", "Quantitative Investing", "AI/ML", "Capital Markets",
-    # Practices
-    "Unit Testing", "Version Control", "Scrum",
-    # Leadership & Languages
-    "Team Leadership", "Coaching/Mentorship", "English", "Afrikaans", "German", "Slovak",
-]
-
-pills_html = "<div class='card'><div class='pill-wall'>" + "".join(
-    f"<span class='pill' tabindex='0'>{html.escape(s)}</span>" for s in SKILLS
-) + "</div></div>"
-st.markdown(pills_html, unsafe_allow_html=True)
+SITE.skills_header.render()
+SITE.skills_wall.render()
 
 # --------------------------
 #     CONNECT
 # --------------------------
-st.markdown("<div class='section-header'>Connect</div>", unsafe_allow_html=True)
-st.markdown(f"""
-<div class="card">
-  <p style="margin:0 0 6px;"><b>LinkedIn:</b> <a href="{LINKEDIN_URL}">{LINKEDIN_URL}</a></p>
-  <p style="margin:0 0 6px;"><b>GitHub:</b> <a href="{GITHUB_URL}">{GITHUB_URL}</a></p>
-  <p style="margin:0 0 6px;"><b>X:</b> <a href="{X_URL}">{X_URL}</a></p>
-  <p style="margin:0;"><b>Email:</b> {html.escape(EMAIL)}</p>
-</div>
-""", unsafe_allow_html=True)
+SITE.connect_header.render()
+SITE.connect_card.render()
 
 # --------------------------
 #     FOOTER
 # --------------------------
-st.markdown("<p style='text-align:center; color:#D0DAFF;'>Built with ❤️ using Streamlit</p>", unsafe_allow_html=True)
+SITE.footer.render()
+
+telemetry.page_beacon("Home2")
+startup.show_report("Home2")
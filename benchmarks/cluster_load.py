@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for portfolio.cluster.
+
+For each worker count, launches the cluster as a subprocess, waits for
+every worker to be healthy, then runs many concurrent browser-like
+sessions through the proxy. Each session does a GET / (which pins it
+with the pf_worker cookie), opens /_stcore/stream with that cookie, and
+asks for script reruns back to back. Reports script runs/s, latency
+p50 / p99 and how the sessions spread over the workers.
+
+Scaling needs cores: on an N-core machine runs/s should grow roughly
+with the worker count up to N, since one Streamlit process executes its
+scripts under one GIL.
+
+    python benchmarks/cluster_load.py
+    python benchmarks/cluster_load.py --workers 1 2 4 8 --sessions 64 --runs 10
+
+Needs `websockets` (pip install websockets), which the app itself does not.
+"""
+import argparse
+import asyncio
+import collections
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import List, Tuple
+
+try:
+    import websockets  # optional: pip install websockets (only this benchmark needs it)
+except ImportError:
+    websockets = None
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def pct(values: List[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+def wait_healthy(port: int, n: int, timeout: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_cluster/health", timeout=2) as r:
+                if json.load(r)["healthy"] >= n:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"cluster on :{port} did not report {n} healthy workers")
+
+
+def rerun() -> bytes:
+    msg = BackMsg()
+    msg.rerun_script.query_string = ""
+    msg.rerun_script.page_script_hash = ""
+    return msg.SerializeToString()
+
+
+async def session(port: int, runs: int, lat: List[float], pins: collections.Counter) -> None:
+    def fetch_cookie() -> str:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=30) as r:
+            return r.headers.get("Set-Cookie", "").split(";")[0]
+
+    cookie = await asyncio.to_thread(fetch_cookie)
+    pins[cookie] += 1
+    async with websockets.connect(f"ws://127.0.0.1:{port}/_stcore/stream", subprotocols=["streamlit"],
+                                  additional_headers={"Cookie": cookie}, max_size=None,
+                                  open_timeout=60) as ws:
+        for _ in range(runs):
+            t = time.perf_counter()
+            await ws.send(rerun())
+            while True:
+                fwd = ForwardMsg()
+                fwd.ParseFromString(await ws.recv())
+                if fwd.WhichOneof("type") == "script_finished":
+                    break
+            lat.append((time.perf_counter() - t) * 1000)
+
+
+async def load(port: int, sessions: int, runs: int) -> Tuple[float, List[float], collections.Counter]:
+    lat: List[float] = []
+    pins: collections.Counter = collections.Counter()
+    t0 = time.perf_counter()
+    await asyncio.gather(*(session(port, runs, lat, pins) for _ in range(sessions)))
+    return time.perf_counter() - t0, lat, pins
+
+
+def bench(workers: int, port: int, sessions: int, runs: int, script: str) -> None:
+    cache = tempfile.mkdtemp(prefix="portfolio-cache-")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "portfolio.cluster", script, "-n", str(workers), "--host", "127.0.0.1",
+         "--port", str(port), "--worker-port", str(port + 100), "--cache-dir", cache],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_healthy(port, workers)
+        asyncio.run(load(port, min(sessions, 4), 1))  # first runs: imports, prewarm, page caches
+        elapsed, lat, pins = asyncio.run(load(port, sessions, runs))
+        print(f"{workers} worker(s): {len(lat)} runs in {elapsed:.2f} s ({len(lat) / elapsed:,.1f} runs/s)  "
+              f"p50 {statistics.median(lat):.0f} ms  p99 {pct(lat, 99):.0f} ms  "
+              f"sessions/worker {sorted(pins.values(), reverse=True)}")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--sessions", type=int, default=32, help="concurrent browser sessions")
+    ap.add_argument("--runs", type=int, default=5, help="script reruns per session")
+    ap.add_argument("--port", type=int, default=8701)
+    ap.add_argument("--script", default="Home.py")
+    args = ap.parse_args()
+    if websockets is None:
+        sys.exit("cluster_load needs the websockets package for /_stcore/stream: pip install websockets")
+
+    print(f"{args.sessions} sessions x {args.runs} reruns of {args.script} ({os.cpu_count()} CPUs)")
+    for n in args.workers:
+        bench(n, args.port, args.sessions, args.runs, args.script)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark.
+
+Runs each page in a fresh interpreter (so nothing is warm in sys.modules),
+with PORTFOLIO_PROFILE=1, and records: time to import streamlit, time to the
+page's first element, and time to finish the first script run. With
+--record, results are appended to a JSON-lines file tagged with
+`git describe`, and each page is compared with its last entry there, so the
+numbers can be followed release over release. Nothing is written otherwise.
+
+    python benchmarks/cold_start.py                 # all pages, 5 runs each
+    python benchmarks/cold_start.py Home.py -n 10
+    python benchmarks/cold_start.py --prewarm      # first visit after a warmed restart
+    python benchmarks/cold_start.py --record benchmarks/cold_start.jsonl
+
+Each child also reruns the page once more in the same interpreter, so the
+first visit can be compared with steady state.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["Home.py", "Home2.py", "pages/Playground.py", "pages/Loan_Scenarios.py"]
+
+# Executed in the child interpreter. The profiler goes in before streamlit so
+# its own import cost is part of the picture.
+_CHILD = r"""
+import json, sys, time
+from portfolio import startup
+startup.install()
+from streamlit.testing.v1 import AppTest
+startup.mark("streamlit_imported")
+if "--prewarm" in sys.argv:
+    from portfolio import prewarm
+    prewarm.ensure_started(log=False).wait()
+    startup.mark("prewarm_ready")
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+startup.mark("first_run_start")
+at.run()
+startup.mark("first_run_done")
+t = time.perf_counter()
+at.run()
+startup._marks["steady_run_s"] = time.perf_counter() - t
+print(json.dumps({
+    "marks": startup._marks,
+    "top_imports": startup._profiler.top(10),
+    "exception": [str(e.value) for e in at.exception],
+}))
+"""
+
+
+def run_once(page: str, prewarmed: bool = False) -> Dict:
+    env = dict(os.environ, PORTFOLIO_PROFILE="1", PYTHONPATH=ROOT)
+    t0 = time.perf_counter()
+    argv = [sys.executable, "-c", _CHILD, page] + (["--prewarm"] if prewarmed else [])
+    out = subprocess.run(argv, cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - t0
+    data = json.loads(out.stdout.strip().splitlines()[-1])
+    data["wall"] = wall
+    return data
+
+
+def git_describe() -> str:
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def previous(results: Optional[str], page: str) -> Dict:
+    """Most recent result for `page` recorded in `results`."""
+    if not results or not os.path.exists(results):
+        return {}
+    last: Dict = {}
+    with open(results, encoding="utf-8") as f:
+        for line in f:
+            rec = json.loads(line)
+            if rec.get("page") == page and "first_run_ms" in rec:
+                last = rec
+    return last
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("pages", nargs="*", default=PAGES)
+    ap.add_argument("-n", "--runs", type=int, default=5)
+    ap.add_argument("--record", metavar="PATH",
+                    help="append results to this JSON-lines file and compare with its last entries")
+    ap.add_argument("--prewarm", action="store_true",
+                    help="let portfolio.prewarm finish before the first visit (as the launcher does)")
+    args = ap.parse_args()
+
+    rev = git_describe()
+    for page in args.pages:
+        runs: List[Dict] = [run_once(page, args.prewarm) for _ in range(args.runs)]
+        if any(r["exception"] for r in runs):
+            print(f"{page}: script raised {runs[0]['exception']}", file=sys.stderr)
+
+        def med(key: str) -> float:
+            return statistics.median(r["marks"].get(key, float("nan")) for r in runs) * 1000
+
+        rec = {
+            "rev": rev,
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "page": page,
+            "runs": args.runs,
+            "streamlit_import_ms": round(med("streamlit_imported"), 1),
+            "first_element_ms": round(med("first_element"), 1),
+            "first_run_ms": round(med("first_run_done"), 1),
+            "prewarm": args.prewarm,
+            "first_visit_ms": round(statistics.median(
+                r["marks"]["first_run_done"] - r["marks"]["first_run_start"] for r in runs) * 1000, 1),
+            "steady_visit_ms": round(med("steady_run_s"), 1),
+            "wall_ms": round(statistics.median(r["wall"] for r in runs) * 1000, 1),
+            "top_imports": [(m, round(c * 1000, 1)) for m, c, _ in runs[-1]["top_imports"]],
+        }
+        prev = previous(args.record, page)
+        delta = ""
+        if prev:
+            delta = f"  (was {prev['first_run_ms']} ms @ {prev['rev']})"
+        print(f"{page:<26} first element {rec['first_element_ms']:8.1f} ms   "
+              f"first run {rec['first_run_ms']:8.1f} ms{delta}")
+        print(f"{'':<26} first visit {rec['first_visit_ms']:8.1f} ms   steady {rec['steady_visit_ms']:8.1f} ms"
+              f"{'   (prewarmed)' if args.prewarm else ''}")
+        if args.record:
+            with open(args.record, "a", encoding="utf-8") as f:
+                f.write(json.dumps(rec) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Search index benchmark.
+
+Grows the catalog from the real site entries to thousands of synthetic ones
+and reports index build time, payload size shipped to the browser, and
+per-keystroke query latency (p50 / p99). The Python query mirrors the
+widget's JavaScript; if `node` is on PATH the shipped JS is timed too.
+
+    python benchmarks/search_latency.py
+    python benchmarks/search_latency.py --sizes 1000 10000
+"""
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from portfolio.content import load_content  # noqa: E402
+from portfolio.search import _WIDGET, Entry, SearchIndex, entries_from_content, tokenize  # noqa: E402
+
+
+def synthetic_catalog(n: int, seed: int = 7) -> List[Entry]:
+    """Real entries plus recombinations of their vocabulary, up to n entries."""
+    base = entries_from_content(load_content())
+    vocab = sorted({t for e in base for t in tokenize(f"{e.title} {e.detail}") if len(t) > 2})
+    rng = random.Random(seed)
+    out = list(base)
+    kinds = ["Skill", "Project", "App"]
+    while len(out) < n:
+        title = " ".join(rng.choice(vocab).title() for _ in range(rng.randint(1, 4)))
+        detail = " ".join(rng.choice(vocab) for _ in range(rng.randint(4, 16)))
+        out.append(Entry(rng.choice(kinds), f"{title} {len(out)}", detail))
+    return out[:n]
+
+
+def keystrokes(idx: SearchIndex, count: int, seed: int = 11) -> List[str]:
+    """Prefixes of real words as a visitor would type them ("p", "py", "pyt", ...)."""
+    rng = random.Random(seed)
+    words = [t for text in idx.texts for t in text.split()]
+    out: List[str] = []
+    while len(out) < count:
+        w = rng.choice(words)
+        out += [w[:k] for k in range(1, len(w) + 1)]
+    return out[:count]
+
+
+def pct(values: List[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+def bench_js(idx: SearchIndex, queries: List[str]) -> List[float]:
+    script = re.search(r"<script>(.*)</script>", _WIDGET, re.S).group(1).split("const esc")[0]
+    script = script.replace("__INDEX__", idx.to_json())
+    script += """
+const QS = %s, times = [];
+for (let w = 0; w < 200; w++) query(QS[w %% QS.length], 25);
+for (const q of QS) { const t = process.hrtime.bigint(); query(q, 25); times.push(Number(process.hrtime.bigint() - t) / 1e6); }
+console.log(JSON.stringify(times));
+""" % json.dumps(queries)
+    with tempfile.NamedTemporaryFile("w", suffix=".js", delete=False, encoding="utf-8") as f:
+        f.write(script)
+    try:
+        return json.loads(subprocess.check_output(["node", f.name]))
+    finally:
+        os.unlink(f.name)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="*", default=[100, 1_000, 5_000, 20_000])
+    ap.add_argument("--queries", type=int, default=2_000)
+    args = ap.parse_args()
+    has_node = shutil.which("node") is not None
+
+    print(f"{'entries':>8} {'build ms':>9} {'payload KB':>11} {'py p50 µs':>10} {'py p99 µs':>10}"
+          + (f" {'js p50 µs':>10} {'js p99 µs':>10}" if has_node else ""))
+    for n in args.sizes:
+        entries = synthetic_catalog(n)
+        t0 = time.perf_counter()
+        idx = SearchIndex(entries)
+        build = (time.perf_counter() - t0) * 1000
+        payload = len(idx.to_json().encode("utf-8")) / 1024
+        qs = keystrokes(idx, args.queries)
+
+        times = []
+        for q in qs:
+            t = time.perf_counter()
+            idx.query(q, 25)
+            times.append((time.perf_counter() - t) * 1e6)
+        row = f"{n:>8} {build:>9.1f} {payload:>11.1f} {statistics.median(times):>10.1f} {pct(times, 99):>10.1f}"
+        if has_node:
+            js = [t * 1000 for t in bench_js(idx, qs)]
+            row += f" {statistics.median(js):>10.1f} {pct(js, 99):>10.1f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark for portfolio.static_server.
+
+Starts the server in-process on a free port, opens many keep-alive
+connections at once, and has each one fetch a mix of hub paths (some
+with If-None-Match, some with a Range). Reports requests/s, latency p50 /
+p99 and the status mix.
+
+    python benchmarks/static_load.py
+    python benchmarks/static_load.py --connections 5000 --requests 10
+"""
+import argparse
+import asyncio
+import collections
+import os
+import resource
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from portfolio.static_server import MAX_HEADER_BYTES, StaticServer, build_table  # noqa: E402
+
+PATHS = ["/", "/assets/site.css", "/assets/site.js", "/apps/apps.json", "/manifest.json",
+         "/apps/asteroids.html", "/icons/icon-192.png"]
+
+
+def pct(values: List[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+async def client(port: int, n: int, etags: Dict[str, str], lat: List[float], status: collections.Counter) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for i in range(n):
+            path = PATHS[i % len(PATHS)]
+            extra = ""
+            if i % 3 == 1 and path in etags:
+                extra = f"If-None-Match: {etags[path]}\r\n"
+            elif i % 5 == 2:
+                extra = "Range: bytes=0-99\r\n"
+            t = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: x\r\nAccept-Encoding: gzip, br\r\n{extra}\r\n".encode())
+            head = await reader.readuntil(b"\r\n\r\n")
+            lines = head.decode("latin-1").split("\r\n")
+            hdrs = {k.lower(): v for k, _, v in (l.partition(": ") for l in lines[1:] if l)}
+            await reader.readexactly(int(hdrs.get("content-length", 0)))
+            lat.append((time.perf_counter() - t) * 1000)
+            code = int(lines[0].split(" ")[1])
+            status[code] += 1
+            if code == 200:
+                etags[path] = hdrs["etag"]
+    finally:
+        writer.close()
+
+
+async def run(connections: int, requests: int) -> Tuple[float, List[float], collections.Counter]:
+    server = StaticServer(build_table())
+    srv = await asyncio.start_server(server.handle, "127.0.0.1", 0, backlog=8192, limit=MAX_HEADER_BYTES)
+    port = srv.sockets[0].getsockname()[1]
+    lat: List[float] = []
+    status: collections.Counter = collections.Counter()
+    etags: Dict[str, str] = {}
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client(port, requests, etags, lat, status) for _ in range(connections)))
+    elapsed = time.perf_counter() - t0
+    srv.close()
+    await srv.wait_closed()
+    return elapsed, lat, status
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--connections", type=int, default=2_000)
+    ap.add_argument("--requests", type=int, default=20, help="per connection")
+    args = ap.parse_args()
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    need = 2 * args.connections + 64  # both ends live in this process
+    if soft < need:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(need, hard), hard))
+
+    elapsed, lat, status = asyncio.run(run(args.connections, args.requests))
+    total = len(lat)
+    print(f"{args.connections} connections x {args.requests} requests: {total:,} in {elapsed:.2f} s "
+          f"({total / elapsed:,.0f} req/s)")
+    print(f"latency ms: p50 {statistics.median(lat):.2f}  p99 {pct(lat, 99):.2f}  max {max(lat):.2f}")
+    print("status: " + ", ".join(f"{k}×{v:,}" for k, v in sorted(status.items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+from portfolio import fonts, prewarm, startup, telemetry
+startup.enable_from_env()
+prewarm.ensure_started()
+
+import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+
+from portfolio.amortization import MAX_SCENARIOS, LoanGrid, cap_steps, sweep, schedules
+
+# --------------------------
+#     PAGE CONFIG
+# --------------------------
+st.set_page_config(page_title="Loan Scenarios", page_icon="📈", layout="wide")
+
+# --------------------------
+#     STYLES
+# --------------------------
+st.markdown(fonts.font_head("Orbitron"), unsafe_allow_html=True)
+st.markdown("""
+    <style>
+    .stApp {
+        background: linear-gradient(to right, #0A2540, #1E90FF);
+        color: white;
+    }
+    h1 {
+        font-family: 'Orbitron', sans-serif;
+        color: #FFD700;
+    }
+    </style>
+""", unsafe_allow_html=True)
+startup.mark_first_render()
+
+st.markdown("<h1>Loan Scenario Explorer 📈</h1>", unsafe_allow_html=True)
+st.write("Sweep every combination of rate, term, down payment and extra monthly payment at once. "
+         "Same math as the Mortgage / Car Loan calculators, vectorized.")
+
+# --------------------------
+#     SIDEBAR: GRID INPUTS
+# --------------------------
+with st.sidebar:
+    st.markdown("### Scenario Grid")
+    kind = st.radio("Loan type", ["Mortgage", "Car Loan"], horizontal=True)
+    if kind == "Mortgage":
+        price = st.number_input("Home Price ($)", value=400_000, step=10_000)
+        sales_tax, fees = 0.0, 0.0
+        term_opts, term_default = [120, 180, 240, 300, 360], [180, 360]
+    else:
+        price = st.number_input("Vehicle Price ($)", value=30_000, step=1_000)
+        sales_tax = st.number_input("Sales Tax (%)", value=7.0, step=0.5)
+        fees = st.number_input("Fees ($)", value=500, step=50)
+        term_opts, term_default = [36, 48, 60, 72, 84], [36, 60, 84]
+
+    rate_lo, rate_hi = st.slider("APR range (%)", 0.0, 15.0, (2.0, 9.0), step=0.25)
+    rate_steps = st.slider("APR steps", 5, 200, 60)
+    down_hi = st.slider("Max down payment (% of price)", 0, 80, 40)
+    down_steps = st.slider("Down payment steps", 5, 200, 41)
+    terms = st.multiselect("Terms (months)", term_opts, default=term_default)
+    extra_hi = st.number_input("Max extra per month ($)", value=1_000 if kind == "Mortgage" else 200, step=50)
+    extra_steps = st.slider("Extra payment steps", 1, 50, 11)
+
+if not terms:
+    st.info("Pick at least one term.")
+    st.stop()
+
+# 200 x 200 x 5 x 50 would be 10M scenarios (~0.4 GB per result): shrink the axes to fit.
+wanted = rate_steps * down_steps * extra_steps * len(terms)
+rate_steps, down_steps, extra_steps = cap_steps((rate_steps, down_steps, extra_steps), fixed=len(terms))
+capped = rate_steps * down_steps * extra_steps * len(terms) < wanted
+
+grid = LoanGrid.build(
+    price=price,
+    rates_pct=np.linspace(rate_lo, rate_hi, rate_steps),
+    terms_months=sorted(terms),
+    downs=np.linspace(0.0, price * down_hi / 100.0, down_steps),
+    extras=np.linspace(0.0, extra_hi, extra_steps) if extra_steps > 1 else (0.0,),
+    sales_tax_pct=sales_tax,
+    fees=fees,
+)
+res = sweep(grid)
+st.caption(f"{grid.size:,} scenarios")
+if capped:
+    st.warning(f"{wanted:,} scenarios is more than the {MAX_SCENARIOS:,} this page sweeps at once, so the grid "
+               f"was thinned to {rate_steps} APR × {down_steps} down payment × {extra_steps} extra-payment steps.")
+
+# --------------------------
+#     SURFACE: TOTAL INTEREST (rate x down)
+# --------------------------
+st.markdown("### Total interest surface")
+c1, c2, c3 = st.columns(3)
+with c1:
+    ti = st.selectbox("Term", range(len(grid.terms_months)), format_func=lambda i: f"{grid.terms_months[i]} months")
+with c2:
+    ei = st.select_slider("Extra per month", options=list(range(len(grid.extras))),
+                          format_func=lambda i: f"${grid.extras[i]:,.0f}")
+with c3:
+    metric = st.selectbox("Metric", ["total_interest", "monthly_total", "months", "interest_saved"],
+                          format_func=lambda m: m.replace("_", " ").title())
+
+z = res[metric][:, ti, :, ei]
+fig = go.Figure(go.Surface(
+    x=np.asarray(grid.downs), y=np.asarray(grid.rates_pct), z=z, colorscale="Viridis",
+    hovertemplate="Down $%{x:,.0f}<br>APR %{y:.2f}%<br>%{z:,.0f}<extra></extra>",
+))
+fig.update_layout(
+    scene=dict(xaxis_title="Down payment ($)", yaxis_title="APR (%)", zaxis_title=metric.replace("_", " ")),
+    height=560, margin=dict(l=0, r=0, t=10, b=0),
+    paper_bgcolor="rgba(0,0,0,0)", font_color="white",
+)
+st.plotly_chart(fig, width="stretch")
+
+# --------------------------
+#     AMORTIZATION CURVES
+# --------------------------
+st.markdown("### Amortization curves")
+r1, r2 = st.columns(2)
+with r1:
+    ri = st.select_slider("APR", options=list(range(len(grid.rates_pct))),
+                          value=len(grid.rates_pct) // 2, format_func=lambda i: f"{grid.rates_pct[i]:.2f}%")
+with r2:
+    di = st.select_slider("Down payment", options=list(range(len(grid.downs))),
+                          value=len(grid.downs) // 2, format_func=lambda i: f"${grid.downs[i]:,.0f}")
+
+# One curve per extra-payment plan (capped to keep the chart readable)
+plan_idx = sorted(set(np.linspace(0, len(grid.extras) - 1, min(5, len(grid.extras))).astype(int).tolist()))
+index = tuple((ri, ti, di, e) for e in plan_idx)
+sch = schedules(grid, index)
+
+curves = go.Figure()
+for row, e in enumerate(plan_idx):
+    months = int(res["months"][ri, ti, di, e])
+    curves.add_trace(go.Scatter(
+        x=sch["month"][:months], y=sch["balance"][row, :months], mode="lines",
+        name=f"+${grid.extras[e]:,.0f}/mo · {months} mo · ${res['total_interest'][ri, ti, di, e]:,.0f} interest",
+    ))
+curves.update_layout(
+    xaxis_title="Month", yaxis_title="Balance ($)", height=420, margin=dict(l=0, r=0, t=10, b=0),
+    paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0.25)", font_color="white",
+    legend=dict(orientation="h", y=-0.2),
+)
+st.plotly_chart(curves, width="stretch")
+
+split = go.Figure()
+split.add_trace(go.Scatter(x=sch["month"], y=sch["interest"][0], name="Interest", stackgroup="pi"))
+split.add_trace(go.Scatter(x=sch["month"], y=sch["principal"][0], name="Principal", stackgroup="pi"))
+split.update_layout(
+    xaxis_title="Month", yaxis_title="Payment split ($)", height=320, margin=dict(l=0, r=0, t=10, b=0),
+    paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0.25)", font_color="white",
+)
+st.caption("Payment split without extra payments")
+st.plotly_chart(split, width="stretch")
+
+telemetry.page_beacon("Loan_Scenarios")
+startup.show_report("Loan_Scenarios")
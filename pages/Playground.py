@@ -1,16 +1,22 @@
 #!/usr/bin/env python3
+from portfolio import deeplink, fonts, prewarm, startup, telemetry
+startup.enable_from_env()
+prewarm.ensure_started()
+
 import streamlit as st
-import json
+import importlib.util
 import os
-from typing import List, Optional, Tuple, Any
-from streamlit_lottie import st_lottie
+from typing import List, Optional
+
+from portfolio.content import load_content
+from portfolio.embed import app_path, embedded_app_html
+from portfolio.hero import lottie_hero
+from portfolio.lottie_meta import catalog as lottie_catalog, read_meta
+from portfolio.search import render_search
 
-# Optional auto-height helper (not required)
-try:
-    from streamlit_js_eval import get_page_info
-    _HAS_JS_EVAL = True
-except Exception:
-    _HAS_JS_EVAL = False
+# Optional auto-height helper (not required). Only probe for it here; the
+# import itself happens in _iframe_height() when an app is actually embedded.
+_HAS_JS_EVAL = importlib.util.find_spec("streamlit_js_eval") is not None
 
 # --------------------------
 #     PAGE CONFIG
@@ -20,9 +26,9 @@ st.set_page_config(page_title="Playground", page_icon="🛠️", layout="wide")
 # --------------------------
 #     STYLES
 # --------------------------
+st.markdown(fonts.font_head("Orbitron"), unsafe_allow_html=True)
 st.markdown("""
     <style>
-    @import url('https://fonts.googleapis.com/css2?family=Orbitron&display=swap');
     .stApp {
         background: linear-gradient(to right, #0A2540, #1E90FF);
         color: white;
@@ -56,6 +62,7 @@ st.markdown("""
     }
     </style>
 """, unsafe_allow_html=True)
+startup.mark_first_render()
 
 # --------------------------
 #     HELPERS
@@ -88,16 +95,11 @@ def _normalize_abs(p: str) -> str:
         p = "/" + p
     return os.path.abspath(p) if not os.path.isabs(p) else p
 
-def load_lottie_from_candidates(candidates: List[str]) -> Tuple[Optional[Any], Optional[str]]:
-    for path in candidates:
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f), path
-        except Exception:
-            continue
-    return None, None
+def first_lottie(candidates: List[str]) -> Optional[str]:
+    """First candidate whose header reads as a Lottie document (lottie_hero renders from the path)."""
+    return next((path for path in candidates if read_meta(path) is not None), None)
 
-def load_lottie(best_name_or_path: Optional[str], fallback_name: Optional[str] = None) -> Tuple[Optional[Any], Optional[str]]:
+def find_lottie(best_name_or_path: Optional[str], fallback_name: Optional[str] = None) -> Optional[str]:
     """
     Tries, in order:
     1) Custom absolute path (with smart fixes).
@@ -105,10 +107,9 @@ def load_lottie(best_name_or_path: Optional[str], fallback_name: Optional[str] =
     """
     if best_name_or_path:
         cand = _normalize_abs(best_name_or_path)
-        abs_candidates = _fix_json_extension(cand)
-        data, used = load_lottie_from_candidates(abs_candidates)
-        if data is not None:
-            return data, used
+        used = first_lottie(_fix_json_extension(cand))
+        if used is not None:
+            return used
 
     # Fall back to name-based search (Laptop / Tennis Ball)
     name = fallback_name or "Laptop"
@@ -121,8 +122,7 @@ def load_lottie(best_name_or_path: Optional[str], fallback_name: Optional[str] =
     ):
         local_candidates += _fix_json_extension(base)
 
-    data, used = load_lottie_from_candidates(local_candidates)
-    return data, used
+    return first_lottie(local_candidates)
 
 def _iframe_height(auto_margin: int = 120, fallback: int = 800) -> int:
     """
@@ -132,6 +132,7 @@ def _iframe_height(auto_margin: int = 120, fallback: int = 800) -> int:
     if not _HAS_JS_EVAL:
         return fallback
     try:
+        from streamlit_js_eval import get_page_info
         page_info = get_page_info()  # {'innerHeight': ..., 'innerWidth': ...}
         viewport_h = int(page_info.get("innerHeight", fallback))
         return max(400, viewport_h - auto_margin)
@@ -143,7 +144,16 @@ def _iframe_height(auto_margin: int = 120, fallback: int = 800) -> int:
 # --------------------------
 with st.sidebar:
     st.markdown("### Lottie Options")
-    animation_choice = st.selectbox("Choose an animation", ["Laptop", "Tennis Ball"])
+    # Names and sizes come from each file's header; nothing is fully parsed to build the list.
+    animations = {m.name: m for m in lottie_catalog()} or {"Laptop": None}
+    # ?animation=laptop and ?app=asteroids deep-link straight to that view (portfolio.deeplink).
+    animation_choice = st.selectbox(
+        "Choose an animation", list(animations),
+        key="animation", on_change=deeplink.bind("animation", "animation", list(animations)),
+        format_func=lambda n: f"{n} ({animations[n].w}×{animations[n].h})" if animations[n] else n,
+    )
+    if animations[animation_choice]:
+        st.caption(animations[animation_choice].describe())
     custom_path = st.text_input(
         "Custom Lottie path (optional)",
         help="Paste an absolute path to a .json (handles missing leading '/' and double '.json.json')."
@@ -153,6 +163,8 @@ with st.sidebar:
             st.rerun()
         except Exception:
             st.experimental_rerun()
+    st.markdown("### Search")
+    render_search()
 
 # --------------------------
 #     UI: EFFECTS
@@ -171,9 +183,11 @@ with col1:
     st.markdown("<h1>My App Playground 🛠️</h1>", unsafe_allow_html=True)
     st.write("Explore the apps I've built or am working on. Select an app to interact with it here!")
 with col2:
-    lottie_data, used_path = load_lottie(custom_path, animation_choice)
-    if lottie_data:
-        st_lottie(lottie_data, height=200, key="playground_anim")
+    used_path = find_lottie(custom_path, animation_choice)
+    # A custom file can have a valid header and a broken body; lottie_hero reports that.
+    if used_path and not lottie_hero(used_path, max_width=300, max_height=200):
+        used_path = None
+    if used_path:
         if custom_path:
             st.caption(f"Loaded Lottie from: `{used_path}`")
     else:
@@ -187,15 +201,11 @@ with col2:
 #     APPS
 # --------------------------
 st.markdown("### Available Apps")
-apps = {
-    "Round Robin Tennis": "apps/round_robin.html",  # relative to project root (one level up from pages/)
-    "Mortgage Calculator": "apps/mortgage_calculator.html",
-    "Car Loan Calculator": "apps/car_loan_calculator.html",
-    "Tennis Score & Stats Tracker": "apps/tennis_tracker.html",
-    "Asteroids": "apps/asteroids.html",
-    "Sports Stroke Form": "apps/sports_stroke_form.html"
-}
-selected_app = st.selectbox("Select an app to run", list(apps.keys()))
+# Registry lives in content/site.json (shared with the site search index).
+# Paths are relative to project root (one level up from pages/).
+apps = {a.title.raw: a.path for a in load_content().playground_apps}
+selected_app = st.selectbox("Select an app to run", list(apps.keys()),
+                            key="app", on_change=deeplink.bind("app", "app", list(apps.keys())))
 
 # --------------------------
 #     EMBEDDER: DYNAMIC WHITE BACKGROUND + CONFIRM BINDING
@@ -208,150 +218,9 @@ if selected_app in apps:
             unsafe_allow_html=True
         )
     else:
-        app_path = os.path.join(PROJECT_ROOT, url_or_path)
-
         try:
-            with open(app_path, "r", encoding="utf-8") as f:
-                html_content = f.read()
-
-            # --- DYNAMIC WHITE CARD CONTAINER ---
-            # Body becomes transparent; card (#rr-container) is white, auto-height, padded.
-            injected_css = """
-<style>
-  /* Make page background transparent so extra iframe space isn't a big white box */
-  html, body {
-      background: transparent !important;
-  }
-
-  /* Our dynamic white card wrapper */
-  #rr-container {
-      background: #ffffff !important;
-      color: #000;               /* ensure readability inside */
-      display: inline-block;     /* shrink-wrap to content width */
-      padding: 16px 18px;
-      margin: 10px 12px;
-      border-radius: 10px;
-      box-shadow: 0 6px 20px rgba(0,0,0,0.10);
-      max-width: 100%;
-  }
-
-  /* Keep original app pieces readable against white */
-  .match, button, input, select, #initialSetup, #setup, #tournament, #final {
-      background-color: transparent !important;  /* now inside white card */
-  }
-  button {
-      display: inline-block !important;
-      padding: 8px 14px; margin: 6px 6px 6px 0;
-      background-color: #4CAF50 !important; color: white !important; border: none; border-radius: 4px;
-      cursor: pointer;
-  }
-  button:hover { background-color: #45a049 !important; }
-</style>
-"""
-
-            # JS: wrap all body content in #rr-container; keep your confirm binding logic
-            injected_js = """
-<script>
-(function(){
-  function log(){ try { console.log.apply(console, arguments); } catch(e){} }
-
-  // Wrap everything in a white "card" that auto-sizes with content
-  function wrapInCard(){
-    if (document.getElementById('rr-container')) return;
-    var card = document.createElement('div');
-    card.id = 'rr-container';
-
-    // Move all current body children into the card
-    var currentScript = document.currentScript;
-    var kids = Array.prototype.slice.call(document.body.childNodes);
-    kids.forEach(function(node){
-      if (node !== card && node !== currentScript) {
-        card.appendChild(node);
-      }
-    });
-    document.body.appendChild(card);
-  }
-
-  function ensureConfirmDefined(){
-    if (typeof window.confirmPlayerCount === 'function') return true;
-    window.confirmPlayerCount = function(){
-      log('[Injected] confirmPlayerCount called');
-      var numEl = document.getElementById('numPlayers');
-      if(!numEl){ alert('numPlayers input not found'); return; }
-      var num = parseInt(numEl.value);
-      if (isNaN(num) || num < 2 || num > 20) {
-        alert('Please enter a number of players between 2 and 20.');
-        return;
-      }
-      var div = document.getElementById('playerNames');
-      if(!div){ alert('playerNames container not found'); return; }
-      div.innerHTML = '';
-      for (var i=1;i<=num;i++){
-        div.insertAdjacentHTML('beforeend',
-          '<label>Player '+i+' Name:</label><input type="text" id="player'+i+'" placeholder="Player '+i+'"><br>');
-      }
-      var init = document.getElementById('initialSetup');
-      var setup = document.getElementById('setup');
-      if (init) init.style.display='none';
-      if (setup) setup.style.display='block';
-    };
-    return true;
-  }
-
-  function bindConfirm(){
-    var btn =
-      document.querySelector('button[onclick*="confirmPlayerCount"]') ||
-      document.getElementById('confirmBtn') ||
-      Array.from(document.querySelectorAll('button'))
-        .find(function(b){ return ((b.textContent || '').trim().toLowerCase() === 'confirm'); });
-
-    if(!btn){ return false; }
-    ensureConfirmDefined();
-    btn.onclick = function(e){
-      e.preventDefault();
-      try {
-        window.confirmPlayerCount();
-      } catch(err){
-        console.error('Error in confirmPlayerCount:', err);
-        alert('Error: ' + (err && err.message ? err.message : err));
-      }
-    };
-    log('[Injected] Confirm button bound');
-    return true;
-  }
-
-  function tryBind(){
-    wrapInCard();
-    if (bindConfirm()) return;
-
-    var mo = new MutationObserver(function(){
-      wrapInCard();
-      bindConfirm();
-    });
-    mo.observe(document.documentElement || document.body, {childList:true, subtree:true});
-
-    [100, 300, 800, 1500].forEach(function(ms){ setTimeout(function(){
-      wrapInCard();
-      bindConfirm();
-    }, ms); });
-  }
-
-  if (document.readyState === 'loading'){
-    document.addEventListener('DOMContentLoaded', tryBind);
-  } else {
-    tryBind();
-  }
-})();
-</script>
-"""
-
-            # Insert before </body> if present (case-insensitive), else append
-            lower = html_content.lower()
-            if "</body>" in lower:
-                idx = lower.rfind("</body>")
-                modified_html = html_content[:idx] + injected_css + injected_js + html_content[idx:]
-            else:
-                modified_html = html_content + injected_css + injected_js
+            # Wrapper CSS/JS is injected once per file version (portfolio.embed).
+            modified_html = embedded_app_html(app_path(url_or_path))
 
             # --- iframe height (tweak as you wish) ---
             iframe_height = _iframe_height(auto_margin=120, fallback=800)
@@ -367,3 +236,6 @@ st.markdown("### Quick Links")
 for app_name, url in apps.items():
     if url.startswith("http"):
         st.markdown(f'<a href="{url}" target="_blank" class="app-link">{app_name}</a>', unsafe_allow_html=True)
+
+telemetry.page_beacon("Playground")
+startup.show_report("Playground")
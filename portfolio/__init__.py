@@ -0,0 +1 @@
+"""Shared helpers for the Streamlit portfolio pages (Home.py, Home2.py, pages/)."""
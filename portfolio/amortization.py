@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Vectorized amortization engine.
+
+Same math as `pmt()` / `calculate()` in apps/mortgage_calculator.html and
+apps/car_loan_calculator.html, but evaluated for a whole grid of
+rates x terms x down payments x extra monthly payments at once with numpy.
+Summaries use the closed-form balance recurrence, so a sweep costs O(grid)
+instead of O(grid * months); full month-by-month schedules are only built
+for the scenarios you ask for.
+
+A sweep holds about 44 bytes per scenario, and building it needs about
+twice that at peak. Grids are therefore limited to MAX_SCENARIOS, and
+`cap_steps()` shrinks the axes to fit. The sweep cache
+is bounded by SWEEP_CACHE_BYTES rather than by a number of grids, so one
+process doesn't keep hundreds of MB of old slider positions alive.
+"""
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+MAX_SCENARIOS = 250_000                 # ~11 MB of results, ~20 MB peak while building
+SWEEP_CACHE_BYTES = 64 * 1024 * 1024    # per process, across all sessions
+
+# --------------------------
+#     INPUT GRID
+# --------------------------
+@dataclass(frozen=True)
+class LoanGrid:
+    """
+    A scenario grid. Axes are tuples so the grid is hashable and can key the cache.
+
+    financed principal = (price - down) * (1 + sales_tax_pct/100) + fees
+    (sales_tax_pct / fees are 0 for mortgages, as in mortgage_calculator.html).
+    """
+    price: float
+    rates_pct: Tuple[float, ...]       # APR in percent
+    terms_months: Tuple[int, ...]
+    downs: Tuple[float, ...]           # down payment in dollars
+    extras: Tuple[float, ...] = (0.0,) # extra principal per month in dollars
+    sales_tax_pct: float = 0.0
+    fees: float = 0.0
+
+    @classmethod
+    def build(cls, price: float, rates_pct: Sequence[float], terms_months: Sequence[int],
+              downs: Sequence[float], extras: Sequence[float] = (0.0,),
+              sales_tax_pct: float = 0.0, fees: float = 0.0) -> "LoanGrid":
+        """Normalize any sequences (lists, numpy arrays) into a hashable grid."""
+        return cls(
+            price=float(price),
+            rates_pct=tuple(float(r) for r in rates_pct),
+            terms_months=tuple(int(n) for n in terms_months),
+            downs=tuple(float(d) for d in downs),
+            extras=tuple(float(e) for e in extras),
+            sales_tax_pct=float(sales_tax_pct),
+            fees=float(fees),
+        )
+
+    @property
+    def shape(self) -> Tuple[int, int, int, int]:
+        return (len(self.rates_pct), len(self.terms_months), len(self.downs), len(self.extras))
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape))
+
+    def principal(self) -> np.ndarray:
+        downs = np.asarray(self.downs, dtype=np.float64)
+        return np.maximum((self.price - downs) * (1.0 + self.sales_tax_pct / 100.0) + self.fees, 0.0)
+
+
+def cap_steps(steps: Sequence[int], fixed: int = 1, limit: int = MAX_SCENARIOS) -> Tuple[int, ...]:
+    """
+    Step counts scaled down by one common factor so that fixed * prod(steps)
+    fits in `limit` (each stays >= 1). Unchanged when they already fit.
+    """
+    out = [max(1, int(s)) for s in steps]
+    if fixed * math.prod(out) <= limit:
+        return tuple(out)
+    f = (limit / (fixed * math.prod(out))) ** (1.0 / len(out))
+    out = [max(1, int(s * f)) for s in out]
+    while fixed * math.prod(out) > limit and max(out) > 1:
+        out[out.index(max(out))] -= 1
+    return tuple(out)
+
+
+# --------------------------
+#     CORE MATH (broadcasting)
+# --------------------------
+def _axes(grid: LoanGrid) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Return r, n, B0, E shaped to broadcast as (rate, term, down, extra)."""
+    r = (np.asarray(grid.rates_pct, dtype=np.float64) / 100.0 / 12.0)[:, None, None, None]
+    n = np.asarray(grid.terms_months, dtype=np.float64)[None, :, None, None]
+    b0 = grid.principal()[None, None, :, None]
+    e = np.asarray(grid.extras, dtype=np.float64)[None, None, None, :]
+    return r, n, b0, e
+
+
+def payment(r: np.ndarray, n: np.ndarray, b0: np.ndarray) -> np.ndarray:
+    """Level P&I payment; the vector form of pmt() in the JS calculators (positive sign)."""
+    zero = r == 0
+    safe_r = np.where(zero, 1.0, r)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        level = b0 * safe_r / (1.0 - (1.0 + safe_r) ** -n)
+    return np.where(zero, b0 / n, level)
+
+
+def _balance_after(b0: np.ndarray, r: np.ndarray, m: np.ndarray, k: np.ndarray) -> np.ndarray:
+    """Closed-form balance after k payments of m (may go negative past payoff)."""
+    zero = r == 0
+    safe_r = np.where(zero, 1.0, r)
+    g = (1.0 + safe_r) ** k
+    grown = b0 * g - m * (g - 1.0) / safe_r
+    return np.where(zero, b0 - m * k, grown)
+
+
+def _payoff_months(b0: np.ndarray, r: np.ndarray, m: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Number of payments until the balance hits zero (<= n because extras are >= 0)."""
+    zero = r == 0
+    safe_r = np.where(zero, 1.0, r)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.clip(1.0 - safe_r * b0 / np.where(m > 0, m, np.inf), 1e-300, 1.0)
+        k_rate = -np.log(ratio) / np.log1p(safe_r)
+        k_zero = b0 / np.where(m > 0, m, np.inf)
+    k = np.where(zero, k_zero, k_rate)
+    # Tolerance keeps exact payoffs (extra == 0) from rounding up one month.
+    k = np.ceil(k - 1e-7)
+    return np.clip(k, 0.0, n)
+
+
+# --------------------------
+#     SWEEP (summary per scenario)
+# --------------------------
+_sweeps: "OrderedDict[LoanGrid, Dict[str, np.ndarray]]" = OrderedDict()
+_sweep_bytes = 0
+_sweep_lock = threading.Lock()
+
+
+def sweep(grid: LoanGrid) -> Dict[str, np.ndarray]:
+    """
+    Summary for every scenario in the grid, each array shaped grid.shape:
+    payment, monthly_total, months, total_interest, interest_saved, principal.
+    Cached per grid, least recently used first out once the cache passes
+    SWEEP_CACHE_BYTES; returned arrays are read-only so callers cannot poison it.
+    """
+    global _sweep_bytes
+    if grid.size > MAX_SCENARIOS:
+        raise ValueError(f"{grid.size:,} scenarios; at most {MAX_SCENARIOS:,} (see cap_steps)")
+    with _sweep_lock:
+        hit = _sweeps.get(grid)
+        if hit is not None:
+            _sweeps.move_to_end(grid)
+            return hit
+    out = _sweep(grid)
+    with _sweep_lock:
+        if grid not in _sweeps:
+            _sweeps[grid] = out
+            _sweep_bytes += _nbytes(out)
+            while _sweep_bytes > SWEEP_CACHE_BYTES and len(_sweeps) > 1:
+                _, old = _sweeps.popitem(last=False)
+                _sweep_bytes -= _nbytes(old)
+    return out
+
+
+def _nbytes(result: Dict[str, np.ndarray]) -> int:
+    return sum(v.nbytes for v in result.values())
+
+
+def _sweep(grid: LoanGrid) -> Dict[str, np.ndarray]:
+    r, n, b0, e = _axes(grid)
+    r, n, b0, e = np.broadcast_arrays(r, n, b0, e)
+
+    pi = payment(r, n, b0)
+    m = pi + e
+    months = _payoff_months(b0, r, m, n)
+
+    # Final (partial) payment = balance before it plus one month of interest.
+    before_last = np.maximum(_balance_after(b0, r, m, np.maximum(months - 1.0, 0.0)), 0.0)
+    last = before_last * (1.0 + r)
+    total_paid = np.where(months > 0, (months - 1.0) * m + last, 0.0)
+    total_interest = np.maximum(total_paid - b0, 0.0)
+
+    base_interest = np.maximum(pi * n - b0, 0.0)
+    out = {
+        "principal": b0,
+        "payment": pi,
+        "monthly_total": m,
+        "months": months.astype(np.int32),
+        "total_interest": total_interest,
+        "interest_saved": np.maximum(base_interest - total_interest, 0.0),
+    }
+    for k, v in out.items():
+        v = np.ascontiguousarray(v)
+        v.setflags(write=False)
+        out[k] = v
+    return out
+
+
+# --------------------------
+#     FULL SCHEDULES (selected scenarios)
+# --------------------------
+@lru_cache(maxsize=64)
+def schedules(grid: LoanGrid, index: Tuple[Tuple[int, int, int, int], ...]) -> Dict[str, np.ndarray]:
+    """
+    Month-by-month schedules for the scenarios at `index` (tuples of grid indices),
+    computed together as one (scenarios x months) array operation.
+    Returns balance, interest, principal arrays shaped (len(index), max_term).
+    """
+    if not index:
+        empty = np.zeros((0, 0))
+        return {"month": np.zeros(0, dtype=np.int32), "balance": empty, "interest": empty, "principal": empty}
+
+    ri, ti, di, ei = (np.asarray(col) for col in zip(*index))
+    r = (np.asarray(grid.rates_pct) / 100.0 / 12.0)[ri][:, None]
+    n = np.asarray(grid.terms_months, dtype=np.float64)[ti][:, None]
+    b0 = grid.principal()[di][:, None]
+    e = np.asarray(grid.extras)[ei][:, None]
+
+    m = payment(r, n, b0) + e
+    k = np.arange(0, int(n.max()) + 1, dtype=np.float64)[None, :]
+    bal = np.maximum(_balance_after(b0, r, m, k), 0.0)
+    bal = np.where(k <= n, bal, 0.0)
+
+    interest = bal[:, :-1] * r
+    principal_paid = bal[:, :-1] - bal[:, 1:]
+    out = {
+        "month": np.arange(1, k.shape[1], dtype=np.int32),
+        "balance": bal[:, 1:],
+        "interest": interest,
+        "principal": principal_paid,
+    }
+    for v in out.values():
+        v.setflags(write=False)
+    return out
+
+
+def flat_index(grid: LoanGrid, flat: int) -> Tuple[int, int, int, int]:
+    """Convert a flat scenario number (e.g. argmin over sweep arrays) to grid indices."""
+    return tuple(int(i) for i in np.unravel_index(flat, grid.shape))  # type: ignore[return-value]
+
+
+if __name__ == "__main__":
+    # Quick benchmark: python -m portfolio.amortization
+    import time
+
+    g = LoanGrid.build(
+        price=400_000,
+        rates_pct=np.linspace(2.0, 9.0, 50),
+        terms_months=(120, 180, 240, 300, 360),
+        downs=np.linspace(0, 200_000, 41),
+        extras=np.linspace(0, 1_000, 11),
+    )
+    t0 = time.perf_counter()
+    res = sweep(g)
+    t1 = time.perf_counter()
+    print(f"{g.size:,} scenarios in {(t1 - t0) * 1000:.1f} ms "
+          f"(min interest ${res['total_interest'].min():,.0f}, max ${res['total_interest'].max():,.0f})")
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Incremental, parallel asset build.
+
+The whole-repo jobs (Lottie optimisation and poster frames, injected app
+documents, precompressed static files, the service-worker precache
+manifest) are modelled as a graph of steps over the source files:
+
+    lottie:<name>       Laptop.json ...            -> optimised JSON and poster frame
+    app:<name>          apps/<name>.html           -> injected, minified document (scripts
+                                                      compiled in Node to validate)
+    compress:<path>     index.html, assets/*, apps/*, manifest.json, ...
+                                                   -> build/precompressed/<key>.gz (.br), keyed by
+                                                      static_server.precompressed_key
+    fonts               fonts/*.ttf + page sources and content/site.json
+                                                   -> static/fonts/<family>-<hash>.woff2, build/fonts.json
+                                                      (subsets for the text the pages show)
+    precache            static_server.precached_files (SW_CORE plus the
+                        hrefs listed in apps/apps.json)
+                                                   -> build/precache.json
+
+The lottie and app steps write nothing under build/: what the pages read
+comes from the shared artifact cache (portfolio.diskcache), which they
+fill when PORTFOLIO_CACHE_DIR is set; without it they only check that
+every file still optimises and minifies cleanly. The compress and
+precache steps run static_server.served_body themselves (beacon, app
+minification), so they see the bytes the server sends without depending
+on the app steps. The static server stamps serviceWorker.js from
+precache.json, which is why that file has no prebuilt variants.
+
+A step's fingerprint is sha256 over its kind, the source digest of the
+modules that implement it, the content hashes of its inputs and the
+fingerprints of the steps it depends on. A step whose fingerprint matches
+the last build and whose outputs still exist is a cache hit. The rest run
+on a process pool as soon as their dependencies finish. Inputs are only
+re-read when their size or mtime changed since the last build.
+
+    python -m portfolio.build            # incremental
+    python -m portfolio.build --force    # rebuild everything
+    python -m portfolio.build -j 4
+
+Per-step timings and the hit rate go to build/report.json.
+"""
+import argparse
+import glob
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import brotli  # optional: pip install brotli
+except ImportError:
+    brotli = None
+
+from portfolio import diskcache
+from portfolio.diskcache import code_version
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUILD_DIR = os.path.join(PROJECT_ROOT, "build")
+STATE_FILE = ".build-state.json"
+REPORT_FILE = "report.json"
+
+STATIC_FILES = ("index.html", "manifest.json")   # serviceWorker.js is stamped at serve time
+STATIC_DIRS = ("assets", "apps")
+MIN_COMPRESS = 256
+
+
+@dataclass
+class Step:
+    name: str
+    kind: str
+    inputs: Tuple[str, ...]          # project-relative source files
+    outputs: Tuple[str, ...]         # build-relative artifacts
+    deps: Tuple[str, ...] = ()
+    fingerprint: str = ""
+    status: str = "pending"          # pending | cached | built | failed | skipped
+    seconds: float = 0.0
+    error: str = ""
+    info: Dict[str, object] = field(default_factory=dict)
+
+
+# --------------------------
+#     STEP IMPLEMENTATIONS (run in pool processes)
+# --------------------------
+def _write(rel_out: str, data: bytes) -> None:
+    path = os.path.join(BUILD_DIR, rel_out)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _do_lottie(step: Step) -> Dict[str, object]:
+    from portfolio.lottie_dedup import optimized_text
+    from portfolio.lottie_poster import poster_svg
+    src = os.path.join(PROJECT_ROOT, step.inputs[0])
+    text, poster = optimized_text(src), poster_svg(src)
+    return {"bytes_in": os.path.getsize(src), "bytes_out": len(text.encode("utf-8")),
+            "bytes_poster": len(poster.encode("utf-8"))}
+
+
+def _do_app(step: Step) -> Dict[str, object]:
+    from portfolio.embed import embedded_app_html, injected_source
+    from portfolio.minify import MinifyError, validate
+    src = os.path.join(PROJECT_ROOT, step.inputs[0])
+    html, source = embedded_app_html(src), injected_source(src)
+    if html != source:
+        # Headless check of what Playground ships: same DOM and text, and every script compiles in Node.
+        problems = validate(source, html)
+        if problems:
+            raise MinifyError("; ".join(problems))
+    return {"bytes_source": len(source.encode("utf-8")), "bytes_out": len(html.encode("utf-8"))}
+
+
+def _do_compress(step: Step) -> Dict[str, object]:
+    from portfolio.static_server import served_body
+    with open(os.path.join(PROJECT_ROOT, step.inputs[0]), "rb") as f:
+        body = served_body(step.inputs[0], f.read())
+    info: Dict[str, object] = {"identity": len(body)}
+    for out in step.outputs:
+        if out.endswith(".gz"):
+            data = gzip.compress(body, compresslevel=9, mtime=0)
+            info["gzip"] = len(data)
+        else:
+            data = brotli.compress(body, quality=11)
+            info["br"] = len(data)
+        _write(out, data)
+    return info
+
+
+def _do_precache(step: Step) -> Dict[str, object]:
+    from portfolio.static_server import body_tag, precache_manifest, served_body
+    tags = {}
+    for rel in step.inputs:
+        with open(os.path.join(PROJECT_ROOT, rel), "rb") as f:
+            tags[rel] = body_tag(served_body(rel, f.read()))
+    manifest = precache_manifest(tags)
+    _write(step.outputs[0], json.dumps(manifest, indent=1).encode())
+    return {"version": manifest["version"], "files": len(tags)}
+
+
+def _do_fonts(step: Step) -> Dict[str, object]:
+    from portfolio import fonts
+    built = fonts.build()
+    if built is None:
+        raise RuntimeError("fontTools missing or font sources not vendored")
+    manifest = {s.family.name: {"url": s.url, "bytes": s.size} for s in built}
+    _write(step.outputs[0], json.dumps(manifest, indent=1).encode())
+    return {"chars": len(fonts.page_text()), **{s.family.name: s.size for s in built}}
+
+
+RUNNERS = {"lottie": _do_lottie, "app": _do_app, "compress": _do_compress, "fonts": _do_fonts,
+           "precache": _do_precache}
+
+# Source of the modules each kind runs; editing them invalidates that kind's outputs.
+KIND_CODE = {
+    "lottie": ("lottie_dedup.py", "lottie_poster.py"),
+    "app": ("embed.py", "telemetry.py", "minify.py"),
+    "compress": ("static_server.py", "minify.py", "embed.py", "telemetry.py"),
+    "fonts": ("fonts.py",),
+    "precache": ("static_server.py", "minify.py", "embed.py", "telemetry.py"),
+}
+# Kinds whose only lasting effect is filling the shared artifact cache, so where it lives is an input.
+CACHE_FILLERS = ("lottie", "app")
+
+
+def run_step(step: Step) -> Tuple[str, Dict[str, object], float]:
+    """Pool entry point; returns (name, info, seconds)."""
+    t0 = time.perf_counter()
+    info = RUNNERS[step.kind](step)
+    return step.name, info, time.perf_counter() - t0
+
+
+# --------------------------
+#     GRAPH
+# --------------------------
+def _rel(path: str) -> str:
+    return os.path.relpath(path, PROJECT_ROOT).replace(os.sep, "/")
+
+
+def _compressible(rel: str) -> bool:
+    return rel.endswith((".html", ".css", ".js", ".json", ".svg", ".txt"))
+
+
+def plan(hashes: "InputHashes", root: str = PROJECT_ROOT) -> List[Step]:
+    """The step graph for the current tree (reads apps/apps.json for the precache list)."""
+    from portfolio.lottie_meta import catalog
+    from portfolio.static_server import precached_files, precompressed_key
+    steps: List[Step] = []
+
+    for meta in catalog():
+        stem = os.path.splitext(os.path.basename(meta.path))[0]
+        steps.append(Step(f"lottie:{meta.name}", "lottie", (_rel(meta.path),), ()))
+
+    for path in sorted(glob.glob(os.path.join(root, "apps", "*.html"))):
+        steps.append(Step(f"app:{os.path.basename(path)}", "app", (_rel(path),), ()))
+
+    statics = [f for f in STATIC_FILES if os.path.isfile(os.path.join(root, f))]
+    for d in STATIC_DIRS:
+        statics += sorted(_rel(p) for p in glob.glob(os.path.join(root, d, "*")) if os.path.isfile(p))
+    for rel in statics:
+        if not _compressible(rel) or os.path.getsize(os.path.join(root, rel)) < MIN_COMPRESS:
+            continue
+        key = precompressed_key(rel, hashes.get(rel))
+        outs = [f"precompressed/{key}.gz"] + ([f"precompressed/{key}.br"] if brotli else [])
+        steps.append(Step(f"compress:{rel}", "compress", (rel,), tuple(outs)))
+
+    from portfolio import fonts
+    font_sources = [os.path.join("fonts", f.source) for f in fonts.FAMILIES]
+    if all(os.path.isfile(os.path.join(root, r)) for r in font_sources):
+        texts = [r.replace(os.sep, "/") for r in fonts.TEXT_SOURCES if os.path.isfile(os.path.join(root, r))]
+        steps.append(Step("fonts", "fonts", tuple(texts + font_sources), ("fonts.json",)))
+
+    steps.append(Step("precache", "precache", tuple(precached_files(root)), ("precache.json",)))
+    return steps
+
+
+def _hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class InputHashes:
+    """Content hashes, re-read only when (size, mtime_ns) moved since the last build."""
+
+    def __init__(self, saved: Dict[str, List]):
+        self.saved = saved
+        self.current: Dict[str, List] = {}
+        self.rehashed = 0
+
+    def get(self, rel: str) -> str:
+        if rel in self.current:
+            return self.current[rel][2]
+        st = os.stat(os.path.join(PROJECT_ROOT, rel))
+        prev = self.saved.get(rel)
+        if prev and prev[0] == st.st_size and prev[1] == st.st_mtime_ns:
+            digest = prev[2]
+        else:
+            digest = _hash_file(os.path.join(PROJECT_ROOT, rel))
+            self.rehashed += 1
+        self.current[rel] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+
+def fingerprint(steps: List[Step], hashes: InputHashes) -> None:
+    by_name = {s.name: s for s in steps}
+    done: Dict[str, str] = {}
+
+    def visit(s: Step) -> str:
+        if s.name not in done:
+            h = hashlib.sha256(s.kind.encode())
+            for mod in KIND_CODE[s.kind]:
+                h.update(code_version(os.path.join(PROJECT_ROOT, "portfolio", mod)).encode())
+            if s.kind in CACHE_FILLERS:
+                h.update(f"\0{diskcache.cache_dir() or ''}".encode())
+            for rel in s.inputs:
+                h.update(f"\0{rel}\0{hashes.get(rel)}".encode())
+            for d in s.deps:
+                h.update(f"\0{d}\0{visit(by_name[d])}".encode())
+            done[s.name] = s.fingerprint = h.hexdigest()
+        return done[s.name]
+
+    for s in steps:
+        visit(s)
+
+
+# --------------------------
+#     EXECUTION
+# --------------------------
+def _load_state(build_dir: str) -> Dict[str, Dict]:
+    try:
+        with open(os.path.join(build_dir, STATE_FILE), "r", encoding="utf-8") as f:
+            state = json.load(f)
+        return {"files": state.get("files", {}), "steps": state.get("steps", {})}
+    except (OSError, ValueError):
+        return {"files": {}, "steps": {}}
+
+
+def _outputs_exist(step: Step, build_dir: str) -> bool:
+    return all(os.path.isfile(os.path.join(build_dir, o)) for o in step.outputs)
+
+
+def _prune(steps: List[Step], build_dir: str) -> None:
+    """Drop precompressed variants of content that no longer exists (they are content-addressed)."""
+    live = {o for s in steps for o in s.outputs}
+    folder = os.path.join(build_dir, "precompressed")
+    for f in os.listdir(folder) if os.path.isdir(folder) else ():
+        if f"precompressed/{f}" not in live:
+            os.remove(os.path.join(folder, f))
+
+
+def build(jobs: Optional[int] = None, force: bool = False) -> Dict[str, object]:
+    t0 = time.perf_counter()
+    build_dir = BUILD_DIR
+    state = _load_state(build_dir)
+    hashes = InputHashes(state["files"])
+    steps = plan(hashes)
+    fingerprint(steps, hashes)
+    by_name = {s.name: s for s in steps}
+
+    for s in steps:
+        prev = state["steps"].get(s.name)
+        if not force and prev and prev.get("fingerprint") == s.fingerprint and _outputs_exist(s, build_dir):
+            s.status, s.info = "cached", prev.get("info", {})
+
+    pending = {s.name for s in steps if s.status == "pending"}
+    jobs = jobs or min(len(pending), os.cpu_count() or 1) or 1
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            running: Dict[Future, str] = {}
+
+            def submit_ready() -> None:
+                for name in sorted(pending):
+                    s = by_name[name]
+                    blocked = [by_name[d].status for d in s.deps if by_name[d].status not in ("cached", "built")]
+                    if any(st in ("failed", "skipped") for st in blocked):
+                        s.status, s.error = "skipped", "a dependency failed"
+                        pending.discard(name)
+                    elif not blocked:
+                        s.status = "running"
+                        running[pool.submit(run_step, s)] = name
+                        pending.discard(name)
+
+            submit_ready()
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    s = by_name[running.pop(fut)]
+                    try:
+                        _, s.info, s.seconds = fut.result()
+                        s.status = "built"
+                    except Exception as e:  # one bad file must not stop the rest of the build
+                        s.status, s.error = "failed", f"{type(e).__name__}: {e}"
+                submit_ready()
+
+    os.makedirs(build_dir, exist_ok=True)
+    _prune(steps, build_dir)
+    new_state = {
+        "files": hashes.current,
+        "steps": {s.name: {"fingerprint": s.fingerprint, "info": s.info}
+                  for s in steps if s.status in ("cached", "built")},
+    }
+    with open(os.path.join(build_dir, STATE_FILE), "w", encoding="utf-8") as f:
+        json.dump(new_state, f)
+
+    cached = sum(s.status == "cached" for s in steps)
+    report = {
+        "elapsed_ms": round((time.perf_counter() - t0) * 1000, 1),
+        "work_ms": round(sum(s.seconds for s in steps) * 1000, 1),
+        "jobs": jobs,
+        "steps": len(steps),
+        "cached": cached,
+        "built": sum(s.status == "built" for s in steps),
+        "failed": sum(s.status in ("failed", "skipped") for s in steps),
+        "hit_rate": round(cached / len(steps), 3) if steps else 1.0,
+        "inputs_rehashed": hashes.rehashed,
+        "by_kind": {},
+        "detail": {s.name: {"kind": s.kind, "status": s.status, "ms": round(s.seconds * 1000, 1),
+                            "outputs": list(s.outputs), "error": s.error, "info": s.info} for s in steps},
+    }
+    for kind in RUNNERS:
+        group = [s for s in steps if s.kind == kind]
+        if group:
+            hits = sum(s.status == "cached" for s in group)
+            report["by_kind"][kind] = {"steps": len(group), "cached": hits, "hit_rate": round(hits / len(group), 3),
+                                       "ms": round(sum(s.seconds for s in group) * 1000, 1)}
+    with open(os.path.join(build_dir, REPORT_FILE), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+    return report
+
+
+def print_report(report: Dict[str, object]) -> None:
+    for name, d in report["detail"].items():
+        if d["status"] != "cached":
+            extra = f"  {d['error']}" if d["error"] else ""
+            print(f"  {name:<44}{d['status']:<8}{d['ms']:9.1f} ms{extra}")
+    for kind, k in report["by_kind"].items():
+        print(f"  [{kind:<8}] {k['cached']}/{k['steps']} cached, {k['ms']:.0f} ms of work")
+    print(f"build: {report['built']} built, {report['cached']} cached, {report['failed']} failed "
+          f"(hit rate {report['hit_rate']:.0%}) in {report['elapsed_ms']:.0f} ms on {report['jobs']} processes")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Incremental asset build (Lottie, apps, precompression, precache).")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="pool processes (default: CPU count)")
+    ap.add_argument("--force", action="store_true", help="ignore fingerprints and rebuild every step")
+    args = ap.parse_args(argv)
+    report = build(args.jobs, args.force)
+    print_report(report)
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
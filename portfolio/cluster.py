@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Multi-worker launcher.
+
+Starts N Streamlit worker processes (each through portfolio.prewarm, so they
+warm on start) on private ports behind one reverse proxy. The proxy pins
+every browser to one worker with a `pf_worker` cookie. A Streamlit session
+lives on the worker that holds its websocket, and media/upload URLs are
+worker-local, so the page, its assets and /_stcore/stream must all land
+on the same process.
+
+A health loop polls each worker's /_stcore/health. A worker that exits or
+fails MAX_FAILURES checks in a row is restarted, and its visitors move to a
+healthy worker on their next connection. All workers share one
+content-addressed disk cache (portfolio.diskcache), so worker 2..N start
+from worker 1's Lottie, poster, app and search artifacts instead of
+rebuilding them. The cache is pruned at start (age and size bounds, see
+portfolio.diskcache.prune), so entries orphaned by past deploys go away.
+With PORTFOLIO_TELEMETRY_PORT set, this process runs the one telemetry
+collector and the workers only send beacons to it.
+
+    python -m portfolio.cluster -n 4 --port 8501 Home.py [-- streamlit args]
+    curl localhost:8501/_cluster/health
+
+/_cluster/health reports per-worker detail (pids, ports, cache path) only
+to clients on this host; anyone else gets the healthy/total counts.
+"""
+import argparse
+import asyncio
+import ipaddress
+import json
+import os
+import secrets
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from portfolio import telemetry
+from portfolio.diskcache import ENV_DIR, prune
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COOKIE = "pf_worker"
+HEALTH_INTERVAL_S = 2.0
+STARTUP_GRACE_S = 60.0
+MAX_FAILURES = 3
+MAX_HEAD = 64 * 1024
+
+
+@dataclass
+class Worker:
+    index: int
+    port: int
+    proc: Optional[subprocess.Popen] = None
+    healthy: bool = False
+    came_up: bool = False      # healthy at least once since (re)spawn; ends the startup grace
+    failures: int = 0
+    restarts: int = 0
+    started_at: float = 0.0
+    active: int = 0            # open proxied connections
+    served: int = 0            # connections routed here since start
+
+    def status(self) -> Dict[str, object]:
+        return {
+            "port": self.port,
+            "pid": self.proc.pid if self.proc else None,
+            "healthy": self.healthy,
+            "restarts": self.restarts,
+            "active": self.active,
+            "served": self.served,
+            "uptime_s": round(time.monotonic() - self.started_at, 1) if self.proc else 0,
+        }
+
+
+@dataclass
+class Cluster:
+    script: str
+    workers: List[Worker]
+    streamlit_args: List[str] = field(default_factory=list)
+    cache_dir: str = ""
+    cookie_secret: str = field(default_factory=lambda: secrets.token_hex(16))
+
+    # --------------------------
+    #     PROCESSES
+    # --------------------------
+    def spawn(self, w: Worker) -> None:
+        env = dict(os.environ)
+        env[ENV_DIR] = self.cache_dir
+        # Same secret everywhere so a re-pinned visitor's XSRF cookie stays valid.
+        env["STREAMLIT_SERVER_COOKIE_SECRET"] = self.cookie_secret
+        env[telemetry.ENV_EXTERNAL] = "1"  # the proxy process runs the one collector (see main)
+        cmd = [sys.executable, "-m", "portfolio.prewarm", self.script,
+               "--server.port", str(w.port), "--server.address", "127.0.0.1",
+               "--server.headless", "true", *self.streamlit_args]
+        w.proc = subprocess.Popen(cmd, cwd=PROJECT_ROOT, env=env)
+        w.healthy, w.came_up, w.failures, w.started_at = False, False, 0, time.monotonic()
+        print(f"[cluster] worker {w.index} pid {w.proc.pid} on :{w.port}", file=sys.stderr)
+
+    async def restart(self, w: Worker, reason: str) -> None:
+        print(f"[cluster] restarting worker {w.index} ({reason})", file=sys.stderr)
+        w.healthy = False
+        if w.proc and w.proc.poll() is None:
+            # Waiting on a hung worker happens off the event loop; the proxy keeps serving the others.
+            await asyncio.to_thread(_terminate, w.proc)
+        w.restarts += 1
+        self.spawn(w)
+
+    def stop(self) -> None:
+        for w in self.workers:
+            if w.proc and w.proc.poll() is None:
+                w.proc.terminate()
+        for w in self.workers:
+            if w.proc:
+                _terminate(w.proc)
+
+    # --------------------------
+    #     HEALTH
+    # --------------------------
+    @staticmethod
+    async def probe(port: int, timeout: float = 2.0) -> bool:
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", port), timeout)
+            writer.write(b"GET /_stcore/health HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n\r\n")
+            status = await asyncio.wait_for(reader.readline(), timeout)
+            writer.close()
+            return b" 200 " in status
+        except (OSError, asyncio.TimeoutError):
+            return False
+
+    async def watch(self, w: Worker) -> None:
+        """Health checks for one worker; each worker has its own, so a dead one never delays the rest."""
+        while True:
+            if w.proc is None or w.proc.poll() is not None:
+                await self.restart(w, f"exited with {w.proc.returncode if w.proc else None}")
+            elif await self.probe(w.port):
+                if not w.healthy:
+                    print(f"[cluster] worker {w.index} healthy after "
+                          f"{time.monotonic() - w.started_at:.1f} s", file=sys.stderr)
+                w.healthy, w.came_up, w.failures = True, True, 0
+            elif w.came_up or time.monotonic() - w.started_at >= STARTUP_GRACE_S:
+                w.failures += 1
+                w.healthy = False
+                if w.failures >= MAX_FAILURES:
+                    await self.restart(w, f"{w.failures} failed health checks")
+            await asyncio.sleep(HEALTH_INTERVAL_S)
+
+    async def health_loop(self) -> None:
+        await asyncio.gather(*(self.watch(w) for w in self.workers))
+
+    def status(self) -> Dict[str, object]:
+        return {
+            "workers": [w.status() for w in self.workers],
+            "healthy": sum(w.healthy for w in self.workers),
+            "cache_dir": self.cache_dir,
+        }
+
+    def summary(self) -> Dict[str, object]:
+        return {"healthy": sum(w.healthy for w in self.workers), "workers": len(self.workers)}
+
+    # --------------------------
+    #     ROUTING
+    # --------------------------
+    def pick(self, pinned: Optional[int]) -> Optional[Worker]:
+        """The pinned worker if it is healthy, else the healthy worker with the fewest open connections."""
+        if pinned is not None and 0 <= pinned < len(self.workers) and self.workers[pinned].healthy:
+            return self.workers[pinned]
+        healthy = [w for w in self.workers if w.healthy]
+        return min(healthy, key=lambda w: (w.active, w.served)) if healthy else None
+
+    async def handle(self, creader: asyncio.StreamReader, cwriter: asyncio.StreamWriter) -> None:
+        try:
+            head = await asyncio.wait_for(creader.readuntil(b"\r\n\r\n"), 30)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            cwriter.close()
+            return
+        request_line = head.split(b"\r\n", 1)[0].decode("latin-1")
+        if request_line.split(" ")[1:2] == ["/_cluster/health"]:
+            body = self.status() if _is_local(cwriter) else self.summary()
+            await _reply(cwriter, 200, json.dumps(body).encode(), "application/json")
+            return
+
+        pinned = _cookie_worker(head)
+        w = self.pick(pinned)
+        if w is None:
+            await _reply(cwriter, 503, b"No healthy workers yet\n", "text/plain", retry_after=2)
+            return
+        try:
+            breader, bwriter = await asyncio.open_connection("127.0.0.1", w.port, limit=MAX_HEAD)
+        except OSError:
+            w.healthy = False
+            await _reply(cwriter, 502, b"Worker unavailable\n", "text/plain", retry_after=1)
+            return
+
+        w.active += 1
+        w.served += 1
+        try:
+            bwriter.write(_with_forwarded(head, cwriter))
+            if pinned != w.index:
+                # First response on this connection carries the pin for everything that follows.
+                try:
+                    rhead = await breader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                cookie = f"Set-Cookie: {COOKIE}={w.index}; Path=/; HttpOnly; SameSite=Lax\r\n".encode()
+                cwriter.write(rhead[:-2] + cookie + b"\r\n")
+            await asyncio.gather(_pipe(creader, bwriter), _pipe(breader, cwriter))
+        finally:
+            w.active -= 1
+            bwriter.close()
+            cwriter.close()
+
+
+# --------------------------
+#     PROCESS HELPERS
+# --------------------------
+def _terminate(proc: subprocess.Popen, timeout: float = 10.0) -> None:
+    """SIGTERM, then SIGKILL if the process hasn't exited within `timeout` (blocking)."""
+    if proc.poll() is None:
+        proc.terminate()
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+# --------------------------
+#     HTTP HELPERS
+# --------------------------
+def _cookie_worker(head: bytes) -> Optional[int]:
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        if name.strip().lower() != b"cookie":
+            continue
+        for part in value.decode("latin-1").split(";"):
+            k, _, v = part.strip().partition("=")
+            if k == COOKIE and v.isdigit():
+                return int(v)
+    return None
+
+
+def _is_local(cwriter: asyncio.StreamWriter) -> bool:
+    peer = cwriter.get_extra_info("peername")
+    try:
+        ip = ipaddress.ip_address(peer[0].split("%")[0])
+    except (TypeError, IndexError, ValueError):
+        return False
+    mapped = getattr(ip, "ipv4_mapped", None)
+    return (mapped or ip).is_loopback
+
+
+def _with_forwarded(head: bytes, cwriter: asyncio.StreamWriter) -> bytes:
+    peer = cwriter.get_extra_info("peername")
+    if not peer:
+        return head
+    return head[:-2] + f"X-Forwarded-For: {peer[0]}\r\n\r\n".encode("latin-1")
+
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            data = await reader.read(64 * 1024)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        try:
+            writer.write_eof() if writer.can_write_eof() else writer.close()
+        except (OSError, RuntimeError):
+            pass
+
+
+async def _reply(writer: asyncio.StreamWriter, status: int, body: bytes, ctype: str,
+                 retry_after: Optional[int] = None) -> None:
+    reason = {200: "OK", 502: "Bad Gateway", 503: "Service Unavailable"}.get(status, "")
+    extra = f"Retry-After: {retry_after}\r\n" if retry_after else ""
+    writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: {ctype}\r\nContent-Length: {len(body)}\r\n"
+                 f"Cache-Control: no-store\r\n{extra}Connection: close\r\n\r\n".encode() + body)
+    try:
+        await writer.drain()
+    except ConnectionError:
+        pass
+    writer.close()
+
+
+# --------------------------
+#     LAUNCHER
+# --------------------------
+async def run(cluster: Cluster, host: str, port: int) -> None:
+    for w in cluster.workers:
+        cluster.spawn(w)
+    server = await asyncio.start_server(cluster.handle, host, port, limit=MAX_HEAD, backlog=4096)
+    print(f"[cluster] {len(cluster.workers)} workers behind http://{host}:{port}/ "
+          f"(shared cache {cluster.cache_dir})", file=sys.stderr)
+    loop = asyncio.get_running_loop()
+    stopping = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stopping.set)
+        except NotImplementedError:  # Windows
+            pass
+    health = asyncio.create_task(cluster.health_loop())
+    async with server:
+        await stopping.wait()
+    health.cancel()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    extra: List[str] = []
+    if "--" in argv:
+        i = argv.index("--")
+        argv, extra = argv[:i], argv[i + 1:]
+    ap = argparse.ArgumentParser(description="Run N Streamlit workers behind a sticky reverse proxy.")
+    ap.add_argument("script", nargs="?", default="Home.py")
+    ap.add_argument("-n", "--workers", type=int, default=os.cpu_count() or 2)
+    ap.add_argument("--host", default="0.0.0.0")
+    ap.add_argument("--port", type=int, default=8501)
+    ap.add_argument("--worker-port", type=int, default=8600, help="first private worker port")
+    ap.add_argument("--cache-dir", default=os.environ.get(ENV_DIR) or os.path.join(tempfile.gettempdir(),
+                                                                                  "portfolio-cache"))
+    args = ap.parse_args(argv)
+
+    os.makedirs(args.cache_dir, exist_ok=True)
+    if telemetry.enabled():
+        telemetry.start_collector(telemetry.port())
+    pruned = prune(args.cache_dir)
+    if pruned["removed"]:
+        print(f"[cluster] pruned {pruned['removed']} cache entries ({pruned['bytes_freed'] / 1e6:.1f} MB)",
+              file=sys.stderr)
+    cluster = Cluster(
+        script=args.script,
+        workers=[Worker(i, args.worker_port + i) for i in range(max(1, args.workers))],
+        streamlit_args=extra,
+        cache_dir=args.cache_dir,
+    )
+    try:
+        asyncio.run(run(cluster, args.host, args.port))
+    finally:
+        cluster.stop()
+
+
+if __name__ == "__main__":
+    main()
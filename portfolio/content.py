@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Portfolio content model.
+
+All copy shown by Home.py / Home2.py lives in content/site.json. It is
+loaded and validated once per process by `load_content()`; every string is
+HTML-escaped at load time (Text.html), so templates can drop it straight
+into markup without escaping on each render.
+"""
+import html
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONTENT_PATH = os.path.join(PROJECT_ROOT, "content", "site.json")
+
+
+class ContentError(ValueError):
+    """content/site.json is missing a field or has the wrong shape."""
+
+
+# --------------------------
+#     MODEL
+# --------------------------
+@dataclass(frozen=True)
+class Text:
+    raw: str
+    html: str
+
+    @classmethod
+    def of(cls, value: str) -> "Text":
+        return cls(value, html.escape(value))
+
+    def __str__(self) -> str:
+        return self.raw
+
+
+@dataclass(frozen=True)
+class Link:
+    key: str
+    name: Text
+    button: Text
+    url: Text
+
+
+@dataclass(frozen=True)
+class Project:
+    icon: str
+    title: Text
+    body: str                      # markdown, rendered by st.markdown (not raw HTML)
+    link_label: Optional[Text] = None
+    link_url: Optional[Text] = None
+
+    @property
+    def heading(self) -> str:
+        return f"{self.icon} {self.title.raw}"
+
+
+@dataclass(frozen=True)
+class CardProject:
+    title: Text
+    desc: Text
+    tags: Tuple[Text, ...]
+
+
+@dataclass(frozen=True)
+class Labeled:
+    """Generic (label, text) pair: metrics, highlights, features, offerings."""
+    label: Text
+    text: Text
+
+
+@dataclass(frozen=True)
+class Action:
+    label: Text
+    url: Text
+
+
+@dataclass(frozen=True)
+class App:
+    """An embeddable Playground app; `path` is relative to the project root (or an http URL)."""
+    title: Text
+    path: str
+    desc: Text
+
+
+@dataclass(frozen=True)
+class Content:
+    name: Text
+    page_title: str
+    tagline: Text
+    links: Tuple[Link, ...]
+    email: Text
+    about: Tuple[Text, ...]
+    coaching_intro: Text
+    coaching_offerings: Tuple[Labeled, ...]
+    projects: Tuple[Project, ...]
+    card_projects: Tuple[CardProject, ...]
+    skill_groups: Tuple[Tuple[str, Tuple[Text, ...]], ...]
+    metrics: Tuple[Labeled, ...]
+    minimal_kicker: Text
+    minimal_headline: Text
+    minimal_intro: Text
+    minimal_actions: Tuple[Action, ...]
+    minimal_highlights: Tuple[Labeled, ...]
+    minimal_links: Tuple[Link, ...]
+    neon_accent: Text
+    neon_headline: Text
+    neon_intro: Text
+    neon_about: Text
+    neon_features: Tuple[Labeled, ...]
+    playground_apps: Tuple[App, ...]
+
+    @property
+    def skills(self) -> Tuple[Text, ...]:
+        return tuple(s for _, group in self.skill_groups for s in group)
+
+    def link(self, key: str) -> Link:
+        for link in self.links:
+            if link.key == key:
+                return link
+        raise KeyError(key)
+
+
+# --------------------------
+#     VALIDATION HELPERS
+# --------------------------
+def _get(obj: Dict[str, Any], key: str, kind: type, where: str) -> Any:
+    if not isinstance(obj, dict) or key not in obj:
+        raise ContentError(f"{where}: missing '{key}'")
+    value = obj[key]
+    if not isinstance(value, kind):
+        raise ContentError(f"{where}.{key}: expected {kind.__name__}, got {type(value).__name__}")
+    if kind is str and not value.strip():
+        raise ContentError(f"{where}.{key}: must not be empty")
+    return value
+
+
+def _text(obj: Dict[str, Any], key: str, where: str) -> Text:
+    return Text.of(_get(obj, key, str, where))
+
+
+def _url(value: str, where: str) -> Text:
+    if not value.startswith(("https://", "http://", "mailto:")):
+        raise ContentError(f"{where}: unsupported URL '{value}'")
+    return Text.of(value)
+
+
+def _labeled(items: List[Any], label_key: str, text_key: str, where: str) -> Tuple[Labeled, ...]:
+    return tuple(
+        Labeled(_text(it, label_key, f"{where}[{i}]"), _text(it, text_key, f"{where}[{i}]"))
+        for i, it in enumerate(items)
+    )
+
+
+# --------------------------
+#     LOADER
+# --------------------------
+def parse_content(data: Dict[str, Any]) -> Content:
+    """Validate raw JSON data and build the escaped, immutable model."""
+    person = _get(data, "person", dict, "site")
+
+    links = tuple(
+        Link(
+            key=_get(it, "key", str, f"links[{i}]"),
+            name=_text(it, "name", f"links[{i}]"),
+            button=_text(it, "button", f"links[{i}]"),
+            url=_url(_get(it, "url", str, f"links[{i}]"), f"links[{i}].url"),
+        )
+        for i, it in enumerate(_get(data, "links", list, "site"))
+    )
+    by_key = {link.key: link for link in links}
+    email = _get(data, "email", str, "site")
+    if "@" not in email:
+        raise ContentError(f"site.email: not an email address '{email}'")
+
+    def find_link(key: str, where: str) -> Link:
+        if key not in by_key:
+            raise ContentError(f"{where}: unknown link '{key}'")
+        return by_key[key]
+
+    def resolve(key: str, where: str) -> Text:
+        return Text.of(f"mailto:{email}") if key == "email" else find_link(key, where).url
+
+    projects = []
+    for i, it in enumerate(_get(data, "projects", list, "site")):
+        where = f"projects[{i}]"
+        link = it.get("link")
+        projects.append(Project(
+            icon=_get(it, "icon", str, where),
+            title=_text(it, "title", where),
+            body=_get(it, "body", str, where),
+            link_label=_text(link, "label", f"{where}.link") if link else None,
+            link_url=_url(_get(link, "url", str, f"{where}.link"), f"{where}.link.url") if link else None,
+        ))
+
+    card_projects = tuple(
+        CardProject(
+            title=_text(it, "title", f"card_projects[{i}]"),
+            desc=_text(it, "desc", f"card_projects[{i}]"),
+            tags=tuple(Text.of(t) for t in _get(it, "tags", list, f"card_projects[{i}]")),
+        )
+        for i, it in enumerate(_get(data, "card_projects", list, "site"))
+    )
+
+    skill_groups = tuple(
+        (group, tuple(Text.of(s) for s in _get(_get(data, "skills", dict, "site"), group, list, "skills")))
+        for group in _get(data, "skills", dict, "site")
+    )
+
+    coaching = _get(data, "coaching", dict, "site")
+    minimal = _get(data, "minimal", dict, "site")
+    neon = _get(data, "neon", dict, "site")
+
+    return Content(
+        name=_text(person, "name", "person"),
+        page_title=_get(person, "page_title", str, "person"),
+        tagline=_text(person, "tagline", "person"),
+        links=links,
+        email=Text.of(email),
+        about=tuple(Text.of(p) for p in _get(data, "about", list, "site")),
+        coaching_intro=_text(coaching, "intro", "coaching"),
+        coaching_offerings=_labeled(_get(coaching, "offerings", list, "coaching"), "name", "desc", "coaching.offerings"),
+        projects=tuple(projects),
+        card_projects=card_projects,
+        skill_groups=skill_groups,
+        metrics=_labeled(_get(data, "metrics", list, "site"), "label", "value", "metrics"),
+        minimal_kicker=_text(minimal, "kicker", "minimal"),
+        minimal_headline=_text(minimal, "headline", "minimal"),
+        minimal_intro=_text(minimal, "intro", "minimal"),
+        minimal_actions=tuple(
+            Action(_text(a, "label", f"minimal.actions[{i}]"),
+                   resolve(_get(a, "link", str, f"minimal.actions[{i}]"), f"minimal.actions[{i}]"))
+            for i, a in enumerate(_get(minimal, "actions", list, "minimal"))
+        ),
+        minimal_highlights=_labeled(_get(minimal, "highlights", list, "minimal"), "label", "text", "minimal.highlights"),
+        minimal_links=tuple(
+            find_link(k, "minimal.links_card") for k in _get(minimal, "links_card", list, "minimal")
+        ),
+        neon_accent=_text(neon, "accent", "neon"),
+        neon_headline=_text(neon, "headline", "neon"),
+        neon_intro=_text(neon, "intro", "neon"),
+        neon_about=_text(neon, "about", "neon"),
+        neon_features=_labeled(_get(neon, "features", list, "neon"), "title", "desc", "neon.features"),
+        playground_apps=tuple(
+            App(
+                title=_text(a, "title", f"playground_apps[{i}]"),
+                path=_get(a, "path", str, f"playground_apps[{i}]"),
+                desc=_text(a, "desc", f"playground_apps[{i}]"),
+            )
+            for i, a in enumerate(_get(data, "playground_apps", list, "site"))
+        ),
+    )
+
+
+@lru_cache(maxsize=None)
+def load_content(path: str = CONTENT_PATH) -> Content:
+    """Load + validate content once per process (per path)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ContentError(f"cannot read {path}: {e}") from e
+    return parse_content(data)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Widget state carried in the URL query string.
+
+`bind()` seeds a selector's session state from its query parameter before
+the widget is drawn, so a shared link or bookmark such as
+`?style=card-grid` or `/Playground?app=asteroids&animation=laptop` renders
+the requested view on the first script run instead of rendering the
+default and rerunning. Its `on_change` callback writes the visitor's choice
+back to the URL (the default choice drops the parameter). Streamlit runs
+callbacks before the rerun, so this adds no extra run.
+
+Values are slugs of the option labels: lowercase, with runs of anything
+other than letters and digits turned into "-", so "Split‑Screen" with its
+non-breaking hyphen is plain `split-screen`. Unknown values fall back to
+the default.
+"""
+import re
+from typing import Callable, Optional, Sequence
+
+import streamlit as st
+
+_SLUG_RE = re.compile(r"[^0-9a-z]+")
+
+
+def slug(label: str) -> str:
+    return _SLUG_RE.sub("-", label.lower()).strip("-")
+
+
+def match(value: Optional[str], options: Sequence[str]) -> Optional[str]:
+    """The option whose slug equals `value`'s, or None."""
+    if not value:
+        return None
+    wanted = slug(value)
+    return next((o for o in options if slug(o) == wanted), None)
+
+
+def _seen_key(param: str) -> str:
+    return f"_deeplink:{param}"
+
+
+def bind(key: str, param: str, options: Sequence[str], default: Optional[str] = None) -> Callable[[], None]:
+    """
+    Put the option named by ?<param>= into st.session_state[key] and return the
+    on_change callback for the widget using `key`. Call it before the widget;
+    don't pass the widget an index as well.
+    """
+    default = default if default is not None else options[0]
+    raw = st.query_params.get(param)
+    # Seed on the first run, and again when the URL changes under an open session (back / forward).
+    if key not in st.session_state or raw != st.session_state.get(_seen_key(param)):
+        chosen = match(raw, options)
+        if chosen is not None or key not in st.session_state or st.session_state[key] not in options:
+            st.session_state[key] = chosen or default
+    st.session_state[_seen_key(param)] = raw
+
+    def on_change() -> None:
+        value = st.session_state.get(key)
+        if value == default or value not in options:
+            st.query_params.pop(param, None)
+            st.session_state[_seen_key(param)] = None
+        else:
+            st.query_params[param] = slug(value)
+            st.session_state[_seen_key(param)] = slug(value)
+
+    return on_change
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Content-addressed on-disk cache shared by worker processes.
+
+The in-process lru_caches make a warm worker fast; this layer lets a fresh
+worker start warm too. Entries are keyed by sha256 over (namespace,
+input digests, source digest of the module that builds them), so an edited
+input or an edited builder simply misses. Writes go to a temp file and
+are renamed into place, so concurrent workers never see a torn entry; if
+two build the same key at once, the last identical write wins.
+
+Off unless PORTFOLIO_CACHE_DIR is set (portfolio.cluster sets it for its
+workers); get_or_build() then just calls build().
+
+Because keys include code versions, every deploy orphans the previous
+entries. A hit touches the entry's mtime, and prune() (run by
+portfolio.cluster at start) drops entries unused for MAX_AGE_S, then the
+least recently used ones until the cache fits in PORTFOLIO_CACHE_MAX_MB.
+
+    python -m portfolio.diskcache --prune      # stats after pruning
+"""
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from functools import lru_cache
+from typing import Callable, Optional, Sequence
+
+ENV_DIR = "PORTFOLIO_CACHE_DIR"
+ENV_MAX_MB = "PORTFOLIO_CACHE_MAX_MB"
+DEFAULT_MAX_MB = 256
+MAX_AGE_S = 14 * 24 * 3600
+STALE_TMP_S = 3600           # a .tmp this old belongs to a writer that died
+
+
+def cache_dir() -> Optional[str]:
+    d = os.environ.get(ENV_DIR, "").strip()
+    return d or None
+
+
+@lru_cache(maxsize=None)
+def code_version(source_file: str) -> str:
+    """Digest of a builder's source, so changing the code invalidates what it produced."""
+    with open(source_file, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def entry_key(namespace: str, parts: Sequence[str]) -> str:
+    h = hashlib.sha256(namespace.encode())
+    for p in parts:
+        h.update(b"\0" + p.encode())
+    return h.hexdigest()
+
+
+def entry_path(root: str, namespace: str, key: str) -> str:
+    return os.path.join(root, namespace, key[:2], key + ".txt")
+
+
+def get_or_build(namespace: str, parts: Sequence[str], build: Callable[[], str]) -> str:
+    """Cached text for (namespace, parts), building and storing it on a miss."""
+    root = cache_dir()
+    if root is None:
+        return build()
+    path = entry_path(root, namespace, entry_key(namespace, parts))
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            value = f.read()
+        try:
+            os.utime(path)  # mtime = last use, for prune()
+        except OSError:
+            pass
+        return value
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+    value = build()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(value)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # a read-only or full disk only costs the next worker a rebuild
+    return value
+
+
+def stats(root: Optional[str] = None) -> dict:
+    """Entry count and bytes per namespace."""
+    root = root or cache_dir()
+    out: dict = {}
+    if not root or not os.path.isdir(root):
+        return out
+    for ns in sorted(os.listdir(root)):
+        n = size = 0
+        for dirpath, _, files in os.walk(os.path.join(root, ns)):
+            for f in files:
+                if f.endswith(".txt"):
+                    n += 1
+                    size += os.path.getsize(os.path.join(dirpath, f))
+        out[ns] = {"entries": n, "bytes": size}
+    return out
+
+
+def prune(root: Optional[str] = None, max_bytes: Optional[int] = None, max_age_s: float = MAX_AGE_S) -> dict:
+    """Drop entries unused for `max_age_s`, then least recently used ones down to `max_bytes`."""
+    root = root or cache_dir()
+    if not root or not os.path.isdir(root):
+        return {"removed": 0, "bytes_freed": 0}
+    if max_bytes is None:
+        max_bytes = int(float(os.environ.get(ENV_MAX_MB, DEFAULT_MAX_MB)) * 1024 * 1024)
+    now = time.time()
+    entries = []
+    removed = freed = 0
+    for dirpath, _, files in os.walk(root):
+        for f in files:
+            path = os.path.join(dirpath, f)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            age = now - st.st_mtime
+            if f.endswith(".txt") and age <= max_age_s:
+                entries.append((st.st_mtime, st.st_size, path))
+            elif f.endswith(".txt") or (f.endswith(".tmp") and age > STALE_TMP_S):
+                removed, freed = removed + _remove(path), freed + st.st_size
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        removed, freed, total = removed + _remove(path), freed + size, total - size
+    return {"removed": removed, "bytes_freed": freed}
+
+
+def _remove(path: str) -> int:
+    try:
+        os.remove(path)
+        return 1
+    except OSError:  # another process pruned or replaced it first
+        return 0
+
+
+if __name__ == "__main__":
+    if "--prune" in sys.argv[1:]:
+        print(prune())
+    print(stats())
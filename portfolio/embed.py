@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Embedding for the Playground's local HTML apps.
+
+Each app under apps/ is shown in a component iframe with a white card
+wrapper and the Round Robin confirm-button binding injected before
+</body>, then minified together with that payload (portfolio.minify). The
+document is built once per file content hash, so a rerun (or another
+session) only pays for a dict lookup.
+"""
+import hashlib
+import os
+import sys
+from functools import lru_cache
+from typing import Optional
+
+from portfolio.diskcache import code_version, get_or_build
+from portfolio import minify
+from portfolio.lottie_poster import file_hash
+from portfolio.telemetry import beacon_js
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# --------------------------
+#     DYNAMIC WHITE BACKGROUND + CONFIRM BINDING
+# --------------------------
+# Body becomes transparent; card (#rr-container) is white, auto-height, padded.
+INJECTED_CSS = """
+<style>
+  /* Make page background transparent so extra iframe space isn't a big white box */
+  html, body {
+      background: transparent !important;
+  }
+
+  /* Our dynamic white card wrapper */
+  #rr-container {
+      background: #ffffff !important;
+      color: #000;               /* ensure readability inside */
+      display: inline-block;     /* shrink-wrap to content width */
+      padding: 16px 18px;
+      margin: 10px 12px;
+      border-radius: 10px;
+      box-shadow: 0 6px 20px rgba(0,0,0,0.10);
+      max-width: 100%;
+  }
+
+  /* Keep original app pieces readable against white */
+  .match, button, input, select, #initialSetup, #setup, #tournament, #final {
+      background-color: transparent !important;  /* now inside white card */
+  }
+  button {
+      display: inline-block !important;
+      padding: 8px 14px; margin: 6px 6px 6px 0;
+      background-color: #4CAF50 !important; color: white !important; border: none; border-radius: 4px;
+      cursor: pointer;
+  }
+  button:hover { background-color: #45a049 !important; }
+</style>
+"""
+
+# JS: wrap all body content in #rr-container; keep your confirm binding logic
+INJECTED_JS = """
+<script>
+(function(){
+  function log(){ try { console.log.apply(console, arguments); } catch(e){} }
+
+  // Wrap everything in a white "card" that auto-sizes with content
+  function wrapInCard(){
+    if (document.getElementById('rr-container')) return;
+    var card = document.createElement('div');
+    card.id = 'rr-container';
+
+    // Move all current body children into the card
+    var currentScript = document.currentScript;
+    var kids = Array.prototype.slice.call(document.body.childNodes);
+    kids.forEach(function(node){
+      if (node !== card && node !== currentScript) {
+        card.appendChild(node);
+      }
+    });
+    document.body.appendChild(card);
+  }
+
+  function ensureConfirmDefined(){
+    if (typeof window.confirmPlayerCount === 'function') return true;
+    window.confirmPlayerCount = function(){
+      log('[Injected] confirmPlayerCount called');
+      var numEl = document.getElementById('numPlayers');
+      if(!numEl){ alert('numPlayers input not found'); return; }
+      var num = parseInt(numEl.value);
+      if (isNaN(num) || num < 2 || num > 20) {
+        alert('Please enter a number of players between 2 and 20.');
+        return;
+      }
+      var div = document.getElementById('playerNames');
+      if(!div){ alert('playerNames container not found'); return; }
+      div.innerHTML = '';
+      for (var i=1;i<=num;i++){
+        div.insertAdjacentHTML('beforeend',
+          '<label>Player '+i+' Name:</label><input type="text" id="player'+i+'" placeholder="Player '+i+'"><br>');
+      }
+      var init = document.getElementById('initialSetup');
+      var setup = document.getElementById('setup');
+      if (init) init.style.display='none';
+      if (setup) setup.style.display='block';
+    };
+    return true;
+  }
+
+  function bindConfirm(){
+    var btn =
+      document.querySelector('button[onclick*="confirmPlayerCount"]') ||
+      document.getElementById('confirmBtn') ||
+      Array.from(document.querySelectorAll('button'))
+        .find(function(b){ return ((b.textContent || '').trim().toLowerCase() === 'confirm'); });
+
+    if(!btn){ return false; }
+    ensureConfirmDefined();
+    btn.onclick = function(e){
+      e.preventDefault();
+      try {
+        window.confirmPlayerCount();
+      } catch(err){
+        console.error('Error in confirmPlayerCount:', err);
+        alert('Error: ' + (err && err.message ? err.message : err));
+      }
+    };
+    log('[Injected] Confirm button bound');
+    return true;
+  }
+
+  function tryBind(){
+    wrapInCard();
+    if (bindConfirm()) return;
+
+    var mo = new MutationObserver(function(){
+      wrapInCard();
+      bindConfirm();
+    });
+    mo.observe(document.documentElement || document.body, {childList:true, subtree:true});
+
+    [100, 300, 800, 1500].forEach(function(ms){ setTimeout(function(){
+      wrapInCard();
+      bindConfirm();
+    }, ms); });
+  }
+
+  if (document.readyState === 'loading'){
+    document.addEventListener('DOMContentLoaded', tryBind);
+  } else {
+    tryBind();
+  }
+})();
+</script>
+"""
+
+
+def inject(html_content: str, extra: str = "") -> str:
+    """Insert the card CSS, binding JS and `extra` before </body> (case-insensitive), else append."""
+    return insert_before_body(html_content, INJECTED_CSS + INJECTED_JS + extra)
+
+
+def insert_before_body(html_content: str, payload: str) -> str:
+    lower = html_content.lower()
+    if "</body>" in lower:
+        idx = lower.rfind("</body>")
+        return html_content[:idx] + payload + html_content[idx:]
+    return html_content + payload
+
+
+@lru_cache(maxsize=32)
+def _embedded(digest: str, path: str) -> str:
+    beacon = _beacon(path)
+
+    def build() -> str:
+        return minified_or_source(injected_source(path, beacon), path)
+    parts = (digest, hashlib.sha256(beacon.encode()).hexdigest(), code_version(__file__),
+             code_version(minify.__file__))
+    return get_or_build("app-embed", parts, build)
+
+
+def _beacon(path: str) -> str:
+    # Load time and layout shift of the app document itself (no-op unless telemetry is on).
+    scope = f"app:{os.path.basename(path).split('.')[0]}"
+    return beacon_js(scope, observe="self", load_metric="iframe_load")
+
+
+def injected_source(path: str, beacon: Optional[str] = None) -> str:
+    """The app with the wrapper and beacon injected, before minification."""
+    with open(path, "r", encoding="utf-8") as f:
+        return inject(f.read(), _beacon(path) if beacon is None else beacon)
+
+
+def minified_or_source(html: str, label: str) -> str:
+    """Minified `html` if it validates against the source (scripts compiled by `python -m portfolio.build`)."""
+    try:
+        return minify.minify_checked(html, compile_scripts=False)
+    except minify.MinifyError as e:
+        print(f"[embed] {label}: shipping unminified ({e})", file=sys.stderr)
+        return html
+
+
+def app_path(rel: str) -> str:
+    """Registry paths (content/site.json) are relative to the project root."""
+    return os.path.join(PROJECT_ROOT, rel)
+
+
+def embedded_app_html(path: str) -> str:
+    """The app document with the wrapper injected, minified; cached per file content hash."""
+    return _embedded(file_hash(path), path)
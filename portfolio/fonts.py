@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Self-hosted, subsetted web fonts for the Streamlit pages.
+
+Orbitron and Inter are vendored under fonts/ as the variable TTFs from
+github.com/google/fonts (ofl/orbitron, ofl/inter; SIL OFL 1.1, licenses
+next to them). They are cut down to the characters the pages can show:
+printable ASCII plus every other character in the page sources and
+content/site.json. The wght axis is limited to the weights the pages use.
+The subsets are written as WOFF2 to static/fonts/, which Streamlit serves
+at app/static/ (see .streamlit/config.toml). Pages put `font_head()`
+ahead of their styles; it returns @font-face rules with
+font-display: swap, so text paints in the fallback face until the subset
+arrives. There is no preload hint: st.markdown only reaches the app body
+after the Streamlit bundle has hydrated, and a <link rel="preload"> there
+can't start the download any sooner than the @font-face rule beside it.
+
+File names carry a fingerprint of the font source, the character set and
+this module, so editing page text produces a new subset on the next run
+(or on `python -m portfolio.build`), and the browser never reuses a stale
+one. If fontTools is missing or the sources aren't vendored, `font_head()`
+falls back to the Google Fonts import the pages used before.
+
+    python -m portfolio.fonts        # build now and print sizes
+"""
+import hashlib
+import io
+import json
+import os
+import string
+import sys
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from portfolio.diskcache import code_version
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_DIR = os.path.join(PROJECT_ROOT, "fonts")
+OUTPUT_DIR = os.path.join(PROJECT_ROOT, "static", "fonts")
+URL_PREFIX = "app/static/fonts/"   # relative, so it also works under a baseUrlPath or the cluster proxy
+
+# Everything the pages can put in an Orbitron or Inter run.
+TEXT_SOURCES = ("Home.py", "Home2.py", os.path.join("pages", "Playground.py"),
+                os.path.join("pages", "Loan_Scenarios.py"), os.path.join("content", "site.json"))
+GOOGLE_CSS = "https://fonts.googleapis.com/css2?{families}&display=swap"
+
+
+@dataclass(frozen=True)
+class Family:
+    name: str
+    source: str               # file under fonts/
+    weights: Tuple[int, int]  # wght range kept from the variable font
+    google: str               # `family=` value for the Google Fonts fallback
+
+
+FAMILIES = (
+    Family("Orbitron", "Orbitron[wght].ttf", (400, 700), "Orbitron:wght@400;600;700"),
+    Family("Inter", "Inter[opsz,wght].ttf", (400, 600), "Inter:wght@400;600"),
+)
+
+
+@dataclass(frozen=True)
+class Subset:
+    family: Family
+    filename: str
+    size: int
+
+    @property
+    def url(self) -> str:
+        return URL_PREFIX + self.filename
+
+
+# --------------------------
+#     CHARACTER SET
+# --------------------------
+def _read_text(rel: str) -> str:
+    path = os.path.join(PROJECT_ROOT, rel)
+    with open(path, "r", encoding="utf-8") as f:
+        raw = f.read()
+    # site.json may spell characters as \\u escapes; decode so the real glyphs are counted.
+    return json.dumps(json.loads(raw), ensure_ascii=False) if rel.endswith(".json") else raw
+
+
+def page_text() -> str:
+    """Sorted, de-duplicated characters the pages can render."""
+    chars = set(string.printable.strip()) | {" ", " "}
+    for rel in TEXT_SOURCES:
+        if os.path.isfile(os.path.join(PROJECT_ROOT, rel)):
+            chars.update(c for c in _read_text(rel) if c.isprintable())
+    return "".join(sorted(chars))
+
+
+def _sources_stamp() -> Tuple[Tuple[str, int, int], ...]:
+    stamp = []
+    for rel in TEXT_SOURCES + tuple(os.path.join("fonts", f.source) for f in FAMILIES):
+        try:
+            st = os.stat(os.path.join(PROJECT_ROOT, rel))
+            stamp.append((rel, st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamp.append((rel, 0, 0))
+    return tuple(stamp)
+
+
+# --------------------------
+#     SUBSETTING
+# --------------------------
+def _file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def subset_woff2(source: str, text: str, weights: Tuple[int, int]) -> bytes:
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+
+    font = TTFont(source, lazy=False)
+    opts = subset.Options()
+    opts.layout_features = ["kern", "liga", "calt", "tnum"]
+    opts.name_IDs = ["*"]          # keep the OFL notices
+    sub = subset.Subsetter(opts)
+    sub.populate(text=text)
+    sub.subset(font)
+    if "fvar" in font:
+        # Glyphs first, then axes: the instancer is much cheaper on the cut-down font.
+        from fontTools.varLib import instancer
+        axes = {a.axisTag: a for a in font["fvar"].axes}
+        if "wght" in axes:
+            lo, hi = max(weights[0], axes["wght"].minValue), min(weights[1], axes["wght"].maxValue)
+            font = instancer.instantiateVariableFont(font, {"wght": (lo, hi)})
+    font.flavor = "woff2"
+    buf = io.BytesIO()
+    font.save(buf)
+    return buf.getvalue()
+
+
+def _filename(family: Family, text: str) -> str:
+    src = os.path.join(SOURCE_DIR, family.source)
+    h = hashlib.sha256()
+    for part in (_file_digest(src), text, repr(family.weights), code_version(__file__)):
+        h.update(part.encode() + b"\0")
+    return f"{family.name.lower()}-{h.hexdigest()[:12]}.woff2"
+
+
+def build(out_dir: str = OUTPUT_DIR) -> Optional[List[Subset]]:
+    """Subsets for the current page text, built if missing; None when they can't be built here."""
+    missing = [f.source for f in FAMILIES if not os.path.isfile(os.path.join(SOURCE_DIR, f.source))]
+    if missing:
+        _warn_once(f"font sources not vendored ({', '.join(missing)} in fonts/)")
+        return None
+    try:
+        import fontTools  # noqa: F401  (pip install fonttools brotli)
+    except ImportError:
+        _warn_once("fontTools not installed")
+        return None
+    text = page_text()
+    out: List[Subset] = []
+    os.makedirs(out_dir, exist_ok=True)
+    for family in FAMILIES:
+        name = _filename(family, text)
+        path = os.path.join(out_dir, name)
+        if not os.path.isfile(path):
+            data = subset_woff2(os.path.join(SOURCE_DIR, family.source), text, family.weights)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            # Superseded subsets of this family go; the new name already busts browser caches.
+            prefix = family.name.lower() + "-"
+            for old in os.listdir(out_dir):
+                if old.startswith(prefix) and old.endswith(".woff2") and old != name:
+                    os.remove(os.path.join(out_dir, old))
+        out.append(Subset(family, name, os.path.getsize(path)))
+    return out
+
+
+_warned = set()
+
+
+def _warn_once(msg: str) -> None:
+    if msg not in _warned:
+        _warned.add(msg)
+        print(f"[fonts] {msg}; using Google Fonts", file=sys.stderr)
+
+
+_build_lock = threading.Lock()
+
+
+@lru_cache(maxsize=8)
+def _subsets_for(stamp: Tuple[Tuple[str, int, int], ...]) -> Optional[Tuple[Subset, ...]]:
+    with _build_lock:
+        try:
+            built = build()
+        except Exception as e:  # a bad font file must not take the pages down
+            _warn_once(f"subsetting failed: {type(e).__name__}: {e}")
+            return None
+    return tuple(built) if built is not None else None
+
+
+def current_subsets() -> Optional[Tuple[Subset, ...]]:
+    """Subsets matching the page text right now; a few stat() calls when nothing changed."""
+    return _subsets_for(_sources_stamp())
+
+
+# --------------------------
+#     PAGE-FACING CSS
+# --------------------------
+def font_head(*families: str) -> str:
+    """@font-face rules for `families` (default: all), to put ahead of a page's styles."""
+    wanted = set(families or (f.name for f in FAMILIES))
+    subsets = current_subsets()
+    if subsets is None:
+        query = "&".join(f"family={f.google}" for f in FAMILIES if f.name in wanted)
+        return f"<style>@import url('{GOOGLE_CSS.format(families=query)}');</style>"
+    faces = "".join(
+        f"@font-face{{font-family:'{s.family.name}';font-style:normal;"
+        f"font-weight:{s.family.weights[0]} {s.family.weights[1]};font-display:swap;"
+        f"src:url('{s.url}') format('woff2');}}"
+        for s in subsets if s.family.name in wanted)
+    return f"<style>{faces}</style>"
+
+
+if __name__ == "__main__":
+    built = build()
+    if built is None:
+        sys.exit(1)
+    print(f"{len(page_text())} characters")
+    for s in built:
+        print(f"  {s.family.name:<10}{s.size:>8,} B  static/fonts/{s.filename}")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Lottie hero player with an instant poster frame.
+
+The component iframe opens with a static SVG poster (portfolio.lottie_poster)
+in a slot sized to the animation's own aspect ratio (read from the file
+header by portfolio.lottie_meta), then loads lottie-web and fades the live
+animation in once its first frame is in the DOM. If the player
+script never arrives (offline, blocked CDN) the poster simply stays. The
+animation is shipped in its deduplicated form (portfolio.lottie_dedup).
+A file that fails to load (a valid header over a broken body) renders
+nothing and lottie_hero() returns False, so pages can show a fallback.
+"""
+import html
+import os
+import sys
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from portfolio.lottie_dedup import optimized_text
+from portfolio.lottie_meta import fit, read_meta
+from portfolio.lottie_poster import file_hash, poster_svg
+from portfolio.telemetry import beacon_js
+
+LOTTIE_WEB = "https://cdnjs.cloudflare.com/ajax/libs/lottie-web/5.12.2/lottie.min.js"
+
+_PLAYER = """<!doctype html><html><head><meta charset="utf-8"><style>
+  html, body { margin: 0; background: transparent; overflow: hidden; }
+  #stage { position: relative; width: min(100%, __WIDTH__px); height: __HEIGHT__px; margin: 0 auto; }
+  #poster, #live { position: absolute; inset: 0; }
+  #live { opacity: 0; transition: opacity .25s ease; }
+  #stage.ready #live { opacity: 1; }
+  #stage.ready #poster { opacity: 0; transition: opacity .25s ease .1s; }
+</style></head><body>
+<div id="stage" role="img" aria-label="__LABEL__">
+  <div id="poster">__POSTER__</div>
+  <div id="live"></div>
+</div>
+<script type="application/json" id="anim">__DATA__</script>
+<script>
+  function start() {
+    var stage = document.getElementById('stage');
+    var anim = lottie.loadAnimation({
+      container: document.getElementById('live'), renderer: 'svg', loop: true, autoplay: true,
+      animationData: JSON.parse(document.getElementById('anim').textContent),
+      rendererSettings: { preserveAspectRatio: 'xMidYMid meet' }
+    });
+    anim.addEventListener('DOMLoaded', function () {
+      stage.className = 'ready';
+      if (window.__pfBeacon) __pfBeacon('lottie_first_frame', performance.now());
+    });
+  }
+</script>
+__BEACON__
+<script src="__LOTTIE_WEB__" async onload="start()"></script>
+</body></html>"""
+
+
+@lru_cache(maxsize=16)
+def _player_html(digest: str, path: str, width: int, height: int, frame: Optional[float], label: str) -> str:
+    data = optimized_text(path)  # deduplicated form; raises here, not in the browser, if the file is broken
+    try:
+        poster = poster_svg(path, frame)
+    except Exception:
+        poster = ""  # unusual feature set (custom paths); the slot is still reserved at full size
+    return (_PLAYER
+            .replace("__WIDTH__", str(int(width)))
+            .replace("__HEIGHT__", str(int(height)))
+            .replace("__LABEL__", html.escape(label))
+            .replace("__POSTER__", poster)
+            .replace("__LOTTIE_WEB__", LOTTIE_WEB)
+            .replace("__BEACON__", beacon_js(f"lottie:{os.path.basename(path).split('.')[0]}"))
+            .replace("__DATA__", data.replace("</", "<\\/")))
+
+
+def player_size(path: str, max_width: int, max_height: int) -> Tuple[int, int]:
+    """The animation's own aspect ratio fitted into the slot, from its header alone."""
+    return fit(read_meta(path), max_width, max_height)
+
+
+def player_html(path: str, max_width: int, max_height: int,
+                frame: Optional[float] = None, label: str = "Animation") -> str:
+    """Full component document for `path`; cached per file content hash."""
+    width, height = player_size(path, max_width, max_height)
+    return _player_html(file_hash(path), path, width, height, frame, label)
+
+
+def lottie_hero(path: str, max_width: int, max_height: int,
+                frame: Optional[float] = None, label: str = "Animation") -> bool:
+    """Render the poster-first Lottie player, sized to the animation; False if `path` couldn't be loaded."""
+    import streamlit.components.v1 as components
+    try:
+        _, height = player_size(path, max_width, max_height)
+        doc = player_html(path, max_width, max_height, frame, label)
+    except Exception as e:  # the header read fine, but the body is broken or unreadable
+        print(f"[hero] {path}: not rendered ({type(e).__name__}: {e})", file=sys.stderr)
+        return False
+    components.html(doc, height=height)
+    return True
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Structural deduplication for Lottie files.
+
+Three passes, all of which keep the animation frame-identical:
+
+1. Easing blocks are canonicalized: one-element {"x": [0.833]} arrays become
+   scalars and the redundant 5.1-era easing names ("n") are dropped, so the
+   hundreds of repeated easing objects shrink to a handful of short,
+   identical ones.
+2. Precomp assets with identical layer lists are merged and every refId is
+   rewritten to the survivor.
+3. Shape layers whose shape trees are identical (the same artwork placed
+   at different times) are hoisted into one shared precomp asset. Each
+   copy becomes a precomp layer that references it by refId and keeps its
+   own transform and timing. Only layers built from shape items the poster
+   evaluator models are hoisted (no gradients, repeaters, merge paths,
+   effects, masks, layer styles or blend modes), so the render check below
+   sees everything the rewrite touched.
+
+Two checks guard the result. `structural_diff()` expands the hoisted and
+merged precomps back into plain layers and diffs the JSON against the
+original, so it doesn't depend on the evaluator. `verify()` renders both
+documents with portfolio.lottie_poster and compares every frame.
+`load_optimized()` / `optimized_text()` are what the pages use:
+they return the deduplicated form, cached per file hash, with identical
+subtrees of the parsed object shared in memory.
+"""
+import copy
+import hashlib
+import json
+import math
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from portfolio import lottie_poster
+from portfolio.diskcache import code_version, get_or_build
+from portfolio.lottie_poster import file_hash, render_svg, value
+
+MIN_HOIST_BYTES = 256  # not worth a precomp wrapper below this
+HOIST_PREFIX = "dedup_"
+# Shape items portfolio.lottie_poster renders; anything else keeps its layer as authored.
+MODELED_ITEMS = frozenset({"gr", "sh", "el", "rc", "fl", "st", "tm", "tr"})
+
+
+def _canon(obj: Any) -> str:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"))
+
+
+def _walk(obj: Any):
+    """Yield every dict in the tree."""
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if isinstance(o, dict):
+            yield o
+            stack.extend(o.values())
+        elif isinstance(o, list):
+            stack.extend(o)
+
+
+# --------------------------
+#     PASS 1: EASING
+# --------------------------
+def _scalarize(v: Any) -> Any:
+    return v[0] if isinstance(v, list) and len(v) == 1 else v
+
+
+def canonicalize_easing(anim: Dict[str, Any]) -> int:
+    """Shorten keyframe easing blocks in place; returns how many were touched."""
+    touched = 0
+    for d in _walk(anim):
+        if "t" in d and ("i" in d or "o" in d or "n" in d):
+            for k in ("i", "o"):
+                ease = d.get(k)
+                if isinstance(ease, dict) and "x" in ease and "y" in ease:
+                    ease["x"], ease["y"] = _scalarize(ease["x"]), _scalarize(ease["y"])
+                    touched += 1
+            d.pop("n", None)
+    return touched
+
+
+# --------------------------
+#     PASS 2: IDENTICAL PRECOMPS
+# --------------------------
+def _rewrite_refs(anim: Dict[str, Any], mapping: Dict[str, str]) -> None:
+    for d in _walk(anim):
+        if d.get("refId") in mapping:
+            d["refId"] = mapping[d["refId"]]
+
+
+def merge_identical_assets(anim: Dict[str, Any]) -> int:
+    assets = anim.get("assets", [])
+    seen: Dict[str, str] = {}
+    mapping: Dict[str, str] = {}
+    keep: List[Dict[str, Any]] = []
+    for a in assets:
+        if "layers" not in a:
+            keep.append(a)
+            continue
+        key = _canon({k: v for k, v in a.items() if k not in ("id", "nm")})
+        if key in seen:
+            mapping[a["id"]] = seen[key]
+        else:
+            seen[key] = a["id"]
+            keep.append(a)
+    if mapping:
+        anim["assets"] = keep
+        _rewrite_refs(anim, mapping)
+    return len(mapping)
+
+
+# --------------------------
+#     PASS 3: HOIST DUPLICATE SHAPE LAYERS
+# --------------------------
+def _modeled(items: List[Any]) -> bool:
+    for it in items:
+        if not isinstance(it, dict) or it.get("ty") not in MODELED_ITEMS:
+            return False
+        if it.get("ty") == "gr" and not _modeled(it.get("it", [])):
+            return False
+    return True
+
+
+def _hoistable(layer: Dict[str, Any], parents: set) -> bool:
+    return (
+        layer.get("ty") == 4
+        and not layer.get("hasMask")
+        and not layer.get("ef")
+        and not layer.get("sy")
+        and not layer.get("ao")
+        and not layer.get("ddd")
+        and not layer.get("bm")
+        and layer.get("ind") not in parents  # children would inherit the shifted anchor
+        and bool(layer.get("shapes"))
+        and _modeled(layer["shapes"])
+    )
+
+
+def _shift_anchor(ks: Dict[str, Any], dx: float, dy: float) -> None:
+    a = ks.setdefault("a", {"a": 0, "k": [0, 0, 0]})
+    k = a.get("k")
+
+    def shifted(v: Any) -> Any:
+        v = list(v) if isinstance(v, list) else [v, 0]
+        v += [0] * (2 - len(v))
+        v[0], v[1] = v[0] + dx, v[1] + dy
+        return v
+
+    if isinstance(k, list) and k and isinstance(k[0], dict):
+        for kf in k:
+            for key in ("s", "e"):
+                if key in kf:
+                    kf[key] = shifted(kf[key])
+    else:
+        a["k"] = shifted(k if k is not None else [0, 0])
+
+
+def hoist_duplicate_layers(anim: Dict[str, Any]) -> int:
+    """Replace repeated shape layers with precomp layers referencing one shared asset."""
+    w, h = float(anim.get("w", 512)), float(anim.get("h", 512))
+    # Shapes live at their local coordinates; push them well inside the precomp's clip box.
+    off = 4 * max(w, h)
+    size = 9 * max(w, h)
+
+    comps: List[List[Dict[str, Any]]] = [anim.get("layers", [])]
+    comps += [a["layers"] for a in anim.get("assets", []) if "layers" in a]
+
+    groups: Dict[str, List[Tuple[List[Dict[str, Any]], int]]] = {}
+    for layers in comps:
+        parents = {l.get("parent") for l in layers if l.get("parent") is not None}
+        for n, layer in enumerate(layers):
+            if _hoistable(layer, parents):
+                groups.setdefault(_canon(layer["shapes"]), []).append((layers, n))
+
+    assets = anim.setdefault("assets", [])
+    used_ids = {a.get("id") for a in assets}
+    hoisted = 0
+    for key, members in groups.items():
+        if len(members) < 2 or len(key) < MIN_HOIST_BYTES:
+            continue
+        spans = []
+        for layers, n in members:
+            l = layers[n]
+            sr = l.get("sr", 1) or 1
+            spans.append(((l.get("ip", 0) - l.get("st", 0)) / sr, (l.get("op", 0) - l.get("st", 0)) / sr))
+        asset_id = f"{HOIST_PREFIX}{hashlib.sha1(key.encode()).hexdigest()[:10]}"
+        if asset_id in used_ids:
+            continue
+        first = members[0][0][members[0][1]]
+        assets.append({
+            "id": asset_id,
+            "layers": [{
+                "ddd": 0, "ind": 1, "ty": 4, "nm": first.get("nm", asset_id), "sr": 1,
+                "ks": {
+                    "o": {"a": 0, "k": 100}, "r": {"a": 0, "k": 0},
+                    "p": {"a": 0, "k": [off, off, 0]}, "a": {"a": 0, "k": [0, 0, 0]},
+                    "s": {"a": 0, "k": [100, 100, 100]},
+                },
+                "ao": 0, "shapes": first["shapes"],
+                "ip": math.floor(min(s for s, _ in spans)), "op": math.ceil(max(e for _, e in spans)) + 1,
+                "st": 0, "bm": 0,
+            }],
+        })
+        used_ids.add(asset_id)
+        for layers, n in members:
+            old = layers[n]
+            new = {k: v for k, v in old.items() if k != "shapes"}
+            new["ty"], new["refId"], new["w"], new["h"] = 0, asset_id, size, size
+            new["ks"] = copy.deepcopy(old.get("ks", {}))
+            _shift_anchor(new["ks"], off, off)
+            layers[n] = new
+            hoisted += 1
+    return hoisted
+
+
+# --------------------------
+#     DRIVER + VERIFICATION
+# --------------------------
+def dedupe(anim: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """Return (deduplicated copy, per-pass counts). The input is left untouched."""
+    out = copy.deepcopy(anim)
+    stats = {
+        "easing": canonicalize_easing(out),
+        "assets_merged": merge_identical_assets(out),
+        "layers_hoisted": hoist_duplicate_layers(out),
+    }
+    return out, stats
+
+
+_PATH_RE = re.compile(r"<path [^>]*/>")
+_NUM_RE = re.compile(r"-?\d+(?:\.\d+)?")
+_CLIP_RE = re.compile(r"<clipPath .*?</clipPath>")
+_ID_RE = re.compile(r"(?:id='|url\(#)[a-z]+\d+")
+
+
+def _drawn(svg: str) -> List[str]:
+    # Clip boxes exist only for precomp wrappers; ids are renumbered when layers change.
+    return _PATH_RE.findall(_ID_RE.sub("", _CLIP_RE.sub("", svg)))
+
+
+def _same_path(a: str, b: str, tol: float) -> bool:
+    if _NUM_RE.sub("#", a) != _NUM_RE.sub("#", b):
+        return False
+    return all(abs(float(x) - float(y)) <= tol for x, y in zip(_NUM_RE.findall(a), _NUM_RE.findall(b)))
+
+
+# --------------------------
+#     STRUCTURAL CHECK
+# --------------------------
+def _unhoist(layer: Dict[str, Any], asset: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The shape layer a hoisted precomp layer stands for, or None if the wrapper isn't one of ours."""
+    inner = asset.get("layers", [])
+    if len(inner) != 1 or inner[0].get("ty") != 4:
+        return None
+    ks = inner[0].get("ks", {})
+    pos = value(ks.get("p"), 0, [0, 0])
+    static = {k: ks.get(k, {}).get("k") for k in ("o", "r", "a", "s")}
+    if any(ks.get(k, {}).get("a") for k in ks) or static != {
+            "o": 100, "r": 0, "a": [0, 0, 0], "s": [100, 100, 100]}:
+        return None
+    # The wrapper must show its shapes for the layer's whole visible span.
+    sr = layer.get("sr", 1) or 1
+    start, end = ((layer.get(k, 0) - layer.get("st", 0)) / sr for k in ("ip", "op"))
+    if inner[0].get("ip", 0) > start or inner[0].get("op", 0) < end:
+        return None
+    out = {k: v for k, v in layer.items() if k not in ("refId", "w", "h")}
+    out["ty"], out["shapes"] = 4, inner[0]["shapes"]
+    out["ks"] = copy.deepcopy(layer.get("ks", {}))
+    _shift_anchor(out["ks"], -pos[0], -pos[1])
+    return out
+
+
+def _expanded(anim: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Comparable form of a document: easing spelled one way, hoisted layers put
+    back, every precomp layer carrying its asset's layers inline, precomp
+    assets dropped and missing anchors written out.
+    """
+    out = copy.deepcopy(anim)
+    canonicalize_easing(out)
+    comps = {a["id"]: a for a in out.get("assets", []) if "layers" in a}
+
+    def fix(layers: List[Dict[str, Any]], depth: int) -> List[Dict[str, Any]]:
+        fixed = []
+        for layer in layers:
+            asset = comps.get(layer.get("refId")) if layer.get("ty") == 0 else None
+            if asset is not None and str(layer["refId"]).startswith(HOIST_PREFIX):
+                layer = _unhoist(layer, asset) or layer
+            if layer.get("ty") == 0 and asset is not None and depth < 32:
+                layer = {k: v for k, v in layer.items() if k != "refId"}  # ids differ once merged
+                layer["layers"] = fix(asset["layers"], depth + 1)
+            ks = layer.setdefault("ks", {})
+            ks.setdefault("a", {"a": 0, "k": [0, 0, 0]})
+            fixed.append(layer)
+        return fixed
+
+    out["layers"] = fix(out.get("layers", []), 0)
+    out["assets"] = [a for a in out.get("assets", []) if "layers" not in a]
+    return out
+
+
+def _diff(a: Any, b: Any, path: str, tol: float, out: List[str], limit: int) -> None:
+    if len(out) >= limit:
+        return
+    if isinstance(a, bool) or isinstance(b, bool) or not isinstance(a, (int, float)) \
+            or not isinstance(b, (int, float)):
+        if isinstance(a, dict) and isinstance(b, dict):
+            for k in sorted(set(a) | set(b)):
+                if k not in a or k not in b:
+                    out.append(f"{path}.{k}")
+                else:
+                    _diff(a[k], b[k], f"{path}.{k}", tol, out, limit)
+        elif isinstance(a, list) and isinstance(b, list):
+            if len(a) != len(b):
+                out.append(f"{path}[len]")
+            for i, (x, y) in enumerate(zip(a, b)):
+                _diff(x, y, f"{path}[{i}]", tol, out, limit)
+        elif a != b:
+            out.append(path)
+    elif abs(a - b) > tol:  # the anchor shift round-trips through floats
+        out.append(path)
+
+
+def structural_diff(original: Dict[str, Any], deduped: Dict[str, Any], tol: float = 1e-6,
+                    limit: int = 20) -> List[str]:
+    """JSON paths where `deduped`, with its precomps expanded, differs from `original`; [] means none."""
+    out: List[str] = []
+    _diff(_expanded(original), _expanded(deduped), "$", tol, out, limit)
+    return out
+
+
+# --------------------------
+#     RENDER CHECK
+# --------------------------
+def verify(original: Dict[str, Any], deduped: Dict[str, Any], step: int = 1, tol: float = 0.02) -> List[int]:
+    """Frames (ip..op, every `step`) whose rendered geometry differs; [] means identical."""
+    bad: List[int] = []
+    for f in range(int(original.get("ip", 0)), int(original.get("op", 0)), step):
+        a, b = _drawn(render_svg(original, f)), _drawn(render_svg(deduped, f))
+        if len(a) != len(b) or not all(_same_path(x, y, tol) for x, y in zip(a, b)):
+            bad.append(f)
+    return bad
+
+
+def intern_tree(obj: Any, _memo: Optional[Dict[Any, Any]] = None) -> Any:
+    """
+    Copy of `obj` in which structurally identical dicts/lists are the same
+    object, so repeated easing blocks, colours and shape trees are held once.
+    The result must be treated as read-only.
+    """
+    memo = {} if _memo is None else _memo
+    if isinstance(obj, dict):
+        items = [(k, intern_tree(v, memo)) for k, v in obj.items()]
+        key = ("d",) + tuple((k, _key(v)) for k, v in items)
+        return memo.setdefault(key, dict(items))
+    if isinstance(obj, list):
+        items = [intern_tree(v, memo) for v in obj]
+        key = ("l",) + tuple(_key(v) for v in items)
+        return memo.setdefault(key, items)
+    return obj
+
+
+def _key(v: Any) -> Any:
+    return ("o", id(v)) if isinstance(v, (dict, list)) else (type(v).__name__, v)
+
+
+# --------------------------
+#     CACHED, PAGE-FACING API
+# --------------------------
+def _build_text(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        original = json.load(f)
+    deduped, _ = dedupe(original)
+    # Full-range checks live in the CLI; a handful of frames is enough to catch a bad rewrite here.
+    span = int(original.get("op", 0) - original.get("ip", 0))
+    try:
+        mismatched = bool(structural_diff(original, deduped, limit=1)) \
+            or bool(verify(original, deduped, step=max(1, span // 4)))
+    except Exception:
+        mismatched = True  # a feature the poster evaluator doesn't model; ship the file as authored
+    if mismatched:
+        deduped = original
+    return json.dumps(deduped, separators=(",", ":"), ensure_ascii=False)
+
+
+@lru_cache(maxsize=16)
+def _optimized(digest: str, path: str) -> Tuple[str, Any]:
+    # Shared across worker processes when PORTFOLIO_CACHE_DIR is set (portfolio.diskcache).
+    code = code_version(__file__) + code_version(lottie_poster.__file__)
+    text = get_or_build("lottie-dedup", (digest, code), lambda: _build_text(path))
+    return text, intern_tree(json.loads(text))
+
+
+def optimized_text(path: str) -> str:
+    """Deduplicated, compact JSON text for shipping to the browser (cached per file hash)."""
+    return _optimized(file_hash(path), path)[0]
+
+
+def load_optimized(path: str) -> Any:
+    """Deduplicated, subtree-shared parsed document (cached per file hash). Read-only."""
+    return _optimized(file_hash(path), path)[1]
+
+
+if __name__ == "__main__":
+    # python -m portfolio.lottie_dedup "Laptop.json" [--write out.json]
+    import sys
+    src = sys.argv[1]
+    with open(src, "r", encoding="utf-8") as f:
+        raw = f.read()
+    orig = json.loads(raw)
+    out, counts = dedupe(orig)
+    text = json.dumps(out, separators=(",", ":"), ensure_ascii=False)
+    changed = structural_diff(orig, out)
+    mismatched = verify(orig, out)
+    print(f"{src}: {len(raw):,} -> {len(text):,} bytes ({counts}); "
+          f"{'expands to the original' if not changed else f'STRUCTURE differs at {changed[:5]}'}; "
+          f"{'frame-identical' if not mismatched else f'MISMATCH at frames {mismatched[:10]}'}")
+    if "--write" in sys.argv:
+        with open(sys.argv[sys.argv.index("--write") + 1], "w", encoding="utf-8") as f:
+            f.write(text)
+    sys.exit(1 if mismatched or changed else 0)
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Header-only Lottie metadata.
+
+`read_header()` streams a file in chunks and walks only the top-level
+object: the scalars v / fr / ip / op / w / h / nm are decoded as they go
+by, and arrays and objects (assets, layers) are skipped without being
+decoded. A numpy byte scan over the quotes, brackets and commas finds
+where each one ends, and counts the layers from the commas at the array's
+own depth. Nothing below the top level is ever parsed into Python objects.
+Reading stops as soon as everything wanted has been seen, so trailing
+markers and metadata are never read.
+
+`read_meta()` caches per (path, mtime, size); `catalog()` lists the Lottie
+files the pages can offer, and `fit()` sizes a player to the animation's
+own aspect ratio.
+"""
+import glob
+import json
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEARCH_DIRS = (PROJECT_ROOT, os.path.join(PROJECT_ROOT, "assets"))
+
+CHUNK = 256 * 1024
+_SCALARS = ("v", "fr", "ip", "op", "w", "h", "nm")
+_REQUIRED = ("v", "fr", "ip", "op", "w", "h")
+_SPACE_RE = re.compile(rb"\s*")
+_ATOM_RE = re.compile(rb"[^\s,\]}]*")
+
+
+class HeaderError(ValueError):
+    """The file is not a JSON object, or ends mid-document."""
+
+
+@dataclass(frozen=True)
+class LottieMeta:
+    path: str
+    name: str           # file stem, which is what the loaders accept
+    version: str
+    fr: float
+    ip: float
+    op: float
+    w: int
+    h: int
+    layers: int
+    title: str = ""     # the "nm" the animation was exported with
+
+    @property
+    def aspect(self) -> float:
+        return self.w / self.h if self.h else 1.0
+
+    @property
+    def duration(self) -> float:
+        return (self.op - self.ip) / self.fr if self.fr else 0.0
+
+    def describe(self) -> str:
+        return f"{self.w}×{self.h} · {self.duration:.1f}s @ {self.fr:g} fps · {self.layers} layers"
+
+
+# --------------------------
+#     INCREMENTAL READER
+# --------------------------
+class _Stream:
+    """A growing byte window over a file; consumed bytes are dropped on every refill."""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = b""
+        self.pos = 0
+
+    def more(self) -> bool:
+        data = self.f.read(CHUNK)
+        if not data:
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> bytes:
+        while True:
+            self.pos = _SPACE_RE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos:self.pos + 1]
+            if not self.more():
+                return b""
+
+    def expect(self, ch: bytes) -> None:
+        if self.peek() != ch:
+            raise HeaderError(f"expected {ch.decode()!r}")
+        self.pos += 1
+
+    def string_end(self, i: int) -> int:
+        """Index just past the string whose opening quote is at `i`, reading on as needed."""
+        j = i + 1
+        while True:
+            k = self.buf.find(b'"', j)
+            if k < 0:
+                j, off = len(self.buf), self.pos
+                if not self.more():
+                    raise HeaderError("truncated string")
+                j -= off
+                continue
+            n = 0
+            while self.buf[k - 1 - n] == 0x5C:  # backslash
+                n += 1
+            if n % 2 == 0:
+                return k + 1
+            j = k + 1
+
+    def scalar(self) -> Any:
+        """Decode the string, number or literal at the cursor."""
+        c = self.peek()
+        if c == b'"':
+            end = self.string_end(self.pos)
+        else:
+            while True:
+                end = _ATOM_RE.match(self.buf, self.pos).end()
+                if end < len(self.buf) or not self.more():
+                    break  # a bare number may run on into the next chunk
+        raw, self.pos = self.buf[self.pos:end], end
+        try:
+            return json.loads(raw)
+        except ValueError:
+            raise HeaderError("bad value")
+
+    def skip_container(self) -> int:
+        """
+        Step over the array or object at the cursor without decoding it and
+        return its element count. The bytes are scanned with numpy: quote
+        parity marks what is inside strings, and a cumulative sum of the
+        brackets outside them finds the closing one and the commas at the
+        container's own depth. Only new bytes are scanned after a refill.
+        """
+        import numpy as np  # only paid by the first header read, not by importing this module
+
+        start = scanned = self.pos
+        depth, in_str, commas = 0, False, 0
+        while True:
+            if scanned == len(self.buf):
+                off = self.pos
+                if not self.more():
+                    raise HeaderError("truncated container")
+                start, scanned = start - off, scanned - off
+            whole = np.frombuffer(self.buf, np.uint8)
+            folded = whole[scanned:] | 0x20  # "[" -> "{", "]" -> "}"; nothing else lands on those
+            # Quotes, brackets and commas are the only bytes that matter; work on those alone.
+            at = np.flatnonzero((folded == 0x7B) | (folded == 0x7D) | (folded == 0x22) | (folded == 0x2C))
+            kind = folded[at]
+            quote = kind == 0x22
+            # A quote after an odd run of backslashes is part of the string (rare: checked one by one).
+            qs = np.flatnonzero(quote)
+            before = at[qs] + (scanned - 1)  # never before `start`, which holds the opening bracket
+            escaped = whole[before] == 0x5C
+            for q, i in zip(qs[escaped].tolist(), before[escaped].tolist()):
+                j = i
+                while self.buf[j] == 0x5C:
+                    j -= 1
+                if (i - j) % 2:
+                    quote[q] = False
+            inside = (np.cumsum(quote, dtype=np.uint8) & 1).astype(bool) ^ in_str
+            delta = (kind == 0x7B).astype(np.int32) - (kind == 0x7D)
+            delta[inside] = 0
+            d = np.cumsum(delta, dtype=np.int32) + depth
+            own = (kind == 0x2C) & ~inside & (d == 1)
+            closed = np.flatnonzero(d == 0)
+            if closed.size:
+                end = scanned + int(at[closed[0]])
+                commas += int(np.count_nonzero(own[:closed[0]]))
+                empty = _SPACE_RE.match(self.buf, start + 1).end() == end
+                self.pos = end + 1
+                return 0 if empty else commas + 1
+            commas += int(np.count_nonzero(own))
+            if at.size:
+                depth, in_str = int(d[-1]), bool(inside[-1])
+            scanned = len(self.buf)
+
+
+def read_header(path: str) -> Dict[str, Any]:
+    """Top-level scalars plus `layers` (the layer count) without parsing the layer tree."""
+    out: Dict[str, Any] = {}
+    with open(path, "rb") as f:
+        s = _Stream(f)
+        if s.peek() != b"{":
+            raise HeaderError("not a JSON object")
+        s.pos += 1
+        while "layers" not in out or not all(k in out for k in _SCALARS):
+            c = s.peek()
+            if c == b",":
+                s.pos += 1
+                continue
+            if c in (b"}", b""):
+                break
+            key = s.scalar()
+            s.expect(b":")
+            c = s.peek()
+            if c in (b"[", b"{"):
+                n = s.skip_container()
+                if key == "layers" and c == b"[":
+                    out["layers"] = n
+            else:
+                val = s.scalar()
+                if key in _SCALARS:
+                    out[key] = val
+    return out
+
+
+# --------------------------
+#     CATALOG
+# --------------------------
+@lru_cache(maxsize=64)
+def _meta_for(path: str, mtime_ns: int, size: int) -> Optional[LottieMeta]:
+    try:
+        hdr = read_header(path)
+    except (OSError, UnicodeDecodeError, HeaderError, json.JSONDecodeError):
+        return None
+    if not all(isinstance(hdr.get(k), (int, float, str)) for k in _REQUIRED):
+        return None  # some other JSON (manifest, content, ...)
+    stem = os.path.basename(path)
+    while stem.lower().endswith(".json"):
+        stem = stem[:-5]
+    return LottieMeta(
+        path=path, name=stem, version=str(hdr["v"]),
+        fr=float(hdr["fr"]), ip=float(hdr["ip"]), op=float(hdr["op"]),
+        w=int(hdr["w"]), h=int(hdr["h"]), layers=int(hdr.get("layers", 0)),
+        title=str(hdr.get("nm", "")),
+    )
+
+
+def read_meta(path: str) -> Optional[LottieMeta]:
+    """Metadata for one file (None if it isn't a Lottie document); cached until the file changes."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return _meta_for(os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def catalog(dirs: Iterable[str] = SEARCH_DIRS) -> List[LottieMeta]:
+    """Every Lottie file in `dirs`, by name; the first directory wins on a name clash."""
+    found: Dict[str, LottieMeta] = {}
+    for d in dirs:
+        for path in sorted(glob.glob(os.path.join(d, "*.json"))):
+            meta = read_meta(path)
+            if meta is not None and meta.name not in found:
+                found[meta.name] = meta
+    return sorted(found.values(), key=lambda m: m.name.lower())
+
+
+def fit(meta: Optional[LottieMeta], max_width: int, max_height: int) -> Tuple[int, int]:
+    """Largest (width, height) inside the box that keeps the animation's aspect ratio."""
+    if meta is None:
+        return max_width, max_height
+    width = min(max_width, round(max_height * meta.aspect))
+    return width, round(width / meta.aspect)
+
+
+if __name__ == "__main__":
+    # python -m portfolio.lottie_meta [dir ...]
+    import sys
+    import time
+    t0 = time.perf_counter()
+    metas = catalog(sys.argv[1:] or SEARCH_DIRS)
+    ms = (time.perf_counter() - t0) * 1000
+    for m in metas:
+        print(f"{m.name:<16} v{m.version:<7} {m.describe()}")
+    print(f"{len(metas)} animation(s) in {ms:.1f} ms")
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Static SVG poster frames for Lottie animations.
+
+A small Lottie evaluator: it resolves keyframe interpolation (bezier easing,
+hold keys, spatial position tangents, both the 5.1 `e` and 5.5+ `s`-only
+keyframe formats), layer/group transforms and parenting, shape groups
+(paths, rects, ellipses, fills, strokes, trim paths), precomps, masks and
+track mattes, and emits one lightweight inline <svg> for a chosen frame.
+Transforms are baked into the path coordinates, so the output is a flat
+list of <path> elements plus the occasional <mask>.
+
+Anything it does not understand (gradients, text, images, effects) is
+skipped; this is a placeholder shown until the real player is ready, not a
+replacement for it. Posters are cached per file content hash.
+"""
+import hashlib
+import math
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+Matrix = Tuple[float, float, float, float, float, float]  # SVG order: a b c d e f
+IDENTITY: Matrix = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+# --------------------------
+#     MATH
+# --------------------------
+def mul(m: Matrix, n: Matrix) -> Matrix:
+    """m · n (apply n first, then m)."""
+    a, b, c, d, e, f = m
+    A, B, C, D, E, F = n
+    return (a * A + c * B, b * A + d * B, a * C + c * D, b * C + d * D, a * E + c * F + e, b * E + d * F + f)
+
+
+def apply(m: Matrix, x: float, y: float) -> Tuple[float, float]:
+    return (m[0] * x + m[2] * y + m[4], m[1] * x + m[3] * y + m[5])
+
+
+def scale_factor(m: Matrix) -> float:
+    return math.sqrt(abs(m[0] * m[3] - m[1] * m[2]))
+
+
+def _cubic(p0: float, p1: float, p2: float, p3: float, u: float) -> float:
+    v = 1.0 - u
+    return v * v * v * p0 + 3 * v * v * u * p1 + 3 * v * u * u * p2 + u * u * u * p3
+
+
+def _ease(x1: float, y1: float, x2: float, y2: float, t: float) -> float:
+    """CSS-style cubic-bezier(x1, y1, x2, y2) evaluated at time t."""
+    if t <= 0.0 or t >= 1.0:
+        return min(max(t, 0.0), 1.0)
+    lo, hi, u = 0.0, 1.0, t
+    for _ in range(8):  # Newton, falls back to bisection below
+        x = _cubic(0.0, x1, x2, 1.0, u) - t
+        dx = 3 * (1 - u) ** 2 * x1 + 6 * (1 - u) * u * (x2 - x1) + 3 * u * u * (1 - x2)
+        if abs(x) < 1e-6:
+            return _cubic(0.0, y1, y2, 1.0, u)
+        if abs(dx) < 1e-6:
+            break
+        u -= x / dx
+        if not 0.0 <= u <= 1.0:
+            break
+    u = t
+    for _ in range(30):
+        x = _cubic(0.0, x1, x2, 1.0, u)
+        if abs(x - t) < 1e-6:
+            break
+        lo, hi = (u, hi) if x < t else (lo, u)
+        u = (lo + hi) / 2
+    return _cubic(0.0, y1, y2, 1.0, u)
+
+
+def _first(v: Any, default: float) -> float:
+    if isinstance(v, list):
+        return float(v[0]) if v else default
+    return float(v) if v is not None else default
+
+
+def _lerp(a: Any, b: Any, t: float) -> Any:
+    if isinstance(a, dict):  # bezier path
+        return {
+            "c": a.get("c", False),
+            "v": [[x + (y - x) * t for x, y in zip(p, q)] for p, q in zip(a["v"], b["v"])],
+            "i": [[x + (y - x) * t for x, y in zip(p, q)] for p, q in zip(a["i"], b["i"])],
+            "o": [[x + (y - x) * t for x, y in zip(p, q)] for p, q in zip(a["o"], b["o"])],
+        }
+    if isinstance(a, list):
+        return [x + (y - x) * t for x, y in zip(a, b)]
+    return a + (b - a) * t
+
+
+# --------------------------
+#     PROPERTY EVALUATION
+# --------------------------
+def value(prop: Optional[Dict[str, Any]], frame: float, default: Any = 0.0) -> Any:
+    """Evaluate an animatable property {"a": 0|1, "k": ...} at `frame`."""
+    if prop is None:
+        return default
+    k = prop.get("k", default)
+    if not (isinstance(k, list) and k and isinstance(k[0], dict) and "t" in k[0]):
+        return k
+    keys = k
+    if frame <= keys[0]["t"]:
+        return _unwrap(keys[0].get("s", keys[0].get("e")))
+    for n in range(len(keys) - 1):
+        k0, k1 = keys[n], keys[n + 1]
+        if frame < k1["t"]:
+            start = _unwrap(k0["s"])
+            if k0.get("h"):
+                return start
+            end = _unwrap(k0["e"]) if "e" in k0 else _unwrap(k1.get("s", k0.get("s")))
+            span = k1["t"] - k0["t"]
+            t = (frame - k0["t"]) / span if span else 1.0
+            o, i = k0.get("o", {}), k0.get("i", {})
+            eased = _ease(_first(o.get("x"), 0.0), _first(o.get("y"), 0.0),
+                          _first(i.get("x"), 1.0), _first(i.get("y"), 1.0), t)
+            to, ti = k0.get("to"), k0.get("ti")
+            if to and ti and isinstance(start, list) and len(start) >= 2 and any(to + ti):
+                # Spatial bezier: position travels along a curve, not a straight line.
+                return [_cubic(start[d], start[d] + to[d], end[d] + ti[d], end[d], eased)
+                        for d in range(min(len(start), len(to), len(ti)))]
+            return _lerp(start, end, eased)
+    last = keys[-1]
+    if "s" in last:
+        return _unwrap(last["s"])
+    return _unwrap(keys[-2].get("e", keys[-2].get("s")))
+
+
+def _unwrap(v: Any) -> Any:
+    # Path keyframes wrap the shape in a one-element list; scalars sometimes are [x].
+    if isinstance(v, list) and len(v) == 1:
+        return v[0]
+    return v
+
+
+def _scalar(prop: Optional[Dict[str, Any]], frame: float, default: float) -> float:
+    return _first(value(prop, frame, default), default)
+
+
+def _vec(prop: Optional[Dict[str, Any]], frame: float, default: Sequence[float]) -> List[float]:
+    v = value(prop, frame, list(default))
+    if not isinstance(v, list):
+        v = [float(v)] * len(default)
+    return [float(x) for x in v] + list(default[len(v):])
+
+
+def transform(ks: Dict[str, Any], frame: float) -> Tuple[Matrix, float]:
+    """Layer `ks` / group `tr` -> (matrix, opacity 0..1). Order: T(p) R(r) S(s) T(-a)."""
+    a = _vec(ks.get("a"), frame, (0.0, 0.0))
+    p_prop = ks.get("p")
+    if isinstance(p_prop, dict) and p_prop.get("s"):
+        p = [_scalar(p_prop.get("x"), frame, 0.0), _scalar(p_prop.get("y"), frame, 0.0)]
+    else:
+        p = _vec(p_prop, frame, (0.0, 0.0))
+    s = _vec(ks.get("s"), frame, (100.0, 100.0))
+    r = math.radians(_scalar(ks.get("r", ks.get("rz")), frame, 0.0))
+    o = _scalar(ks.get("o"), frame, 100.0) / 100.0
+    cos, sin = math.cos(r), math.sin(r)
+    sx, sy = s[0] / 100.0, s[1] / 100.0
+    m = (cos * sx, sin * sx, -sin * sy, cos * sy, p[0], p[1])
+    m = mul(m, (1.0, 0.0, 0.0, 1.0, -a[0], -a[1]))
+    return m, o
+
+
+# --------------------------
+#     PATHS
+# --------------------------
+def _num(x: float) -> str:
+    s = f"{x:.2f}".rstrip("0").rstrip(".")
+    return "0" if s in ("-0", "") else s
+
+
+def path_d(shape: Dict[str, Any], m: Matrix) -> str:
+    v, ii, oo = shape.get("v") or [], shape.get("i") or [], shape.get("o") or []
+    if not v:
+        return ""
+    n = len(v)
+    pt = lambda x, y: "%s %s" % tuple(_num(c) for c in apply(m, x, y))  # noqa: E731
+    out = ["M" + pt(*v[0][:2])]
+    segs = n if shape.get("c") else n - 1
+    for j in range(segs):
+        a, b = v[j], v[(j + 1) % n]
+        c1 = (a[0] + oo[j][0], a[1] + oo[j][1]) if j < len(oo) else tuple(a[:2])
+        c2 = (b[0] + ii[(j + 1) % n][0], b[1] + ii[(j + 1) % n][1]) if (j + 1) % n < len(ii) else tuple(b[:2])
+        out.append("C" + pt(*c1) + " " + pt(*c2) + " " + pt(*b[:2]))
+    if shape.get("c"):
+        out.append("Z")
+    return "".join(out)
+
+
+_K = 0.5522847498  # circle bezier constant
+
+
+def _ellipse(item: Dict[str, Any], frame: float) -> Dict[str, Any]:
+    cx, cy = _vec(item.get("p"), frame, (0.0, 0.0))[:2]
+    w, h = _vec(item.get("s"), frame, (0.0, 0.0))[:2]
+    rx, ry = w / 2, h / 2
+    v = [[cx, cy - ry], [cx + rx, cy], [cx, cy + ry], [cx - rx, cy]]
+    o = [[rx * _K, 0], [0, ry * _K], [-rx * _K, 0], [0, -ry * _K]]
+    i = [[-rx * _K, 0], [0, -ry * _K], [rx * _K, 0], [0, ry * _K]]
+    return {"c": True, "v": v, "i": i, "o": o}
+
+
+def _rect(item: Dict[str, Any], frame: float) -> Dict[str, Any]:
+    cx, cy = _vec(item.get("p"), frame, (0.0, 0.0))[:2]
+    w, h = _vec(item.get("s"), frame, (0.0, 0.0))[:2]
+    x0, y0, x1, y1 = cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2
+    zero = [[0, 0]] * 4
+    return {"c": True, "v": [[x1, y0], [x1, y1], [x0, y1], [x0, y0]], "i": zero, "o": zero}
+
+
+def _color(c: Sequence[float]) -> str:
+    rgb = [max(0, min(255, round(x * 255 if max(c[:3]) <= 1 else x))) for x in list(c[:3]) + [0, 0, 0]][:3]
+    return "#%02x%02x%02x" % tuple(rgb)
+
+
+# --------------------------
+#     SHAPE GROUPS
+# --------------------------
+_LINECAP = {1: "butt", 2: "round", 3: "square"}
+_LINEJOIN = {1: "miter", 2: "round", 3: "bevel"}
+
+
+class _Ctx:
+    def __init__(self, comps: Dict[str, Dict[str, Any]], fr: float):
+        self.comps = comps
+        self.fr = fr
+        self.defs: List[str] = []
+        self._ids = 0
+
+    def new_id(self, prefix: str) -> str:
+        self._ids += 1
+        return f"{prefix}{self._ids}"
+
+
+def _render_items(items: List[Dict[str, Any]], frame: float, m: Matrix, opacity: float,
+                  trim: Optional[Tuple[float, float]] = None) -> Tuple[List[str], List[Tuple[str, float]]]:
+    """
+    Render one shape list. Returns (elements, paths) where `elements` are SVG
+    strings in paint order (bottom first) and `paths` are (d, stroke scale)
+    for every geometry in this list, so styles in an enclosing group can
+    paint them too. A style paints the geometry listed before it.
+    """
+    tr = next((it for it in items if it.get("ty") == "tr"), None)
+    if tr is not None:
+        gm, go = transform(tr, frame)
+        m, opacity = mul(m, gm), opacity * go
+
+    for it in items:
+        if it.get("ty") == "tm" and not it.get("hd"):
+            s = _scalar(it.get("s"), frame, 0.0)
+            e = _scalar(it.get("e"), frame, 100.0)
+            off = _scalar(it.get("o"), frame, 0.0) / 360.0 * 100.0
+            s, e = sorted((s, e))
+            trim = (s + off, e + off)
+
+    layers: List[List[str]] = []  # per item, in list order (top first)
+    paths: List[Tuple[str, float]] = []
+    sf = scale_factor(m)
+    for it in items:
+        ty = it.get("ty")
+        out: List[str] = []
+        if it.get("hd"):
+            layers.append(out)
+            continue
+        if ty == "gr":
+            sub_el, sub_paths = _render_items(it.get("it", []), frame, m, opacity, trim)
+            out += sub_el
+            paths += sub_paths
+        elif ty in ("sh", "el", "rc"):
+            shape = value(it.get("ks"), frame, {}) if ty == "sh" else (_ellipse if ty == "el" else _rect)(it, frame)
+            if isinstance(shape, dict):
+                d = path_d(shape, m)
+                if d:
+                    paths.append((d, sf))
+        elif ty in ("fl", "st") and paths:
+            col = _color(_vec(it.get("c"), frame, (0.0, 0.0, 0.0, 1.0)))
+            op = _scalar(it.get("o"), frame, 100.0) / 100.0 * opacity
+            d = "".join(p for p, _ in paths)
+            if trim is not None and trim[1] - trim[0] <= 0.01:
+                layers.append(out)  # trimmed to nothing
+                continue
+            if ty == "fl":
+                rule = " fill-rule='evenodd'" if it.get("r") == 2 else ""
+                out.append(f"<path d='{d}' fill='{col}' fill-opacity='{_num(op)}'{rule}/>")
+            else:
+                w = _scalar(it.get("w"), frame, 1.0) * max(sf, 1e-6)
+                dash = ""
+                if trim is not None and (trim[0] > 0.01 or trim[1] < 99.99):
+                    dash = (f" pathLength='100' stroke-dasharray='{_num(trim[1] - trim[0])} 100'"
+                            f" stroke-dashoffset='{_num(-trim[0])}'")
+                out.append(
+                    f"<path d='{d}' fill='none' stroke='{col}' stroke-opacity='{_num(op)}' "
+                    f"stroke-width='{_num(w)}' stroke-linecap='{_LINECAP.get(it.get('lc'), 'butt')}' "
+                    f"stroke-linejoin='{_LINEJOIN.get(it.get('lj'), 'miter')}'{dash}/>"
+                )
+        layers.append(out)
+    # Earlier items sit on top, so paint from the end of the list.
+    elements = [el for out in reversed(layers) for el in out]
+    return elements, paths
+
+
+# --------------------------
+#     LAYERS
+# --------------------------
+def _world(layer: Dict[str, Any], by_ind: Dict[int, Dict[str, Any]], frame: float, depth: int = 0) -> Matrix:
+    m, _ = transform(layer.get("ks", {}), frame)
+    parent = layer.get("parent")
+    if parent is not None and parent in by_ind and depth < 32:
+        m = mul(_world(by_ind[parent], by_ind, frame, depth + 1), m)
+    return m
+
+
+def _mask(layer: Dict[str, Any], m: Matrix, frame: float, ctx: _Ctx, size: Tuple[float, float]) -> Optional[str]:
+    masks = [mk for mk in layer.get("masksProperties", []) if mk.get("mode", "a") != "n"]
+    if not layer.get("hasMask") or not masks:
+        return None
+    mid = ctx.new_id("m")
+    big = f"<rect x='-{_num(size[0] * 4)}' y='-{_num(size[1] * 4)}' width='{_num(size[0] * 9)}' height='{_num(size[1] * 9)}'"
+    body = [big + " fill='white'/>"] if masks[0].get("mode") == "s" or masks[0].get("inv") else []
+    for mk in masks:
+        shape = value(mk.get("pt"), frame, {})
+        if not isinstance(shape, dict):
+            continue
+        op = _scalar(mk.get("o"), frame, 100.0) / 100.0
+        colour = "black" if (mk.get("mode") == "s") != bool(mk.get("inv")) else "white"
+        body.append(f"<path d='{path_d(shape, m)}' fill='{colour}' fill-opacity='{_num(op)}'/>")
+    ctx.defs.append(f"<mask id='{mid}' maskUnits='userSpaceOnUse'>{''.join(body)}</mask>")
+    return mid
+
+
+def _render_layer(layer: Dict[str, Any], by_ind: Dict[int, Dict[str, Any]], frame: float,
+                  parent_m: Matrix, ctx: _Ctx, size: Tuple[float, float]) -> str:
+    ty = layer.get("ty")
+    if ty not in (0, 1, 4) or layer.get("hd"):
+        return ""
+    if not layer.get("ip", -1e9) <= frame < layer.get("op", 1e9):
+        return ""
+    m = mul(parent_m, _world(layer, by_ind, frame))
+    _, opacity = transform(layer.get("ks", {}), frame)
+    if opacity <= 0.001:
+        return ""
+
+    if ty == 4:
+        body = "".join(_render_items(layer.get("shapes", []), frame, m, 1.0)[0])
+    elif ty == 1:
+        w, h = float(layer.get("sw", 0)), float(layer.get("sh", 0))
+        rect = {"c": True, "v": [[0, 0], [w, 0], [w, h], [0, h]], "i": [[0, 0]] * 4, "o": [[0, 0]] * 4}
+        body = f"<path d='{path_d(rect, m)}' fill='{layer.get('sc', '#000000')}'/>"
+    else:
+        comp = ctx.comps.get(layer.get("refId", ""))
+        if comp is None:
+            return ""
+        local = (frame - layer.get("st", 0.0)) / (layer.get("sr", 1.0) or 1.0)
+        if "tm" in layer:
+            local = _scalar(layer["tm"], frame, 0.0) * ctx.fr  # time remap is in seconds
+        w, h = float(layer.get("w", size[0])), float(layer.get("h", size[1]))
+        body = _render_layers(comp.get("layers", []), local, m, ctx, (w, h))
+        cid = ctx.new_id("c")
+        clip = {"c": True, "v": [[0, 0], [w, 0], [w, h], [0, h]], "i": [[0, 0]] * 4, "o": [[0, 0]] * 4}
+        ctx.defs.append(f"<clipPath id='{cid}'><path d='{path_d(clip, m)}'/></clipPath>")
+        body = f"<g clip-path='url(#{cid})'>{body}</g>"
+    if not body:
+        return ""
+
+    mid = _mask(layer, m, frame, ctx, size)
+    attrs = ""
+    if opacity < 0.999:
+        attrs += f" opacity='{_num(opacity)}'"
+    if mid:
+        attrs += f" mask='url(#{mid})'"
+    return f"<g{attrs}>{body}</g>" if attrs else body
+
+
+# Track matte modes -> colour matrix applied to the matte inside an SVG luminance mask.
+_MATTE_FILTERS = {
+    1: "0 0 0 0 1  0 0 0 0 1  0 0 0 0 1  0 0 0 1 0",           # alpha: opaque -> white
+    2: "0 0 0 0 0  0 0 0 0 0  0 0 0 0 0  0 0 0 1 0",           # alpha inverted: opaque -> black on white
+    3: None,                                                    # luma: use as-is
+    4: "-1 0 0 0 1  0 -1 0 0 1  0 0 -1 0 1  0 0 0 1 0",        # luma inverted
+}
+
+
+def _render_layers(layers: List[Dict[str, Any]], frame: float, m: Matrix, ctx: _Ctx,
+                   size: Tuple[float, float]) -> str:
+    by_ind = {l["ind"]: l for l in layers if "ind" in l}
+    out: List[str] = []
+    for n, layer in enumerate(layers):
+        if layer.get("td"):
+            continue  # matte source: only drawn through the layer below it
+        svg = _render_layer(layer, by_ind, frame, m, ctx, size)
+        mode = layer.get("tt")
+        if svg and mode and n > 0 and layers[n - 1].get("td"):
+            matte_src = layers[n - 1]
+            src = _render_layer(dict(matte_src, td=0), by_ind, frame, m, ctx, size)
+            mid = ctx.new_id("t")
+            inner = src
+            matrix = _MATTE_FILTERS.get(mode)
+            if matrix:
+                fid = ctx.new_id("f")
+                ctx.defs.append(f"<filter id='{fid}'><feColorMatrix type='matrix' values='{matrix}'/></filter>")
+                inner = f"<g filter='url(#{fid})'>{src}</g>"
+            base = ""
+            if mode in (2, 4):
+                base = (f"<rect x='-{_num(size[0] * 4)}' y='-{_num(size[1] * 4)}' "
+                        f"width='{_num(size[0] * 9)}' height='{_num(size[1] * 9)}' fill='white'/>")
+            ctx.defs.append(f"<mask id='{mid}' maskUnits='userSpaceOnUse'>{base}{inner}</mask>")
+            svg = f"<g mask='url(#{mid})'>{svg}</g>"
+        out.append(svg)
+    # layers[0] is the top-most layer.
+    return "".join(reversed(out))
+
+
+# --------------------------
+#     PUBLIC API
+# --------------------------
+def render_svg(anim: Dict[str, Any], frame: Optional[float] = None) -> str:
+    """Render `frame` (default: the midpoint of ip..op) of a parsed Lottie document to SVG markup."""
+    w, h = float(anim.get("w", 512)), float(anim.get("h", 512))
+    ip, op = float(anim.get("ip", 0)), float(anim.get("op", 0))
+    if frame is None:
+        frame = ip + (op - ip) / 2
+    comps = {a["id"]: a for a in anim.get("assets", []) if "layers" in a}
+    ctx = _Ctx(comps, float(anim.get("fr", 30)))
+    body = _render_layers(anim.get("layers", []), float(frame), IDENTITY, ctx, (w, h))
+    defs = f"<defs>{''.join(ctx.defs)}</defs>" if ctx.defs else ""
+    return (f"<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 {_num(w)} {_num(h)}' "
+            f"preserveAspectRatio='xMidYMid meet' width='100%' height='100%'>{defs}{body}</svg>")
+
+
+def file_hash(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=32)
+def _poster_for_hash(digest: str, path: str, frame: Optional[float]) -> str:
+    import json
+    from portfolio.diskcache import code_version, get_or_build
+
+    def build() -> str:
+        with open(path, "r", encoding="utf-8") as f:
+            return render_svg(json.load(f), frame)
+    return get_or_build("lottie-poster", (digest, repr(frame), code_version(__file__)), build)
+
+
+def poster_svg(path: str, frame: Optional[float] = None) -> str:
+    """Poster for a Lottie file; cached per content hash, so an edited file re-renders."""
+    return _poster_for_hash(file_hash(path), path, frame)
+
+
+def iter_frames(anim: Dict[str, Any], step: int = 1) -> Iterator[Tuple[int, str]]:
+    """(frame, svg) for every `step`-th frame; handy for eyeballing the evaluator."""
+    for f in range(int(anim.get("ip", 0)), int(anim.get("op", 0)), step):
+        yield f, render_svg(anim, f)
+
+
+if __name__ == "__main__":
+    # python -m portfolio.lottie_poster "Tennis Ball.json" [frame] > poster.svg
+    import sys
+    print(poster_svg(sys.argv[1], float(sys.argv[2]) if len(sys.argv) > 2 else None))
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Conservative minifier for the embedded apps (apps/*.html plus the injected
+card CSS/JS).
+
+    HTML  comments dropped, whitespace runs collapsed to one space;
+          <pre>, <textarea> and non-JavaScript <script> types (JSON,
+          text/babel, ...) are left exactly as written
+    CSS   comments dropped, whitespace collapsed, spaces around { } ; , and
+          after : removed, the last ; before } dropped; strings untouched
+    JS    comments dropped, indentation and blank lines removed, spaces
+          next to { } ( ) [ ] ; , : = ? removed; line breaks are kept so
+          automatic semicolon insertion behaves as before, and string,
+          template and regex literals are copied verbatim
+
+`validate()` checks a minified document against its source: same element
+sequence and text, and every inline script must compile in Node (when
+`node` is on PATH). It never renames or reorders anything, so a failure
+means a tokenizer bug, and callers fall back to the source.
+
+    python -m portfolio.minify apps/tennis_tracker.html [--check]
+"""
+import json
+import re
+import shutil
+import subprocess
+import sys
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+
+JS_TYPES = ("", "text/javascript", "application/javascript", "module")
+_JS_TIGHT = set("{}()[];,:=?")
+_REGEX_AFTER = set("(,=:[!&|?{};+-*%<>~^")
+_WORD_RE = re.compile(r"[A-Za-z0-9_$.]+")
+_REGEX_KEYWORDS = {"return", "typeof", "instanceof", "in", "of", "new", "delete", "void", "throw",
+                   "case", "do", "else", "yield", "await"}
+
+
+class MinifyError(ValueError):
+    """A minified document does not match its source."""
+
+
+# --------------------------
+#     CSS
+# --------------------------
+def minify_css(css: str) -> str:
+    out: List[str] = []
+    i, n = 0, len(css)
+    while i < n:
+        c = css[i]
+        if c in "\"'":
+            j = _string_end(css, i)
+            out.append(css[i:j])
+            i = j
+        elif css.startswith("/*", i):
+            end = css.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+        elif c.isspace():
+            while i < n and css[i].isspace():
+                i += 1
+            prev = out[-1][-1:] if out else ""
+            nxt = css[i:i + 1]
+            if prev and nxt and prev not in "{};,:>" and nxt not in "{};,>":
+                out.append(" ")
+        else:
+            if c == "}" and out and out[-1] == ";":
+                out.pop()
+            out.append(c)
+            i += 1
+    return "".join(out).strip()
+
+
+def _string_end(s: str, i: int) -> int:
+    """Index just past the quoted string starting at s[i]."""
+    q, j = s[i], i + 1
+    while j < len(s):
+        if s[j] == "\\":
+            j += 2
+            continue
+        if s[j] == q or s[j] == "\n":
+            return j + 1
+        j += 1
+    return len(s)
+
+
+# --------------------------
+#     JAVASCRIPT
+# --------------------------
+def _js_tokens(js: str) -> List[Tuple[str, str]]:
+    """(kind, text) with kind in code / space / newline / literal; comments are dropped."""
+    toks: List[Tuple[str, str]] = []
+    braces: List[str] = []          # "{" for blocks, "${" for template substitutions
+    i, n = 0, len(js)
+    last = ""                       # last significant code text, for regex-vs-division
+
+    def regex_allowed() -> bool:
+        if not last:
+            return True
+        if last[-1] in _REGEX_AFTER:
+            return True
+        word = re.search(r"[A-Za-z_$][\w$]*$", last)
+        return bool(word and word.group(0) in _REGEX_KEYWORDS and len(word.group(0)) == len(last))
+
+    def template(i: int) -> int:
+        """Scan template text from i (just after ` or }) to its end or next ${; returns new index."""
+        j = i
+        while j < n:
+            if js[j] == "\\":
+                j += 2
+            elif js[j] == "`":
+                toks.append(("literal", js[i:j + 1]))
+                return j + 1
+            elif js.startswith("${", j):
+                toks.append(("literal", js[i:j + 2]))
+                braces.append("${")
+                return j + 2
+            else:
+                j += 1
+        raise MinifyError("unterminated template literal")
+
+    while i < n:
+        c = js[i]
+        if c in "\"'":
+            j = _string_end(js, i)
+            toks.append(("literal", js[i:j]))
+            last, i = js[i:j], j
+        elif c == "`":
+            toks.append(("literal", "`"))
+            i = template(i + 1)
+            last = "`"
+        elif js.startswith("//", i):
+            end = js.find("\n", i)
+            i = n if end < 0 else end
+        elif js.startswith("/*", i):
+            end = js.find("*/", i + 2)
+            if end < 0:
+                raise MinifyError("unterminated block comment")
+            if "\n" in js[i:end]:
+                toks.append(("newline", "\n"))
+            i = end + 2
+        elif c == "/" and regex_allowed():
+            j, in_class = i + 1, False
+            while j < n and js[j] != "\n":
+                if js[j] == "\\":
+                    j += 2
+                    continue
+                if js[j] == "[":
+                    in_class = True
+                elif js[j] == "]":
+                    in_class = False
+                elif js[j] == "/" and not in_class:
+                    break
+                j += 1
+            else:
+                raise MinifyError(f"unterminated regex at offset {i}")
+            j += 1
+            while j < n and (js[j].isalnum() or js[j] == "_"):
+                j += 1
+            toks.append(("literal", js[i:j]))
+            last, i = js[i:j], j
+        elif c == "\n":
+            toks.append(("newline", "\n"))
+            i += 1
+        elif c.isspace():
+            while i < n and js[i].isspace() and js[i] != "\n":
+                i += 1
+            toks.append(("space", " "))
+        elif c == "}" and braces and braces[-1] == "${":
+            braces.pop()
+            toks.append(("literal", "}"))
+            i = template(i + 1)
+            last = "`"
+        else:
+            if c == "{":
+                braces.append("{")
+            elif c == "}" and braces:
+                braces.pop()
+            m = _WORD_RE.match(js, i)
+            text = m.group(0) if m else c
+            toks.append(("code", text))
+            last, i = text, i + len(text)
+    return toks
+
+
+def minify_js(js: str) -> str:
+    out: List[str] = []
+    pending = ""                    # whitespace waiting to see what follows it
+    for kind, text in _js_tokens(js):
+        if kind == "newline":
+            pending = "\n"
+            continue
+        if kind == "space":
+            if pending != "\n":
+                pending = " "
+            continue
+        if pending and out:
+            prev = out[-1][-1]
+            if pending == "\n":
+                out.append("\n")
+            elif prev not in _JS_TIGHT and text[0] not in _JS_TIGHT:
+                out.append(" ")
+        pending = ""
+        out.append(text)
+    return "".join(out).strip()
+
+
+# --------------------------
+#     HTML
+# --------------------------
+_RAW_TAGS = ("pre", "textarea", "script", "style")
+_TAG_RE = re.compile(r"<!--.*?-->|<(/?)([A-Za-z][\w-]*)((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>|<!(?:[^>])*>", re.S)
+
+
+def _collapse_tag(tag: str) -> str:
+    # Whitespace between attributes only; quoted values are kept as written.
+    parts = re.split(r"(\"[^\"]*\"|'[^']*')", tag)
+    return "".join(p if i % 2 else re.sub(r"\s+", " ", p) for i, p in enumerate(parts)).replace(" >", ">")
+
+
+def _script_type(attrs: str) -> str:
+    m = re.search(r"\btype\s*=\s*[\"']?([^\"'\s>]+)", attrs, re.I)
+    return m.group(1).lower() if m else ""
+
+
+def minify_html(html: str) -> str:
+    out: List[str] = []
+    pos = 0
+
+    def text(chunk: str) -> None:
+        if chunk:
+            out.append(re.sub(r"\s+", " ", chunk))
+
+    while True:
+        m = _TAG_RE.search(html, pos)
+        if not m:
+            text(html[pos:])
+            break
+        text(html[pos:m.start()])
+        token = m.group(0)
+        pos = m.end()
+        if token.startswith("<!--"):
+            if token.startswith("<!--[if"):
+                out.append(token)
+            continue
+        closing, name = m.group(1), (m.group(2) or "").lower()
+        out.append(_collapse_tag(token))
+        if closing or name not in _RAW_TAGS:
+            continue
+        end = re.compile(rf"</{name}\s*>", re.I).search(html, pos)
+        body_end = end.start() if end else len(html)
+        body = html[pos:body_end]
+        if name == "style":
+            body = minify_css(body)
+        elif name == "script" and _script_type(m.group(3)) in JS_TYPES and body.strip():
+            body = minify_js(body)
+        out.append(body)
+        if end:
+            out.append(f"</{name}>")
+        pos = end.end() if end else len(html)
+    return "".join(out).strip()
+
+
+# --------------------------
+#     VALIDATION
+# --------------------------
+class _Outline(HTMLParser):
+    """Element sequence, attributes and whitespace-normalised text; script bodies kept apart."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.items: List[Tuple] = []
+        self.scripts: List[Tuple[str, str]] = []
+        self._raw: Optional[Tuple[str, str]] = None
+
+    def handle_starttag(self, tag, attrs):
+        self.items.append(("start", tag, tuple(attrs)))
+        if tag in ("script", "style"):
+            self._raw = (tag, dict(attrs).get("type") or "")
+
+    def handle_endtag(self, tag):
+        self.items.append(("end", tag))
+        self._raw = None
+
+    def handle_data(self, data):
+        if self._raw and self._raw[0] == "script":
+            self.scripts.append((self._raw[1].lower(), data))
+        elif self._raw is None:
+            t = " ".join(data.split())
+            if t:
+                self.items.append(("text", t))
+
+
+def _outline(html: str) -> _Outline:
+    p = _Outline()
+    p.feed(html)
+    p.close()
+    return p
+
+
+def _css_tokens(css: str) -> List[str]:
+    return re.findall(r"\"[^\"]*\"|'[^']*'|[^\s{};,:]+|[{};,:]", re.sub(r"/\*.*?\*/", "", css, flags=re.S))
+
+
+_NODE_CHECK = """
+const vm = require('vm'); const bad = [];
+JSON.parse(require('fs').readFileSync(0, 'utf8')).forEach((src, i) => {
+  try { new vm.Script(src); } catch (e) { bad.push(i + ': ' + e.message); }
+});
+process.stdout.write(JSON.stringify(bad));
+"""
+
+
+def node_compile_errors(scripts: List[str]) -> Optional[List[str]]:
+    """Compile each script in Node without running it; None when node is unavailable."""
+    node = shutil.which("node")
+    if not node or not scripts:
+        return None if not node else []
+    res = subprocess.run([node, "-e", _NODE_CHECK], input=json.dumps(scripts), capture_output=True,
+                         text=True, timeout=60)
+    if res.returncode != 0:
+        return [res.stderr.strip() or "node failed"]
+    return json.loads(res.stdout or "[]")
+
+
+def validate(source: str, minified: str, compile_scripts: bool = True) -> List[str]:
+    """Problems found comparing `minified` with `source` (empty list = equivalent)."""
+    a, b = _outline(source), _outline(minified)
+    problems: List[str] = []
+    if [i for i in a.items if i[0] != "text"] != [i for i in b.items if i[0] != "text"]:
+        problems.append("element sequence changed")
+    if " ".join(i[1] for i in a.items if i[0] == "text") != " ".join(i[1] for i in b.items if i[0] == "text"):
+        problems.append("text content changed")
+    if len(a.scripts) != len(b.scripts):
+        problems.append("script count changed")
+    js = []
+    for (kind, src), (_, out) in zip(a.scripts, b.scripts):
+        if kind not in JS_TYPES:
+            if src != out:
+                problems.append(f"{kind} script changed")
+            continue
+        if _sig(src) != _sig(out):
+            problems.append("script tokens changed")
+        js.append(out)
+    css_a = re.findall(r"<style[^>]*>(.*?)</style>", source, re.S | re.I)
+    css_b = re.findall(r"<style[^>]*>(.*?)</style>", minified, re.S | re.I)
+    if [_css_shape(c) for c in css_a] != [_css_shape(c) for c in css_b]:
+        problems.append("stylesheet rules changed")
+    if compile_scripts:
+        errors = node_compile_errors(js)
+        problems += [f"script {e}" for e in errors or []]
+    return problems
+
+
+def _sig(js: str) -> List[str]:
+    return [t for k, t in _js_tokens(js) if k in ("code", "literal")]
+
+
+def _css_shape(css: str) -> List[str]:
+    toks = _css_tokens(css)
+    # "a;}" and "a}" are the same rule.
+    return [t for i, t in enumerate(toks) if not (t == ";" and i + 1 < len(toks) and toks[i + 1] == "}")]
+
+
+def minify_checked(html: str, compile_scripts: bool = True) -> str:
+    """Minified HTML, or MinifyError if it does not validate against the source."""
+    out = minify_html(html)
+    problems = validate(html, out, compile_scripts)
+    if problems:
+        raise MinifyError("; ".join(problems))
+    return out
+
+
+if __name__ == "__main__":
+    # python -m portfolio.minify apps/x.html [--check] — print sizes, or the minified document
+    paths = [a for a in sys.argv[1:] if not a.startswith("--")]
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            src = f.read()
+        out = minify_html(src)
+        if "--check" in sys.argv:
+            problems = validate(src, out)
+            status = "ok" if not problems else "; ".join(problems)
+            print(f"{path}: {len(src.encode()):,} -> {len(out.encode()):,} B  {status}")
+        else:
+            sys.stdout.write(out)
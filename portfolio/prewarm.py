@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Cache prewarming at server start.
+
+Everything the pages build lazily (content model and compiled fragments,
+search widget, Lottie catalog, deduplicated Lottie text and poster frames,
+injected app documents, and the modules Streamlit imports on a first run) is filled on a background thread pool as soon as
+the server process starts, so the first visitor after a restart gets the
+same cached path as every later one.
+
+    python -m portfolio.prewarm Home.py [streamlit args]   # warm, then serve
+
+Pages also call `ensure_started()`, so a plain `streamlit run` warms on the
+first script run instead. A thread pool (not a process pool) is deliberate:
+the caches are per-process lru_caches, and work done in another
+interpreter would not land in them.
+
+Progress goes to Streamlit's logger (so `--logger.level` applies): one
+INFO line when everything is warm, a WARNING per failed task, and per-task
+timings at DEBUG. `status()` / `report_lines()` give the same on demand.
+"""
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from streamlit.logger import get_logger
+
+_LOGGER = get_logger(__name__)
+ENV_WORKERS = "PORTFOLIO_PREWARM_WORKERS"
+
+
+@dataclass
+class Task:
+    name: str
+    fn: Callable[[], object]
+    state: str = "pending"   # pending | running | done | failed
+    seconds: float = 0.0
+    error: str = ""
+
+
+# --------------------------
+#     TASKS
+# --------------------------
+# Imported lazily by Streamlit on a page's first run (page_icon validation,
+# components) or by the pages themselves; pulled in here so no visitor pays for them.
+WARM_IMPORTS = (
+    "streamlit.emojis",
+    "streamlit.components.v1",
+    "portfolio.embed",
+    "portfolio.hero",
+    "portfolio.search",
+    "portfolio.templates",
+)
+
+
+def _warm_imports() -> None:
+    import importlib
+    for name in WARM_IMPORTS:
+        importlib.import_module(name)
+
+
+def _warm_site() -> None:
+    from portfolio.templates import compile_site
+    compile_site()
+
+
+def _warm_search() -> None:
+    from portfolio.search import search_widget_html
+    search_widget_html()
+
+
+def _warm_fonts() -> None:
+    from portfolio.fonts import current_subsets
+    current_subsets()
+
+
+def _warm_lottie(path: str) -> Callable[[], None]:
+    def run() -> None:
+        from portfolio.lottie_dedup import optimized_text
+        from portfolio.lottie_poster import poster_svg
+        optimized_text(path)
+        poster_svg(path)
+    return run
+
+
+def _warm_app(path: str) -> Callable[[], None]:
+    def run() -> None:
+        from portfolio.embed import embedded_app_html
+        embedded_app_html(path)
+    return run
+
+
+def default_tasks() -> List[Task]:
+    """Catalog reads happen here (cheap); the expensive builds become tasks."""
+    from portfolio.content import load_content
+    from portfolio.embed import app_path
+    from portfolio.lottie_meta import catalog
+
+    # Slowest first, so the pool's makespan is set by the poster frames, not queued behind them.
+    tasks = [Task(f"lottie:{m.name}", _warm_lottie(m.path)) for m in sorted(catalog(), key=lambda m: -m.layers)]
+    tasks += [Task("imports", _warm_imports), Task("site", _warm_site), Task("search", _warm_search),
+              Task("fonts", _warm_fonts)]
+    tasks += [Task(f"app:{a.path}", _warm_app(app_path(a.path)))
+              for a in load_content().playground_apps if not a.path.startswith("http")]
+    return tasks
+
+
+# --------------------------
+#     RUNNER
+# --------------------------
+class Prewarm:
+    def __init__(self, plan: Callable[[], List[Task]], workers: Optional[int] = None, log: bool = True):
+        self.plan = plan
+        self.tasks: List[Task] = []
+        self.workers = workers or int(os.environ.get(ENV_WORKERS, "0")) or min(4, os.cpu_count() or 1)
+        self.log = log
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._remaining = 0
+
+    def start(self) -> "Prewarm":
+        """Returns at once; even listing the tasks happens off the calling thread."""
+        self.started_at = time.perf_counter()
+        threading.Thread(target=self._submit, name="prewarm-plan", daemon=True).start()
+        return self
+
+    def _submit(self) -> None:
+        try:
+            tasks = self.plan()
+        except Exception as e:
+            _LOGGER.warning("could not list prewarm tasks: %s", e)
+            tasks = []
+        if not tasks:
+            self._finish()
+            return
+        self.tasks, self._remaining = tasks, len(tasks)
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="prewarm")
+        for task in self.tasks:
+            pool.submit(self._run, task).add_done_callback(self._settle)
+        pool.shutdown(wait=False)
+
+    def _run(self, task: Task) -> None:
+        task.state = "running"
+        t0 = time.perf_counter()
+        try:
+            task.fn()
+            task.state = "done"
+        except Exception as e:  # a broken file must not stop the rest from warming
+            task.state, task.error = "failed", f"{type(e).__name__}: {e}"
+        task.seconds = time.perf_counter() - t0
+        if self.log and task.error:
+            _LOGGER.warning("prewarm %s failed after %.1f ms: %s", task.name, task.seconds * 1000, task.error)
+        elif self.log:
+            _LOGGER.debug("prewarm %s done in %.1f ms", task.name, task.seconds * 1000)
+
+    def _settle(self, _fut: Future) -> None:
+        with self._lock:
+            self._remaining -= 1
+            if self._remaining == 0:
+                self._finish()
+
+    def _finish(self) -> None:
+        self.finished_at = time.perf_counter()
+        if self.log:
+            work = sum(t.seconds for t in self.tasks)
+            failed = sum(t.state == "failed" for t in self.tasks)
+            _LOGGER.info("prewarm ready: %d tasks (%d failed) in %.0f ms, %.0f ms of work on %d threads",
+                         len(self.tasks), failed, self.elapsed() * 1000, work * 1000, self.workers)
+        self._done.set()
+
+    # --- readiness / progress ---
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def progress(self) -> Tuple[int, int]:
+        return sum(t.state in ("done", "failed") for t in self.tasks), len(self.tasks)
+
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def status(self) -> Dict[str, object]:
+        done, total = self.progress()
+        return {
+            "ready": self.ready(),
+            "done": done,
+            "total": total,
+            "elapsed_ms": round(self.elapsed() * 1000, 1),
+            "tasks": {t.name: {"state": t.state, "ms": round(t.seconds * 1000, 1), "error": t.error}
+                      for t in self.tasks},
+        }
+
+    def report_lines(self) -> List[str]:
+        done, total = self.progress()
+        head = f"prewarm {'ready' if self.ready() else 'running'} {done}/{total} ({self.elapsed() * 1000:.0f} ms)"
+        return [head] + [f"  {t.name:<32}{t.state:<8}{t.seconds * 1000:8.1f} ms" for t in self.tasks]
+
+
+_current: Optional[Prewarm] = None
+_start_lock = threading.Lock()
+
+
+def ensure_started(log: bool = True) -> Prewarm:
+    """Start prewarming once per process and return the runner (safe to call on every rerun)."""
+    global _current
+    with _start_lock:
+        if _current is None:
+            _current = Prewarm(default_tasks, log=log).start()
+    return _current
+
+
+def current() -> Optional[Prewarm]:
+    return _current
+
+
+# --------------------------
+#     LAUNCHER
+# --------------------------
+def main(argv: List[str]) -> None:
+    """python -m portfolio.prewarm Home.py [streamlit args] — warm in the background, serve at once."""
+    ensure_started()
+    from streamlit.web import cli as stcli
+    sys.argv = ["streamlit", "run", *(argv or ["Home.py"])]
+    sys.exit(stcli.main())
+
+
+if __name__ == "__main__":
+    # Hand over to the importable module so the pages see the same runner.
+    from portfolio import prewarm
+    prewarm.main(sys.argv[1:])
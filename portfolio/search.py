@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Typeahead search over skills, projects and Playground apps.
+
+The index is built once per process from the content model: a prefix map
+(token prefix -> entry ids, up to MAX_PREFIX chars) for as-you-type
+matching, plus a trigram map for matches inside a word. It is serialized
+into a small self-contained widget (search_widget_html) whose JavaScript
+runs the same query algorithm as `SearchIndex.query`, so filtering happens
+in the browser with no Streamlit rerun per keystroke.
+"""
+import heapq
+import html
+import json
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Sequence, Set, Tuple
+
+from portfolio.content import CONTENT_PATH, Content, load_content
+from portfolio.deeplink import slug
+from portfolio.diskcache import code_version, get_or_build
+from portfolio.lottie_poster import file_hash
+
+MAX_PREFIX = 8
+_TOKEN_RE = re.compile(r"[a-z0-9#+]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents, and turn punctuation (but not # / +, for C# and F#) into spaces."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return " ".join(_TOKEN_RE.findall(text))
+
+
+def tokenize(text: str) -> List[str]:
+    return normalize(text).split()
+
+
+@dataclass(frozen=True)
+class Entry:
+    kind: str      # "Skill" | "Project" | "App"
+    title: str
+    detail: str
+    href: str = ""
+
+
+# --------------------------
+#     ENTRIES FROM CONTENT
+# --------------------------
+PLAYGROUND_URL = "/Playground"
+
+
+def app_href(title: str, path: str) -> str:
+    """External apps link out; local ones deep-link the Playground to that app (portfolio.deeplink)."""
+    return path if path.startswith("http") else f"{PLAYGROUND_URL}?app={slug(title)}"
+
+
+def entries_from_content(c: Content) -> List[Entry]:
+    out: List[Entry] = []
+    for group, skills in c.skill_groups:
+        out += [Entry("Skill", s.raw, group) for s in skills]
+    for p in c.projects:
+        out.append(Entry("Project", p.title.raw, p.body, p.link_url.raw if p.link_url else ""))
+    for p in c.card_projects:
+        out.append(Entry("Project", p.title.raw, f"{p.desc.raw} · {', '.join(t.raw for t in p.tags)}"))
+    for a in c.playground_apps:
+        out.append(Entry("App", a.title.raw, a.desc.raw, app_href(a.title.raw, a.path)))
+    return out
+
+
+# --------------------------
+#     INDEX
+# --------------------------
+class SearchIndex:
+    def __init__(self, entries: Sequence[Entry]):
+        self.entries: Tuple[Entry, ...] = tuple(entries)
+        self.titles: List[str] = []
+        self.texts: List[str] = []
+        self.prefix: Dict[str, List[int]] = {}
+        self.trigrams: Dict[str, List[int]] = {}
+        for i, e in enumerate(self.entries):
+            title = normalize(e.title)
+            text = f"{title} {normalize(e.kind)} {normalize(e.detail)}"
+            self.titles.append(" " + title)
+            self.texts.append(" " + text)
+            for tok in set(text.split()):
+                for n in range(1, min(len(tok), MAX_PREFIX) + 1):
+                    self._add(self.prefix, tok[:n], i)
+            for tri in {text[j:j + 3] for j in range(len(text) - 2)}:
+                if " " not in tri:
+                    self._add(self.trigrams, tri, i)
+
+    @staticmethod
+    def _add(table: Dict[str, List[int]], key: str, i: int) -> None:
+        ids = table.setdefault(key, [])
+        if not ids or ids[-1] != i:
+            ids.append(i)
+
+    def _term(self, term: str) -> Dict[int, int]:
+        """Candidate entry -> score for one query term (3 title prefix, 2 word prefix, 1 infix)."""
+        scores: Dict[int, int] = {}
+        needle = " " + term
+        for i in self.prefix.get(term[:MAX_PREFIX], ()):
+            if len(term) <= MAX_PREFIX or needle in self.texts[i]:
+                scores[i] = 3 if needle in self.titles[i] else 2
+        if len(term) >= 3:
+            cand: Set[int] = set(self.trigrams.get(term[:3], ()))
+            for j in range(1, len(term) - 2):
+                if not cand:
+                    break
+                cand.intersection_update(self.trigrams.get(term[j:j + 3], ()))
+            for i in cand:
+                if i not in scores and term in self.texts[i]:
+                    scores[i] = 1
+        return scores
+
+    def query(self, q: str, limit: int = 20) -> List[Entry]:
+        terms = tokenize(q)
+        if not terms:
+            return []
+        total: Dict[int, int] = {}
+        for n, term in enumerate(terms):
+            scores = self._term(term)
+            if n == 0:
+                total = scores
+            else:
+                total = {i: s + scores[i] for i, s in total.items() if i in scores}
+            if not total:
+                return []
+        ranked = heapq.nsmallest(limit, total, key=lambda i: (-total[i], len(self.entries[i].title), i))
+        return [self.entries[i] for i in ranked]
+
+    def to_json(self) -> str:
+        """Compact payload for the browser widget."""
+        return json.dumps({
+            "maxPrefix": MAX_PREFIX,
+            "entries": [[e.kind, e.title, e.detail, e.href] for e in self.entries],
+            "titles": self.titles,
+            "texts": self.texts,
+            "prefix": self.prefix,
+            "tri": self.trigrams,
+        }, ensure_ascii=False, separators=(",", ":"))
+
+
+@lru_cache(maxsize=None)
+def site_index() -> SearchIndex:
+    return SearchIndex(entries_from_content(load_content()))
+
+
+# --------------------------
+#     BROWSER WIDGET
+# --------------------------
+_WIDGET = """<!doctype html><html><head><meta charset="utf-8"><style>
+  body { margin: 0; font-family: 'Inter', sans-serif; background: transparent; color: #EAF2FF; }
+  #q { width: 100%; box-sizing: border-box; padding: 10px 14px; border-radius: 14px; font-size: 15px;
+       background: rgba(0,0,0,0.45); color: #fff; border: 1px solid rgba(255,255,255,0.28); outline: none; }
+  #q:focus { border-color: #FFD700; box-shadow: 0 0 0 3px rgba(255,215,0,0.25); }
+  #r { list-style: none; margin: 6px 0 0; padding: 0; max-height: __LIST_H__px; overflow-y: auto; }
+  #r li { padding: 6px 10px; border-radius: 10px; display: flex; gap: 8px; align-items: baseline; }
+  #r li:hover { background: rgba(255,255,255,0.08); }
+  .k { font-size: 11px; text-transform: uppercase; letter-spacing: .08em; color: #00FF7F; min-width: 52px; }
+  .t { font-weight: 600; }
+  .d { font-size: 12px; color: #CFE2FF; opacity: .85; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
+  a { color: inherit; text-decoration: none; }
+  #n { font-size: 11px; color: #CFE2FF; margin: 4px 2px 0; min-height: 14px; }
+</style></head><body>
+<input id="q" type="search" placeholder="__PLACEHOLDER__" autocomplete="off" aria-label="Search">
+<div id="n"></div><ul id="r"></ul>
+<script>
+const IDX = __INDEX__;
+const TOKEN = /[a-z0-9#+]+/g;
+const get = (table, key) => Object.prototype.hasOwnProperty.call(table, key) ? table[key] : [];
+function norm(s){ return (s.normalize('NFKD').replace(/[\\u0300-\\u036f]/g,'').toLowerCase().match(TOKEN) || []); }
+function term(t){
+  const scores = new Map(), needle = ' ' + t;
+  for (const i of get(IDX.prefix, t.slice(0, IDX.maxPrefix))) {
+    if (t.length <= IDX.maxPrefix || IDX.texts[i].includes(needle))
+      scores.set(i, IDX.titles[i].includes(needle) ? 3 : 2);
+  }
+  if (t.length >= 3) {
+    let cand = new Set(get(IDX.tri, t.slice(0,3)));
+    for (let j = 1; j < t.length - 2 && cand.size; j++) {
+      const next = new Set(get(IDX.tri, t.slice(j, j+3)));
+      cand = new Set([...cand].filter(i => next.has(i)));
+    }
+    for (const i of cand) if (!scores.has(i) && IDX.texts[i].includes(t)) scores.set(i, 1);
+  }
+  return scores;
+}
+function query(q, limit){
+  const terms = norm(q); if (!terms.length) return [];
+  let total = null;
+  for (const t of terms) {
+    const s = term(t);
+    if (total === null) total = s;
+    else { const m = new Map(); for (const [i,v] of total) if (s.has(i)) m.set(i, v + s.get(i)); total = m; }
+    if (!total.size) return [];
+  }
+  return [...total.keys()].sort((a,b) => (total.get(b)-total.get(a)) ||
+    (IDX.entries[a][1].length - IDX.entries[b][1].length) || (a-b)).slice(0, limit);
+}
+const esc = s => s.replace(/[&<>"']/g, c => ({'&':'&amp;','<':'&lt;','>':'&gt;','"':'&quot;',"'":'&#39;'}[c]));
+const q = document.getElementById('q'), r = document.getElementById('r'), n = document.getElementById('n');
+function show(){
+  const ids = query(q.value, 25);
+  n.textContent = q.value.trim() ? (ids.length ? ids.length + ' match' + (ids.length>1?'es':'') : 'No matches') : '';
+  r.innerHTML = ids.map(i => {
+    const [k, t, d, h] = IDX.entries[i];
+    const title = h ? `<a href="${esc(h)}" target="_top" class="t">${esc(t)}</a>` : `<span class="t">${esc(t)}</span>`;
+    return `<li><span class="k">${esc(k)}</span><span>${title}<div class="d">${esc(d)}</div></span></li>`;
+  }).join('');
+}
+q.addEventListener('input', show);
+</script></body></html>"""
+
+
+@lru_cache(maxsize=None)
+def search_widget_html(placeholder: str = "Search skills, projects and apps…", list_height: int = 220) -> str:
+    """Self-contained HTML for the search box, with the index embedded (built once per process)."""
+    def build() -> str:
+        payload = site_index().to_json().replace("</", "<\\/")
+        return (_WIDGET
+                .replace("__INDEX__", payload)
+                .replace("__PLACEHOLDER__", html.escape(placeholder, quote=True))
+                .replace("__LIST_H__", str(list_height)))
+    parts = (file_hash(CONTENT_PATH), placeholder, str(list_height), code_version(__file__))
+    return get_or_build("search-widget", parts, build)
+
+
+def render_search(height: int = 300) -> None:
+    """Drop the typeahead box into the current Streamlit container."""
+    import streamlit.components.v1 as components
+    components.html(search_widget_html(list_height=height - 80), height=height, scrolling=False)
+
+
+if __name__ == "__main__":
+    import sys
+    idx = site_index()
+    for e in idx.query(" ".join(sys.argv[1:]) or "py"):
+        print(f"{e.kind:<8}{e.title}")
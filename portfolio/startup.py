@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Cold-start profiling.
+
+Set PORTFOLIO_PROFILE=1 (or launch with `python -m portfolio.startup Home.py`)
+to record how long every module import takes and when the page emits its
+first element. The report goes to stderr once per page per process and into
+a sidebar expander on the page itself. With the variable unset every hook
+here is a no-op, so the pages can call them unconditionally.
+"""
+import importlib.abc
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+ENV_FLAG = "PORTFOLIO_PROFILE"
+
+# Best available "process started" timestamp; refined by the launcher below.
+_T0 = time.perf_counter()
+
+
+def enabled() -> bool:
+    return os.environ.get(ENV_FLAG, "").strip().lower() not in ("", "0", "false", "no")
+
+
+# --------------------------
+#     IMPORT TIMING
+# --------------------------
+class _TimedLoader(importlib.abc.Loader):
+    """Wraps a real loader and times exec_module (cumulative and self time)."""
+
+    def __init__(self, profiler: "ImportProfiler", loader: importlib.abc.Loader):
+        self._profiler = profiler
+        self._loader = loader
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler._enter()
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._leave(module.__name__, time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        # get_code / get_source / is_package etc. still reach the real loader.
+        return getattr(self._loader, name)
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    """Meta-path hook that delegates finding to the other finders and times loading."""
+
+    def __init__(self):
+        self.timings: Dict[str, Tuple[float, float]] = {}  # name -> (cumulative, self)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimedLoader(self, spec.loader)
+                    return spec
+            return None
+        finally:
+            self._local.finding = False
+
+    def _enter(self):
+        stack: List[float] = self._local.__dict__.setdefault("children", [])
+        stack.append(0.0)
+
+    def _leave(self, name: str, elapsed: float):
+        stack: List[float] = self._local.children
+        child_time = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        with self._lock:
+            self.timings[name] = (elapsed, elapsed - child_time)
+
+    def top(self, n: int = 25) -> List[Tuple[str, float, float]]:
+        """Slowest imports by cumulative time: (module, cumulative_s, self_s)."""
+        with self._lock:
+            items = [(k, c, s) for k, (c, s) in self.timings.items()]
+        return sorted(items, key=lambda t: t[1], reverse=True)[:n]
+
+
+_profiler: Optional[ImportProfiler] = None
+_marks: Dict[str, float] = {}
+_reported_runs: set = set()
+
+
+def install() -> ImportProfiler:
+    """Install the import hook (idempotent)."""
+    global _profiler
+    if _profiler is None:
+        _profiler = ImportProfiler()
+        sys.meta_path.insert(0, _profiler)
+    return _profiler
+
+
+def enable_from_env() -> None:
+    """Call at the very top of a page: installs the hook if profiling is on."""
+    if enabled():
+        install()
+        _marks.setdefault("script_start", time.perf_counter() - _T0)
+
+
+# --------------------------
+#     MILESTONES
+# --------------------------
+def mark(name: str) -> None:
+    """Record a milestone (seconds since process start); first call per name wins."""
+    if enabled():
+        _marks.setdefault(name, time.perf_counter() - _T0)
+
+
+def mark_first_render() -> None:
+    mark("first_element")
+
+
+def report_lines(n: int = 25) -> List[str]:
+    lines = [f"{name:<24}{secs * 1000:9.1f} ms" for name, secs in sorted(_marks.items(), key=lambda kv: kv[1])]
+    if _profiler is not None:
+        lines.append(f"{'module':<48}{'cumulative':>12}{'self':>10}")
+        lines += [f"{mod:<48}{c * 1000:9.1f} ms{s * 1000:7.1f} ms" for mod, c, s in _profiler.top(n)]
+    return lines
+
+
+def show_report(page: str) -> None:
+    """Call at the end of a page: logs the report once and renders it in the sidebar."""
+    if not enabled():
+        return
+    mark(f"{page}_done")
+    lines = report_lines()
+    from portfolio import prewarm
+    if prewarm.current() is not None:
+        lines += prewarm.current().report_lines()
+    if page not in _reported_runs:
+        _reported_runs.add(page)
+        print(f"[startup] {page}\n" + "\n".join(lines), file=sys.stderr)
+    import streamlit as st
+    with st.sidebar.expander("⏱ Startup profile"):
+        st.code("\n".join(lines), language=None)
+
+
+# --------------------------
+#     LAUNCHER
+# --------------------------
+def main(argv: List[str]) -> None:
+    """python -m portfolio.startup Home.py [streamlit args] — profile a full cold start."""
+    os.environ[ENV_FLAG] = "1"
+    install()
+    mark("profiler_installed")
+    from streamlit.web import cli as stcli
+    mark("streamlit_imported")
+    sys.argv = ["streamlit", "run", *(argv or ["Home.py"])]
+    sys.exit(stcli.main())
+
+
+if __name__ == "__main__":
+    # Hand over to the importable module so the pages share this profiler instance.
+    from portfolio import startup
+    startup._T0 = _T0
+    startup.main(sys.argv[1:])
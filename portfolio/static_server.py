@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+Static server for the PWA hub (index.html, manifest, service worker, assets/,
+apps/, icons/).
+
+Every file is read once at startup, hashed for a strong ETag, and
+precompressed (gzip always, brotli when the optional `brotli` package is
+installed; variants already produced by `python -m portfolio.build` are
+reused). The apps under apps/ are served minified (portfolio.minify). Requests are answered from memory by an asyncio server, so a
+few thousand idle keep-alive connections cost only their sockets.
+
+With PORTFOLIO_TELEMETRY_PORT set, the hub page and the apps carry the
+portfolio.telemetry beacon (scopes "page:hub" and "app:<name>"), and the
+server starts the collector on that port unless another process owns it.
+
+serviceWorker.js is served stamped with the precache manifest that
+`python -m portfolio.build` writes to build/precache.json: its CACHE name
+gets the manifest version and PRECACHE the file list, so any change to a
+precached file's served bytes installs a new worker with a fresh cache.
+A missing or stale manifest is recomputed from the table (and logged).
+
+    python -m portfolio.static_server --port 8080
+
+Cache policy per path:
+    apps/apps.json, *.html, serviceWorker.js, manifest.json   no-cache (always revalidate)
+    everything else                                           public, max-age=3600, must-revalidate
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass
+from email.utils import formatdate
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import brotli  # optional: pip install brotli
+except ImportError:
+    brotli = None
+
+from portfolio import telemetry
+from portfolio.diskcache import code_version
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PUBLIC_FILES = ("index.html", "manifest.json", "serviceWorker.js", "favicon.ico")
+PUBLIC_DIRS = ("assets", "apps", "icons")
+PRECOMPRESSED_DIR = os.path.join(PROJECT_ROOT, "build", "precompressed")
+PRECACHE_FILE = os.path.join(PROJECT_ROOT, "build", "precache.json")
+# What serviceWorker.js precaches besides the app hrefs listed in apps/apps.json.
+SW_CORE = ("index.html", "assets/site.css", "assets/site.js", "manifest.json", "apps/apps.json")
+
+MIN_COMPRESS = 256
+COMPRESSIBLE = ("text/", "application/json", "application/javascript", "application/manifest+json",
+                "image/svg+xml", "image/x-icon", "image/vnd.microsoft.icon")
+MAX_HEADER_BYTES = 16 * 1024
+KEEP_ALIVE_S = 15.0
+
+REVALIDATE = "no-cache"
+SHORT = "public, max-age=3600, must-revalidate"
+
+mimetypes.add_type("application/manifest+json", ".webmanifest")
+mimetypes.add_type("text/javascript", ".js")
+
+
+def cache_control(url: str) -> str:
+    if url in ("/apps/apps.json", "/serviceWorker.js", "/manifest.json") or url.endswith(".html"):
+        return REVALIDATE
+    return SHORT
+
+
+def content_type(rel: str) -> str:
+    if rel == "manifest.json":
+        return "application/manifest+json"
+    ctype = mimetypes.guess_type(rel)[0] or "application/octet-stream"
+    return f"{ctype}; charset=utf-8" if ctype.startswith("text/") or ctype.endswith("json") else ctype
+
+
+# --------------------------
+#     ASSET TABLE
+# --------------------------
+@dataclass(frozen=True)
+class Variant:
+    body: bytes
+    etag: str
+    encoding: Optional[str]  # None = identity
+
+
+@dataclass(frozen=True)
+class Asset:
+    url: str
+    content_type: str
+    cache_control: str
+    last_modified: str
+    variants: Dict[str, Variant]  # "identity" / "gzip" / "br"
+
+    @property
+    def identity(self) -> Variant:
+        return self.variants["identity"]
+
+
+def _compressible(ctype: str) -> bool:
+    return ctype.startswith(COMPRESSIBLE)
+
+
+def _is_app(rel: str) -> bool:
+    return rel.startswith("apps/") and rel.endswith(".html")
+
+
+def beacon(rel: str) -> str:
+    """Telemetry beacon for the hub page and the apps; "" when telemetry is off."""
+    rel = rel.replace(os.sep, "/")
+    if rel == "index.html":
+        return telemetry.beacon_js("page:hub", observe="self")
+    if _is_app(rel):
+        return telemetry.beacon_js(f"app:{os.path.basename(rel).split('.')[0]}", observe="self")
+    return ""
+
+
+def served_body(rel: str, raw: bytes) -> bytes:
+    """What goes on the wire for `rel`: pages get the beacon, apps are minified, the rest as written."""
+    rel = rel.replace(os.sep, "/")
+    extra = beacon(rel)
+    if not extra and not _is_app(rel):
+        return raw
+    from portfolio.embed import insert_before_body
+    from portfolio.minify import MinifyError, minify_checked
+    try:
+        html = raw.decode("utf-8")
+    except UnicodeDecodeError as e:
+        print(f"static: {rel} served as written ({e})", file=sys.stderr)
+        return raw
+    if extra:
+        html = insert_before_body(html, extra)
+    if _is_app(rel):
+        try:
+            html = minify_checked(html, compile_scripts=False)
+        except MinifyError as e:
+            print(f"static: {rel} served unminified ({e})", file=sys.stderr)
+    return html.encode("utf-8")
+
+
+def precompressed_key(rel: str, raw_digest: str) -> str:
+    """
+    Name of the prebuilt variants of a file. The source digest alone isn't
+    enough: served_body() (minify for the apps, the beacon for the pages)
+    shapes what actually gets compressed, so that code and the beacon are
+    part of the key.
+    """
+    from portfolio import embed, minify
+    h = hashlib.sha256(raw_digest.encode())
+    for mod in (__file__, minify.__file__, embed.__file__):
+        h.update(code_version(mod).encode())
+    h.update(beacon(rel).encode())
+    return h.hexdigest()
+
+
+def _prebuilt(key: str, ext: str) -> Optional[bytes]:
+    """A variant `python -m portfolio.build` already compressed (see precompressed_key), if any."""
+    try:
+        with open(os.path.join(PRECOMPRESSED_DIR, f"{key}.{ext}"), "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def body_tag(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()[:20]
+
+
+def load_asset(root: str, rel: str, body: Optional[bytes] = None) -> Asset:
+    """`body` overrides served_body() (the stamped service worker); it is never prebuilt."""
+    path = os.path.join(root, rel)
+    with open(path, "rb") as f:
+        raw = f.read()
+    stamped = body is not None
+    body = body if stamped else served_body(rel, raw)
+    url = "/" + rel.replace(os.sep, "/")
+    ctype = content_type(rel)
+    key = precompressed_key(rel, hashlib.sha256(raw).hexdigest())
+    tag = body_tag(body)
+    # Each encoding is its own representation, so each gets its own strong validator.
+    variants = {"identity": Variant(body, f'"{tag}"', None)}
+    if len(body) >= MIN_COMPRESS and _compressible(ctype):
+        gz = (not stamped and _prebuilt(key, "gz")) or gzip.compress(body, compresslevel=9, mtime=0)
+        if len(gz) < len(body):
+            variants["gzip"] = Variant(gz, f'"{tag}-gz"', "gzip")
+        if brotli is not None:
+            br = (not stamped and _prebuilt(key, "br")) or brotli.compress(body, quality=11)
+            if len(br) < len(body):
+                variants["br"] = Variant(br, f'"{tag}-br"', "br")
+    return Asset(url, ctype, cache_control(url), formatdate(os.path.getmtime(path), usegmt=True), variants)
+
+
+def build_table(root: str = PROJECT_ROOT) -> Dict[str, Asset]:
+    rels: List[str] = [f for f in PUBLIC_FILES if os.path.isfile(os.path.join(root, f))]
+    for d in PUBLIC_DIRS:
+        for dirpath, _, files in os.walk(os.path.join(root, d)):
+            rels += [os.path.relpath(os.path.join(dirpath, f), root) for f in files if not f.startswith(".")]
+    table = {a.url: a for a in (load_asset(root, r) for r in sorted(rels))}
+    if "/serviceWorker.js" in table:
+        with open(os.path.join(root, "serviceWorker.js"), "rb") as f:
+            sw = stamp_service_worker(f.read(), service_worker_manifest(root, table))
+        table["/serviceWorker.js"] = load_asset(root, "serviceWorker.js", body=sw)
+    if "/index.html" in table:
+        table["/"] = table["/index.html"]
+    return table
+
+
+# --------------------------
+#     SERVICE WORKER PRECACHE
+# --------------------------
+_SW_CACHE_RE = re.compile(rb"^const CACHE = '([^']*)';$", re.M)
+_SW_PRECACHE_RE = re.compile(rb"^const PRECACHE = null;$", re.M)
+
+
+def precached_files(root: str = PROJECT_ROOT) -> List[str]:
+    """What the service worker precaches: SW_CORE plus the same-origin hrefs in apps/apps.json."""
+    rels = list(SW_CORE)
+    try:
+        with open(os.path.join(root, "apps", "apps.json"), "r", encoding="utf-8") as f:
+            rels += [a["href"].lstrip("/") for a in json.load(f) if a.get("href", "").startswith("/")]
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"static: apps/apps.json unreadable, precaching core only: {e}", file=sys.stderr)
+    return [r for r in dict.fromkeys(rels) if os.path.isfile(os.path.join(root, r))]
+
+
+def precache_manifest(tags: Dict[str, str]) -> Dict[str, object]:
+    """{version, files} for {project-relative path: body_tag of its served bytes}."""
+    files = {"/" + rel: tag for rel, tag in tags.items()}
+    version = hashlib.sha256(json.dumps(files, sort_keys=True).encode()).hexdigest()[:12]
+    return {"version": version, "files": files}
+
+
+def service_worker_manifest(root: str, table: Dict[str, Asset]) -> Dict[str, object]:
+    """build/precache.json when it matches what the table serves, else the same manifest recomputed."""
+    current = precache_manifest({rel: table["/" + rel].identity.etag.strip('"')
+                                 for rel in precached_files(root) if "/" + rel in table})
+    try:
+        with open(PRECACHE_FILE, "r", encoding="utf-8") as f:
+            built = json.load(f)
+    except (OSError, ValueError):
+        built = None
+    if built != current:
+        state = "missing" if built is None else "stale"
+        print(f"static: build/precache.json {state}, service worker stamped from the served files "
+              f"(python -m portfolio.build refreshes it)", file=sys.stderr)
+    return current
+
+
+def stamp_service_worker(raw: bytes, manifest: Dict[str, object]) -> bytes:
+    """serviceWorker.js with the manifest version in its CACHE name and its files as PRECACHE."""
+    version = str(manifest["version"]).encode()
+    body = _SW_CACHE_RE.sub(lambda m: b"const CACHE = '" + m.group(1) + b"-" + version + b"';", raw, count=1)
+    files = json.dumps(list(manifest["files"])).encode()
+    return _SW_PRECACHE_RE.sub(lambda m: b"const PRECACHE = " + files + b";", body, count=1)
+
+
+# --------------------------
+#     NEGOTIATION / VALIDATORS / RANGES
+# --------------------------
+def accepted_encodings(header: str) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        m = re.search(r"q\s*=\s*([0-9.]+)", params)
+        if m:
+            try:
+                q = float(m.group(1))
+            except ValueError:
+                q = 0.0
+        if name:
+            out[name.strip().lower()] = q
+    return out
+
+
+def choose_variant(asset: Asset, accept_encoding: str) -> Variant:
+    acc = accepted_encodings(accept_encoding)
+    for enc in ("br", "gzip"):  # smallest first
+        q = acc.get(enc, acc.get("*", 0.0))
+        if enc in asset.variants and q > 0:
+            return asset.variants[enc]
+    return asset.identity
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match uses the weak comparison: W/"x" matches "x"."""
+    if header.strip() == "*":
+        return True
+    return any(t.strip().removeprefix("W/") == etag for t in header.split(","))
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Inclusive (start, end) for a single `bytes=` range; None to ignore the header
+    (malformed or multi-range, answered with the full body). Raises ValueError
+    when the range cannot be satisfied.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    if not dash:
+        return None
+    first, last = first.strip(), last.strip()
+    if not first:                          # suffix: the last N bytes
+        if not last.isdigit():
+            return None
+        if int(last) == 0:
+            raise ValueError("empty suffix range")
+        return max(0, size - int(last)), size - 1
+    if not first.isdigit() or (last and not last.isdigit()):
+        return None
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError("range not satisfiable")
+    return start, min(end, size - 1)
+
+
+# --------------------------
+#     HTTP
+# --------------------------
+_REASONS = {200: "OK", 206: "Partial Content", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 416: "Range Not Satisfiable", 431: "Request Header Fields Too Large"}
+
+
+def respond(table: Dict[str, Asset], method: str, target: str,
+            headers: Dict[str, str]) -> Tuple[int, List[Tuple[str, str]], bytes]:
+    """Status, headers and body for one request (body is empty for HEAD / 304)."""
+    if method not in ("GET", "HEAD"):
+        return 405, [("Allow", "GET, HEAD")], b""
+    url = target.split("?", 1)[0].split("#", 1)[0]
+    asset = table.get(url)
+    if asset is None:
+        return 404, [("Content-Type", "text/plain; charset=utf-8")], b"Not found\n"
+
+    rng_header = headers.get("range")
+    if rng_header and headers.get("if-range") not in (None, asset.identity.etag):
+        rng_header = None  # the client's partial copy is stale: send everything
+    # Byte ranges are served from the identity body so offsets mean the same thing to every client.
+    variant = asset.identity if rng_header else choose_variant(asset, headers.get("accept-encoding", ""))
+
+    out = [
+        ("Content-Type", asset.content_type),
+        ("Cache-Control", asset.cache_control),
+        ("ETag", variant.etag),
+        ("Last-Modified", asset.last_modified),
+        ("Vary", "Accept-Encoding"),
+        ("Accept-Ranges", "bytes"),
+        ("X-Content-Type-Options", "nosniff"),
+    ]
+    if asset.url == "/serviceWorker.js":
+        out.append(("Service-Worker-Allowed", "/"))
+
+    inm = headers.get("if-none-match")
+    if inm is not None and etag_matches(inm, variant.etag):
+        return 304, out, b""
+
+    body = variant.body
+    if rng_header:
+        try:
+            span = parse_range(rng_header, len(body))
+        except ValueError:
+            return 416, out + [("Content-Range", f"bytes */{len(body)}")], b""
+        if span is not None:
+            start, end = span
+            out.append(("Content-Range", f"bytes {start}-{end}/{len(body)}"))
+            return 206, out, body[start:end + 1]
+    if variant.encoding:
+        out.append(("Content-Encoding", variant.encoding))
+    return 200, out, body
+
+
+class StaticServer:
+    def __init__(self, table: Dict[str, Asset], log: bool = False):
+        self.table = table
+        self.log = log
+        self.open_connections = 0
+        self.requests = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.open_connections += 1
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_S)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self._send(writer, "HEAD", 431, [], b"", keep_alive=False)
+                    return
+                keep_alive = await self._serve(head, writer)
+                if not keep_alive:
+                    return
+        finally:
+            self.open_connections -= 1
+            writer.close()
+
+    async def _serve(self, head: bytes, writer: asyncio.StreamWriter) -> bool:
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            await self._send(writer, "GET", 400, [], b"", keep_alive=False)
+            return False
+        headers: Dict[str, str] = {}
+        for line in lines[1:]:
+            name, sep, val = line.partition(":")
+            if sep:
+                headers[name.strip().lower()] = val.strip()
+        conn = headers.get("connection", "").lower()
+        keep_alive = conn != "close" if version == "HTTP/1.1" else conn == "keep-alive"
+        if headers.get("content-length", "0") != "0" or "transfer-encoding" in headers:
+            # Nothing here reads request bodies; closing keeps one from being parsed as the next request.
+            keep_alive = False
+        status, out, body = respond(self.table, method, target, headers)
+        self.requests += 1
+        if self.log:
+            print(f'{method} {target} {status} {len(body)}', file=sys.stderr)
+        await self._send(writer, method, status, out, body, keep_alive)
+        return keep_alive
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, method: str, status: int,
+                    headers: List[Tuple[str, str]], body: bytes, keep_alive: bool) -> None:
+        length = len(body)
+        if status == 304:
+            length = None
+        lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}", f"Date: {formatdate(usegmt=True)}"]
+        lines += [f"{k}: {v}" for k, v in headers]
+        if length is not None:
+            lines.append(f"Content-Length: {length}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if method != "HEAD" and status != 304:
+            writer.write(body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+async def serve(host: str, port: int, root: str = PROJECT_ROOT, log: bool = False) -> None:
+    telemetry.ensure_collector()
+    t0 = time.perf_counter()
+    table = build_table(root)
+    files = {id(a): a for a in table.values()}.values()
+    raw = sum(len(a.identity.body) for a in files)
+    best = sum(min(len(v.body) for v in a.variants.values()) for a in files)
+    print(f"static: {len(files)} files, {raw:,} B -> {best:,} B precompressed "
+          f"({'gzip+br' if brotli else 'gzip'}) in {(time.perf_counter() - t0) * 1000:.0f} ms", file=sys.stderr)
+    server = StaticServer(table, log=log)
+    srv = await asyncio.start_server(server.handle, host, port, backlog=4096, limit=MAX_HEADER_BYTES)
+    print(f"static: serving {root} on http://{host}:{port}/", file=sys.stderr)
+    async with srv:
+        await srv.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Serve the PWA hub with precompression, ETags and ranges.")
+    ap.add_argument("--host", default=os.environ.get("HOST", "0.0.0.0"))
+    ap.add_argument("--port", type=int, default=int(os.environ.get("PORT", "8080")))
+    ap.add_argument("--root", default=PROJECT_ROOT)
+    ap.add_argument("--log", action="store_true", help="log every request to stderr")
+    args = ap.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.root, args.log))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Client performance telemetry.
+
+A small beacon script runs in the browser: in each page (through a
+zero-height component that observes its parent document), in the Lottie
+hero player and in every Playground app iframe. It collects navigation
+timing, Lottie first-frame time, iframe load time and cumulative layout
+shift, batches them, and posts them with navigator.sendBeacon to a local
+collector.
+
+The collector keeps one fixed-bucket histogram per (scope, metric), where
+scope is "page:<name>", "app:<name>" or "lottie:<name>", so memory stays
+bounded however much traffic arrives. It exports them as JSON at
+/metrics.json.
+
+Off unless PORTFOLIO_TELEMETRY_PORT is set. When it is, the first page run
+starts the collector on that port, inside the Streamlit process:
+
+    PORTFOLIO_TELEMETRY_PORT=8090 streamlit run Home.py
+    curl localhost:8090/metrics.json
+
+Under portfolio.cluster the proxy process owns the collector and the workers
+only emit beacons (PORTFOLIO_TELEMETRY_EXTERNAL=1), so there's one set of
+histograms and no race for the port.
+
+The collector listens on 127.0.0.1 unless PORTFOLIO_TELEMETRY_HOST says
+otherwise (browsers on other machines post to the page's own hostname, so a
+public deployment sets it to 0.0.0.0). Posts are accepted only from pages
+on the collector's own hostname, or from the origins listed in
+PORTFOLIO_TELEMETRY_ORIGINS (comma-separated), so another site can't feed
+the histograms from its visitors' browsers.
+"""
+import bisect
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+ENV_PORT = "PORTFOLIO_TELEMETRY_PORT"
+ENV_HOST = "PORTFOLIO_TELEMETRY_HOST"
+ENV_ORIGINS = "PORTFOLIO_TELEMETRY_ORIGINS"
+ENV_EXTERNAL = "PORTFOLIO_TELEMETRY_EXTERNAL"   # another process (portfolio.cluster) runs the collector
+DEFAULT_HOST = "127.0.0.1"
+
+METRICS = ("ttfb", "dom_content_loaded", "load", "lottie_first_frame", "iframe_load", "cls")
+MAX_SERIES = 512            # distinct (scope, metric) pairs kept
+MAX_BODY = 16 * 1024
+_SCOPE_RE = re.compile(r"^(page|app|lottie):[\w .&+\-()]{1,64}$")
+
+# Log-spaced bucket upper bounds, ~12% apart, from 0.001 to 100,000; a shared table
+# covers both milliseconds and unitless CLS.
+BOUNDS: Tuple[float, ...] = tuple(10 ** (k / 20) for k in range(-60, 101))
+
+
+def port() -> Optional[int]:
+    raw = os.environ.get(ENV_PORT, "").strip()
+    return int(raw) if raw.isdigit() else None
+
+
+def enabled() -> bool:
+    return port() is not None
+
+
+# --------------------------
+#     HISTOGRAMS
+# --------------------------
+class Histogram:
+    """Fixed buckets plus exact count / sum / min / max; O(len(BOUNDS)) memory forever."""
+
+    __slots__ = ("counts", "count", "total", "lo", "hi")
+
+    def __init__(self):
+        self.counts = [0] * (len(BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.lo = math.inf
+        self.hi = -math.inf
+
+    def add(self, v: float) -> None:
+        self.counts[bisect.bisect_left(BOUNDS, v)] += 1
+        self.count += 1
+        self.total += v
+        self.lo, self.hi = min(self.lo, v), max(self.hi, v)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile, clamped to the observed range."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                bound = BOUNDS[i] if i < len(BOUNDS) else self.hi
+                return min(max(bound, self.lo), self.hi)
+        return self.hi
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 4) if self.count else 0.0,
+            "min": round(self.lo, 4) if self.count else 0.0,
+            "max": round(self.hi, 4) if self.count else 0.0,
+            "p50": round(self.quantile(0.50), 4),
+            "p90": round(self.quantile(0.90), 4),
+            "p99": round(self.quantile(0.99), 4),
+            "buckets": {f"{BOUNDS[i]:.4g}" if i < len(BOUNDS) else "inf": c
+                        for i, c in enumerate(self.counts) if c},
+        }
+
+
+class Collector:
+    def __init__(self):
+        self.series: Dict[Tuple[str, str], Histogram] = {}
+        self.dropped = 0
+        self.batches = 0
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def record(self, scope: str, metric: str, value: Any) -> bool:
+        if metric not in METRICS or not _SCOPE_RE.match(scope):
+            return False
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or not math.isfinite(value) or value < 0:
+            return False
+        key = (scope, metric)
+        with self._lock:
+            hist = self.series.get(key)
+            if hist is None:
+                if len(self.series) >= MAX_SERIES:
+                    self.dropped += 1
+                    return False
+                hist = self.series[key] = Histogram()
+            hist.add(float(value))
+        return True
+
+    def ingest(self, batch: Any) -> int:
+        """Accepts {"scope": "...", "metrics": [[name, value], ...]}; returns how many were kept."""
+        if not isinstance(batch, dict) or not isinstance(batch.get("metrics"), list):
+            return 0
+        scope = str(batch.get("scope", ""))
+        kept = 0
+        for item in batch["metrics"][:64]:
+            if isinstance(item, list) and len(item) == 2 and self.record(scope, str(item[0]), item[1]):
+                kept += 1
+            else:
+                self.dropped += 1
+        with self._lock:
+            self.batches += 1
+        return kept
+
+    def export(self) -> Dict[str, Any]:
+        with self._lock:
+            items = sorted(self.series.items())
+            out: Dict[str, Any] = {
+                "since": self.started,
+                "batches": self.batches,
+                "dropped": self.dropped,
+                "series": {},
+            }
+            for (scope, metric), hist in items:
+                out["series"].setdefault(scope, {})[metric] = hist.to_dict()
+        return out
+
+
+# --------------------------
+#     HTTP COLLECTOR
+# --------------------------
+class _Handler(BaseHTTPRequestHandler):
+    collector: Collector
+
+    def log_message(self, *args) -> None:  # keep the Streamlit log readable
+        pass
+
+    def _origin(self) -> Optional[str]:
+        """The request's Origin if it may use the collector, "" when there is none, else None."""
+        origin = self.headers.get("Origin")
+        if not origin:
+            return ""  # not from a browser page (curl, the static server's tests)
+        extra = {o.strip().rstrip("/") for o in os.environ.get(ENV_ORIGINS, "").split(",") if o.strip()}
+        if origin in extra:
+            return origin
+        # The beacon posts to location.hostname, so a page of ours shares the collector's hostname.
+        own = urlsplit("//" + (self.headers.get("Host") or "")).hostname
+        return origin if own and urlsplit(origin).hostname == own else None
+
+    def _reply(self, status: int, body: bytes = b"", ctype: str = "application/json") -> None:
+        origin = self._origin()
+        self.send_response(status)
+        if origin:
+            self.send_header("Access-Control-Allow-Origin", origin)
+            self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+            self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Vary", "Origin")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_OPTIONS(self) -> None:
+        self._reply(204)
+
+    def do_POST(self) -> None:
+        if self.path.split("?")[0] != "/beacon":
+            return self._reply(404)
+        if self._origin() is None:
+            # A simple (no-preflight) POST reaches us whatever the CORS headers say; refuse it here.
+            return self._reply(403)
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0 or length > MAX_BODY:
+            return self._reply(413)
+        try:
+            batch = json.loads(self.rfile.read(length))
+        except ValueError:
+            return self._reply(400)
+        # One beacon may carry several scopes (a page and the player it embeds).
+        for b in batch if isinstance(batch, list) else [batch]:
+            self.collector.ingest(b)
+        self._reply(204)
+
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics.json":
+            return self._reply(404)
+        self._reply(200, json.dumps(self.collector.export(), indent=1).encode())
+
+
+_collector: Optional[Collector] = None
+_start_lock = threading.Lock()
+
+
+def start_collector(listen_port: int, host: Optional[str] = None) -> Collector:
+    """Serve /beacon and /metrics.json on a daemon thread; returns the shared collector."""
+    host = host or os.environ.get(ENV_HOST, "").strip() or DEFAULT_HOST
+    collector = Collector()
+    handler = type("Handler", (_Handler,), {"collector": collector})
+    server = ThreadingHTTPServer((host, listen_port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="telemetry", daemon=True).start()
+    print(f"[telemetry] collecting on http://{host}:{listen_port}/beacon", file=sys.stderr)
+    return collector
+
+
+def ensure_collector() -> Optional[Collector]:
+    """Start the in-process collector once (no-op unless telemetry is enabled and this process owns it)."""
+    global _collector
+    p = port()
+    if p is None or os.environ.get(ENV_EXTERNAL) == "1":
+        return None
+    with _start_lock:
+        if _collector is None:
+            try:
+                _collector = start_collector(p)
+            except OSError as e:  # e.g. a second `streamlit run` on the same port setting
+                print(f"[telemetry] collector not started, beacons go to whoever holds :{p}: {e}",
+                      file=sys.stderr)
+                _collector = Collector()
+    return _collector
+
+
+# --------------------------
+#     BROWSER BEACON
+# --------------------------
+# `__SCOPE__` names the series; `__PORT__` is the collector port on the page's own host.
+# The host comes from document.baseURI: Streamlit components are srcdoc iframes,
+# whose location is about:srcdoc but whose base URL is the parent page's.
+# window.__pfBeacon(name, value) queues a metric; queued metrics go out in one
+# sendBeacon after FLUSH_MS, and whatever is left when the page is hidden.
+_BEACON = """<script>
+(function(){
+  if (window.__pfBeacon) return;
+  var base = new URL(document.baseURI);
+  if (!/^https?:$/.test(base.protocol)) return;
+  var SCOPE = __SCOPE__, ENDPOINT = base.protocol + '//' + base.hostname + ':__PORT__/beacon';
+  var FLUSH_MS = 5000, queue = [], timer = null;
+  function flush(){
+    timer = null;
+    if (!queue.length) return;
+    var body = JSON.stringify({scope: SCOPE, metrics: queue.splice(0)});
+    try {
+      if (!(navigator.sendBeacon && navigator.sendBeacon(ENDPOINT, new Blob([body], {type: 'text/plain'}))))
+        fetch(ENDPOINT, {method: 'POST', body: body, keepalive: true, mode: 'no-cors'});
+    } catch (e) {}
+  }
+  var finals = [];  // run once, just before the last flush
+  function hide(){ finals.splice(0).forEach(function(f){ try { f(); } catch (e) {} }); flush(); }
+  window.__pfBeacon = function(name, value){
+    if (typeof value !== 'number' || !isFinite(value)) return;
+    queue.push([name, Math.round(value * 1000) / 1000]);
+    if (!timer) timer = setTimeout(flush, FLUSH_MS);
+  };
+  addEventListener('pagehide', hide);
+  document.addEventListener('visibilitychange', function(){ if (document.visibilityState === 'hidden') hide(); });
+  __OBSERVE__
+})();
+</script>"""
+
+# Navigation timing and CLS for a window `w` (the page itself, or the Streamlit
+# parent document when the beacon runs in a same-origin component iframe).
+_OBSERVE = """
+  var w = __TARGET__, cls = 0;
+  function nav(){
+    // Streamlit switches pages without a new navigation: report each document's timing once.
+    if (w.__pfNavSent) return;
+    var n = w.performance.getEntriesByType('navigation')[0];
+    if (!n || !n.loadEventEnd) return setTimeout(nav, 500);
+    w.__pfNavSent = true;
+    if ('__LOAD_METRIC__' === 'load') __pfBeacon('ttfb', n.responseStart);
+    __pfBeacon('dom_content_loaded', n.domContentLoadedEventEnd);
+    __pfBeacon('__LOAD_METRIC__', n.loadEventEnd);
+  }
+  try {
+    nav();
+    new w.PerformanceObserver(function(list){
+      list.getEntries().forEach(function(e){ if (!e.hadRecentInput) cls += e.value; });
+    }).observe({type: 'layout-shift', buffered: true});
+    finals.push(function(){ __pfBeacon('cls', cls); });
+    if (w !== window) w.addEventListener('pagehide', hide);
+  } catch (e) {}
+"""
+
+
+def beacon_js(scope: str, observe: str = "", load_metric: str = "load") -> str:
+    """
+    Beacon <script> for `scope`. `observe` is "self" (this document), "parent"
+    (the Streamlit page around a component iframe) or "" (queue only, for
+    metrics reported by the caller through window.__pfBeacon).
+    """
+    p = port()
+    if p is None:
+        return ""
+    obs = ""
+    if observe:
+        target = "window.parent" if observe == "parent" else "window"
+        obs = _OBSERVE.replace("__TARGET__", target).replace("__LOAD_METRIC__", load_metric)
+    return (_BEACON
+            .replace("__SCOPE__", json.dumps(scope))
+            .replace("__PORT__", str(p))
+            .replace("__OBSERVE__", obs))
+
+
+def page_beacon(page: str) -> None:
+    """Zero-height component that reports the surrounding page's timing and CLS."""
+    if not enabled():
+        return
+    ensure_collector()
+    import streamlit.components.v1 as components
+    components.html(beacon_js(f"page:{page}", observe="parent"), height=0)
+
+
+if __name__ == "__main__":
+    # python -m portfolio.telemetry [port] — standalone collector (e.g. one shared by several servers)
+    listen = int(sys.argv[1]) if len(sys.argv) > 1 else (port() or 8090)
+    start_collector(listen)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Compiled HTML sections for the portfolio pages.
+
+Each section is a `string.Template` parsed once at import, filled from the
+already-escaped content model once per process by `compile_site()`, and
+handed to the pages as a `Fragment` whose render() is a single
+st.markdown call. Nothing is formatted or escaped on a script rerun.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from string import Template
+from typing import Optional, Tuple
+
+from portfolio.content import CardProject, Content, Labeled, load_content
+
+
+@dataclass(frozen=True)
+class Fragment:
+    html: str
+
+    def render(self, target=None) -> None:
+        """Emit into `target` (a column / container / st.sidebar); defaults to the main area."""
+        if target is None:
+            import streamlit as target
+        target.markdown(self.html, unsafe_allow_html=True)
+
+
+# --------------------------
+#     TEMPLATES
+# --------------------------
+T_BUTTON = Template("<a class='btn-like' href='$url' rel='noopener'>$label</a>")
+T_HERO_TITLE = Template("<h1 class='hero-title'>$name</h1>")
+T_HERO_SUB = Template("<div class='hero-sub'>$tagline</div>")
+T_SECTION = Template("<div class='section-header'>$title</div>")
+T_SECTION_H2 = Template("<h2 class='section-header'>$title</h2>")
+T_ABOUT_HEADER = Template("<div class='section-header about'>$title</div>")
+T_ABOUT_CARD = Template('<div class="card about-card">\n$paragraphs\n</div>')
+T_ABOUT_P = Template('  <p class="muted">$text</p>')
+T_PILL_WALL = Template("<div class='card'><div class='pill-wall'>$pills</div></div>")
+T_PILL = Template("<span class='pill' tabindex='0'>$text</span>")
+T_TAG = Template("<span class='pill' style='font-size:12px'>$text</span>")
+T_CONNECT = Template('<div class="card">\n$rows\n  <p style="margin:0;"><b>Email:</b> $email</p>\n</div>')
+T_CONNECT_ROW = Template('  <p style="margin:0 0 6px;"><b>$name:</b> <a href="$url">$url</a></p>')
+T_COACHING = Template(
+    '<div class="card">\n'
+    '  <p class="muted">$intro</p>\n'
+    '  <ul class="muted" style="margin-bottom: 8px;">\n$items\n  </ul>\n'
+    '  <p class="muted" style="margin:0;"><b>Coaching inquiries:</b> $email</p>\n'
+    '</div>'
+)
+T_COACHING_ITEM = Template("    <li><b>$name</b> — $desc</li>")
+T_METRIC = Template(
+    "<div class='metric'><div style='font-size:28px;font-weight:700;'>$value</div>"
+    "<div class='muted' style='font-size:12px;'>$label</div></div>"
+)
+T_KICKER = Template("<p class='muted' style='text-transform:uppercase;letter-spacing:.15em;'>$text</p>")
+T_MINIMAL_HEADLINE = Template("<h1 class='hero-title' style='font-size:52px;'>$text</h1>")
+T_MINIMAL_INTRO = Template("<p class='muted' style='max-width:780px;'>$text</p>")
+T_GLASS = Template(
+    "<div class='card'><div class='muted' style='font-size:12px;'>$label</div>"
+    "<div style='font-weight:600;'>$body</div></div>"
+)
+T_INLINE_LINK = Template("<a href='$url'>$name</a>")
+T_PROJECT_CARD = Template(
+    "<div class='card'>"
+    "<div style='font-weight:700;font-size:18px;'>$title</div>"
+    "<div class='muted' style='font-size:14px;margin:.35rem 0 .5rem'>$desc</div>"
+    "<div class='pill-wall'>$tags</div>"
+    "</div>"
+)
+T_NEON_BANNER = Template(
+    "<div class='neon-frame'><div class='neon-inner'>"
+    "<h1 style='font-size:44px;margin:0 0 8px 0;'>"
+    "<span style='background: linear-gradient(90deg,#f0f,#7a7aff,#00e5ff); -webkit-background-clip:text; "
+    "background-clip:text; color:transparent;'>$accent</span> $headline"
+    "</h1>"
+    "<p class='muted'>$intro</p>"
+    "</div></div>"
+)
+T_MUTED_P = Template("<p class='muted'>$text</p>")
+T_FEATURE = Template("<div class='card'><div style='font-weight:600'>$title</div><div class='muted'>$desc</div></div>")
+T_FOOTER = Template("<p style='text-align:center; color:#D0DAFF; margin-top:12px;'>$text</p>")
+
+
+# --------------------------
+#     COMPILED SITE
+# --------------------------
+@dataclass(frozen=True)
+class CompiledProject:
+    heading: str          # expander label (plain text)
+    body: str             # markdown
+    link: Optional[Fragment] = None  # "Open App" button
+
+
+@dataclass(frozen=True)
+class Site:
+    content: Content
+    hero_title: Fragment
+    hero_sub: Fragment
+    link_buttons: Tuple[Fragment, ...]
+    about_header: Fragment
+    about_card: Fragment
+    coaching_header: Fragment
+    coaching_card: Fragment
+    projects_header: Fragment
+    projects: Tuple[CompiledProject, ...]
+    skills_header: Fragment
+    skills_wall: Fragment
+    connect_header: Fragment
+    connect_card: Fragment
+    metrics: Tuple[Fragment, ...]
+    minimal_kicker: Fragment
+    minimal_headline: Fragment
+    minimal_intro: Fragment
+    minimal_actions: Tuple[Fragment, ...]
+    minimal_cards: Tuple[Fragment, ...]
+    card_grid_header: Fragment
+    card_grid: Tuple[Fragment, ...]
+    neon_banner: Fragment
+    neon_about_open: Fragment
+    neon_about: Fragment
+    neon_features: Tuple[Fragment, ...]
+    neon_demo_buttons: Tuple[Fragment, ...]
+    footer: Fragment
+
+
+def button(label_html: str, url_html: str) -> Fragment:
+    """Dark pill link button. Both arguments must already be HTML-escaped."""
+    return Fragment(T_BUTTON.substitute(label=label_html, url=url_html))
+
+
+def _glass(item: Labeled) -> Fragment:
+    return Fragment(T_GLASS.substitute(label=item.label.html, body=item.text.html))
+
+
+def _project_card(p: CardProject) -> Fragment:
+    tags = " ".join(T_TAG.substitute(text=t.html) for t in p.tags)
+    return Fragment(T_PROJECT_CARD.substitute(title=p.title.html, desc=p.desc.html, tags=tags))
+
+
+def compile_content(c: Content) -> Site:
+    links_card = T_GLASS.substitute(
+        label="Links",
+        body=" · ".join(T_INLINE_LINK.substitute(url=l.url.html, name=l.name.html) for l in c.minimal_links),
+    )
+    return Site(
+        content=c,
+        hero_title=Fragment(T_HERO_TITLE.substitute(name=c.name.html)),
+        hero_sub=Fragment(T_HERO_SUB.substitute(tagline=c.tagline.html)),
+        link_buttons=tuple(button(l.button.html, l.url.html) for l in c.links),
+        about_header=Fragment(T_ABOUT_HEADER.substitute(title="About Me")),
+        about_card=Fragment(T_ABOUT_CARD.substitute(
+            paragraphs="\n".join(T_ABOUT_P.substitute(text=p.html) for p in c.about))),
+        coaching_header=Fragment(T_SECTION.substitute(title="Tennis Coaching")),
+        coaching_card=Fragment(T_COACHING.substitute(
+            intro=c.coaching_intro.html,
+            items="\n".join(T_COACHING_ITEM.substitute(name=o.label.html, desc=o.text.html)
+                            for o in c.coaching_offerings),
+            email=c.email.html,
+        )),
+        projects_header=Fragment(T_SECTION.substitute(title="Software &amp; Data Projects")),
+        projects=tuple(
+            CompiledProject(
+                heading=p.heading,
+                body=p.body,
+                link=button(p.link_label.html, p.link_url.html) if p.link_url else None,
+            )
+            for p in c.projects
+        ),
+        skills_header=Fragment(T_SECTION.substitute(title="Skills")),
+        skills_wall=Fragment(T_PILL_WALL.substitute(pills="".join(T_PILL.substitute(text=s.html) for s in c.skills))),
+        connect_header=Fragment(T_SECTION.substitute(title="Connect")),
+        connect_card=Fragment(T_CONNECT.substitute(
+            rows="\n".join(T_CONNECT_ROW.substitute(name=l.name.html, url=l.url.html) for l in c.links),
+            email=c.email.html,
+        )),
+        metrics=tuple(Fragment(T_METRIC.substitute(value=m.text.html, label=m.label.html)) for m in c.metrics),
+        minimal_kicker=Fragment(T_KICKER.substitute(text=c.minimal_kicker.html)),
+        minimal_headline=Fragment(T_MINIMAL_HEADLINE.substitute(text=c.minimal_headline.html)),
+        minimal_intro=Fragment(T_MINIMAL_INTRO.substitute(text=c.minimal_intro.html)),
+        minimal_actions=tuple(button(a.label.html, a.url.html) for a in c.minimal_actions),
+        minimal_cards=tuple(_glass(h) for h in c.minimal_highlights) + (Fragment(links_card),),
+        card_grid_header=Fragment(T_SECTION_H2.substitute(title="Projects")),
+        card_grid=tuple(_project_card(p) for p in c.card_projects),
+        neon_banner=Fragment(T_NEON_BANNER.substitute(
+            accent=c.neon_accent.html, headline=c.neon_headline.html, intro=c.neon_intro.html)),
+        neon_about_open=Fragment("<div class='card'>" + T_ABOUT_HEADER.substitute(title="About Me")),
+        neon_about=Fragment(T_MUTED_P.substitute(text=c.neon_about.html)),
+        neon_features=tuple(Fragment(T_FEATURE.substitute(title=f.label.html, desc=f.text.html))
+                            for f in c.neon_features),
+        neon_demo_buttons=(button("Run", "#"), button("Inspect", "#")),
+        footer=Fragment(T_FOOTER.substitute(text="Built with ❤️ using Streamlit")),
+    )
+
+
+@lru_cache(maxsize=None)
+def compile_site() -> Site:
+    """The compiled sections for content/site.json, built once per process."""
+    return compile_content(load_content())
@@ -1,37 +1,47 @@
 // serviceWorker.js
-const CACHE = 'marcos-lab-v4';
-const CORE = [
-  '/', '/index.html',
-  '/assets/site.css', '/assets/site.js',
-  '/manifest.json',
-  '/apps/apps.json'
-];
+// v6: the hub shell and apps.json are served stale-while-revalidate; a changed
+// catalog is posted to the open hub pages ({type: 'catalog', apps}).
+// portfolio.static_server stamps both lines from build/precache.json: CACHE
+// gets the manifest version appended, PRECACHE the list of files to cache.
+// Served by anything else, the worker falls back to CORE + apps.json.
+const CACHE = 'marcos-lab-v6';
+const PRECACHE = null;
+const CATALOG = '/apps/apps.json';
+const SHELL = ['/index.html', '/assets/site.css', '/assets/site.js', '/manifest.json'];
+const CORE = ['/', ...SHELL, CATALOG];
 
 self.addEventListener('install', (e) => {
+  // POSTs (the telemetry beacons) bypass this worker: a keepalive request routed
+  // through a fetch handler is dropped when the page unloads, so the final
+  // beacon sent from pagehide would never arrive. Chrome 123+; elsewhere the
+  // fetch handler below lets them through to the network anyway.
+  if (e.addRoutes) e.addRoutes({ condition: { requestMethod: 'POST' }, source: 'network' }).catch(() => {});
   e.waitUntil((async () => {
     const cache = await caches.open(CACHE);
+    if (PRECACHE) {
+      await cache.addAll(['/', ...PRECACHE]);
+      return;
+    }
     // Precache core + apps list
     await cache.addAll(CORE);
     // Precache each app href from apps.json (if available)
     try {
-      const res = await fetch('/apps/apps.json', { cache: 'no-cache' });
-      if (res.ok) {
-        const apps = await res.json();
-        const hrefs = apps.map(a => a.href).filter(Boolean);
-        await cache.addAll(hrefs);
-      }
+      const res = await cache.match(CATALOG);
+      if (res) await cache.addAll(appHrefs(await res.json()));
     } catch (_) {
-      // apps.json missing or offline during install — fine, apps will cache on first visit
+      // apps.json unreadable — fine, apps will cache on first visit
     }
   })());
 });
 
 self.addEventListener('activate', (e) => {
-  e.waitUntil(
-    caches.keys().then(keys =>
-      Promise.all(keys.map(k => (k === CACHE ? null : caches.delete(k))))
-    )
-  );
+  e.waitUntil((async () => {
+    const keys = await caches.keys();
+    await Promise.all(keys.map(k => (k === CACHE ? null : caches.delete(k))));
+    // Lets the browser start navigation requests while this worker boots.
+    if (self.registration.navigationPreload) await self.registration.navigationPreload.enable();
+    await self.clients.claim();
+  })());
 });
 
 // Helper: same-origin guard
@@ -40,13 +50,63 @@ const sameOrigin = (url) => {
   catch { return false; }
 };
 
+const appHrefs = (apps) => apps.map(a => a.href).filter(h => h && h.startsWith('/'));
+
+async function put(key, res) {
+  if (res && res.ok) await (await caches.open(CACHE)).put(key, res);
+}
+
+// Cached copy now; refresh the cache in the background. `fresh` is the
+// network response (a navigation preload, or a fetch started here).
+async function staleWhileRevalidate(e, key, fresh) {
+  const cached = await caches.match(key);
+  const update = fresh.then(async (res) => {
+    await put(key, res.clone());
+    return res;
+  });
+  e.waitUntil(update.catch(() => {}));
+  return cached || update;
+}
+
+// Like staleWhileRevalidate, but a catalog that differs from the cached one
+// is sent to the hub pages so they re-render the grid, and its new apps are cached.
+async function revalidateCatalog(e) {
+  const cache = await caches.open(CACHE);
+  const cached = await cache.match(CATALOG);
+  const update = (async () => {
+    const res = await fetch(CATALOG, { cache: 'no-cache' });
+    if (!res.ok) return res;
+    const text = await res.clone().text();
+    const old = cached ? await cached.clone().text() : null;
+    await cache.put(CATALOG, res.clone());
+    if (old !== null && old !== text) {
+      const apps = JSON.parse(text);
+      const pages = await self.clients.matchAll({ type: 'window' });
+      pages.forEach(c => c.postMessage({ type: 'catalog', apps }));
+      const missing = [];
+      for (const href of appHrefs(apps)) if (!(await cache.match(href))) missing.push(href);
+      await cache.addAll(missing);
+    }
+    return res;
+  })();
+  e.waitUntil(update.catch(() => {}));
+  return cached || update;
+}
+
 self.addEventListener('fetch', (e) => {
   const req = e.request;
 
-  // Navigations → network first, fallback to cached hub if offline
   if (req.mode === 'navigate') {
+    const url = new URL(req.url);
+    const network = Promise.resolve(e.preloadResponse).then(pre => pre || fetch(req));
+    // Hub → cached shell straight away, refreshed for the next visit
+    if (url.pathname === '/' || url.pathname === '/index.html') {
+      e.respondWith(staleWhileRevalidate(e, '/index.html', network));
+      return;
+    }
+    // Other pages → network first, fallback to their cached copy, then the hub
     e.respondWith(
-      fetch(req).catch(() => caches.match('/index.html'))
+      network.catch(() => caches.match(req).then(cached => cached || caches.match('/index.html')))
     );
     return;
   }
@@ -55,6 +115,18 @@ self.addEventListener('fetch', (e) => {
 
   const url = new URL(req.url);
 
+  // App catalog → stale-while-revalidate, page told about changes
+  if (url.pathname === CATALOG) {
+    e.respondWith(revalidateCatalog(e));
+    return;
+  }
+
+  // Hub shell → stale-while-revalidate
+  if (SHELL.includes(url.pathname)) {
+    e.respondWith(staleWhileRevalidate(e, url.pathname, fetch(req, { cache: 'no-cache' })));
+    return;
+  }
+
   // Apps & assets → cache-first; fill cache on first visit
   if (
     url.pathname.startsWith('/apps/') ||